@@ -0,0 +1,94 @@
+"""Compare the single-pass detector engine with the per-detector functions.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_detectors [--paths 300000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from src.detectors import (
+    classify_paths,
+    detect_agents,
+    detect_claude_dir,
+    detect_claude_md,
+    detect_custom_commands,
+    detect_memory,
+    paths_needing_content,
+)
+from src.models import RepoFeatures
+
+_DIRS = ["src", "lib", "services", "packages", "docs", "test", "node_modules", "vendor", "tools"]
+_FILES = ["index.ts", "main.py", "README.md", "package.json", "util.go", "style.css", "CLAUDE.md", ".mcp.json"]
+_CLAUDE = [
+    ".claude",
+    ".claude/settings.json",
+    ".claude/commands/review.md",
+    ".claude/commands/ops/deploy.md",
+    ".claude/skills/triage/SKILL.md",
+    ".claude/agents/reviewer.md",
+    ".github/workflows/claude.yml",
+    ".github/workflows/ci.yaml",
+    "MEMORY.md",
+]
+
+
+def synthetic_tree(size: int, seed: int = 0) -> set[str]:
+    """A monorepo-shaped tree of ``size`` paths with a few detector targets."""
+    rng = random.Random(seed)
+    paths = set(_CLAUDE)
+    while len(paths) < size:
+        depth = rng.randint(1, 6)
+        parts = [rng.choice(_DIRS) + str(rng.randint(0, 50)) for _ in range(depth)]
+        # Detector targets stay rare, as in real trees.
+        name = rng.choice(_FILES) if rng.random() < 0.001 else f"file{rng.randint(0, 10_000)}.{rng.choice(['py', 'ts'])}"
+        paths.add("/".join([*parts, name]))
+    return paths
+
+
+def per_detector(tree_paths: set[str]) -> tuple[RepoFeatures, dict[str, list[str]]]:
+    features = RepoFeatures(name="bench")
+    detect_claude_md(tree_paths, features)
+    detect_claude_dir(tree_paths, features)
+    detect_custom_commands(tree_paths, features)
+    detect_memory(tree_paths, features)
+    detect_agents(tree_paths, features)
+    return features, paths_needing_content(tree_paths)
+
+
+def single_pass(tree_paths: set[str]) -> tuple[RepoFeatures, dict[str, list[str]]]:
+    features = RepoFeatures(name="bench")
+    return features, classify_paths(tree_paths, features)
+
+
+def _best(fn, tree_paths: set[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tree_paths)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tree_paths = synthetic_tree(args.paths)
+    if per_detector(tree_paths) != single_pass(tree_paths):
+        raise SystemExit("Single-pass results differ from the per-detector functions.")
+
+    old = _best(per_detector, tree_paths, args.repeat)
+    new = _best(single_pass, tree_paths, args.repeat)
+    print(f"{len(tree_paths)} paths, best of {args.repeat}:")
+    print(f"  per-detector functions: {old * 1000:8.1f} ms")
+    print(f"  single-pass registry:   {new * 1000:8.1f} ms  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Time loading a history of daily snapshots of a large org.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_history [--repos 10000] [--days 730]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+
+from src.history import History
+from src.models import OrgStats, RepoFeatures
+
+
+def synthetic_history(repos: int, days: int, seed: int = 0) -> bytes:
+    """``days`` daily snapshots of ``repos`` repos; a few repos change each day."""
+    rng = random.Random(seed)
+    features = [RepoFeatures(name=f"repo-{i}", has_claude_md=rng.random() < 0.2) for i in range(repos)]
+    history = History()
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    data = bytearray()
+    for day in range(days):
+        for repo in rng.sample(features, 20):
+            repo.has_claude_md = True
+            repo.has_hooks = rng.random() < 0.3
+        data += history.record(OrgStats.aggregate("bench", features), start + datetime.timedelta(days=day))
+    return bytes(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_history(args.repos, args.days)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        history = History.load(data)
+        best = min(best, time.perf_counter() - start)
+    print(f"{len(history.snapshots)} snapshots of {len(history.repos)} repos ({len(data) / 1e3:.0f} KB), best of {args.repeat}:")
+    print(f"  load:  {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
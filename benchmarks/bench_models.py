@@ -0,0 +1,103 @@
+"""Measure RepoFeatures memory and name-dedup speed at 100k-repo scale.
+
+Compares the compact ``RepoFeatures`` with a plain dataclass of the same
+fields (the layout it replaced). Run from the repository root::
+
+    python -m benchmarks.bench_models [--repos 100000] [--names 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from src.models import RepoFeatures
+
+_SERVERS = ["github", "slack", "postgres", "sentry", "linear", "filesystem", "puppeteer", "memory"]
+_SKILLS = [f"skill-{i}" for i in range(200)]
+
+
+@dataclass
+class PlainRepoFeatures:
+    name: str
+    has_claude_md: bool = False
+    has_claude_dir: bool = False
+    has_custom_commands: bool = False
+    has_claude_actions: bool = False
+    has_hooks: bool = False
+    has_agents: bool = False
+    has_memory: bool = False
+    is_stale: bool = False
+    is_new: bool = False
+    mcp_servers: list[str] = field(default_factory=list)
+    custom_commands: list[str] = field(default_factory=list)
+    claude_action_names: list[str] = field(default_factory=list)
+    hook_types: list[str] = field(default_factory=list)
+    agent_names: list[str] = field(default_factory=list)
+
+
+def _populate(cls, count: int, seed: int = 0) -> list:
+    """``count`` repos, a fifth of them using Claude Code, names parsed fresh per repo."""
+    rng = random.Random(seed)
+    repos = []
+    for i in range(count):
+        repo = cls(name=f"repo-{i}", is_stale=rng.random() < 0.3)
+        if rng.random() < 0.2:
+            repo.has_claude_md = repo.has_claude_dir = True
+            # "".join builds a new string per repo, as JSON parsing would.
+            for server in rng.sample(_SERVERS, rng.randint(0, 3)):
+                if "".join(server) not in repo.mcp_servers:
+                    repo.mcp_servers.append("".join(server))
+            for skill in rng.sample(_SKILLS, rng.randint(0, 5)):
+                if skill not in repo.custom_commands:
+                    repo.custom_commands.append("".join(skill))
+        repos.append(repo)
+    return repos
+
+
+def _memory(cls, count: int) -> tuple[int, float]:
+    gc.collect()
+    start = time.perf_counter()
+    _populate(cls, count)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    repos = _populate(cls, count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del repos
+    return size, elapsed
+
+
+def _dedup(cls, names: int) -> float:
+    repo = cls(name="monorepo")
+    start = time.perf_counter()
+    for i in range(names * 2):
+        name = f"skill-{i % names}"
+        if name not in repo.custom_commands:
+            repo.custom_commands.append(name)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=100_000)
+    parser.add_argument("--names", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.repos} repos:")
+    for label, cls in (("plain dataclass", PlainRepoFeatures), ("RepoFeatures", RepoFeatures)):
+        size, elapsed = _memory(cls, args.repos)
+        print(f"  {label:16} {size / 2**20:7.1f} MiB  {size / args.repos:6.0f} B/repo  built in {elapsed:.2f}s")
+
+    print(f"One repo deduplicating {args.names} skill names (each seen twice):")
+    for label, cls in (("plain dataclass", PlainRepoFeatures), ("RepoFeatures", RepoFeatures)):
+        print(f"  {label:16} {_dedup(cls, args.names) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Time a full scan against the local stand-in GitHub server.
+
+Starts :mod:`benchmarks.fake_github` in-process, scans its synthetic org
+through the real client, transport and pipeline, and checks the result
+against the synthetic org's own features. Run from the repository root::
+
+    python -m benchmarks.bench_scan [--repos 500] [--latency 0.02] [--concurrency 8]
+    python -m benchmarks.bench_scan --repo-listing graphql --content-fetch graphql --runs 2 --cache
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+from github.Requester import Requester
+
+from src import transport
+from src.config import Config
+from src.scanner import scan_organization
+from src.transport import ResponseCache, Transport
+
+from .fake_github import FakeGitHub, Faults, synthetic_repos
+from .suite import detect
+from .synthetic import SyntheticRepo
+
+ORG = "synthetic-org"
+
+
+def _features(repos) -> dict[str, dict]:
+    result = {}
+    for features in repos:
+        data = features.to_dict()
+        result[data.pop("name")] = {
+            key: sorted(value) if isinstance(value, list) else value
+            for key, value in data.items()
+            if key not in ("is_stale", "is_new")
+        }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--max-tree-paths", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the server adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--secondary-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="SCAN_CONCURRENCY")
+    parser.add_argument("--repo-listing", default="rest")
+    parser.add_argument("--content-fetch", default="rest")
+    parser.add_argument("--scan-mode", default="tree")
+    parser.add_argument("--runs", type=int, default=1, help="Scans in a row, sharing --cache")
+    parser.add_argument("--cache", action="store_true", help="Keep a response cache between runs (ETag / 304)")
+    parser.add_argument(
+        "--pygithub-pacing",
+        action="store_true",
+        help="Keep PyGithub's 0.25 s between requests (1 s between POSTs) per client",
+    )
+    args = parser.parse_args()
+
+    if not args.pygithub_pacing:
+        Requester._Requester__deferRequest = lambda self, verb: None
+
+    repos = synthetic_repos(ORG, args.repos, args.max_tree_paths)
+    listed = [repo for repo in repos if not repo.archived and not repo.fork]
+    expected = _features(detect([SyntheticRepo(repo.name, repo.paths, repo.contents) for repo in listed]))
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.secondary_rate, retry_after=0)
+
+    with FakeGitHub({ORG: repos}, faults) as server, tempfile.TemporaryDirectory() as cache_dir:
+        config = Config(
+            gh_token="fake",
+            org_name=ORG,
+            api_url=server.url,
+            show_sections=["details"],
+            scan_concurrency=args.concurrency,
+            repo_listing=args.repo_listing,
+            content_fetch=args.content_fetch,
+            scan_mode=args.scan_mode,
+        )
+        active = Transport(ResponseCache(cache_dir) if args.cache else None)
+        transport.install(active)
+        try:
+            for run in range(1, args.runs + 1):
+                before = server.counts.copy()
+                start = time.perf_counter()
+                stats = scan_organization(config)
+                elapsed = time.perf_counter() - start
+                counts = server.counts - before
+                match = "matches" if _features(stats.repos) == expected else "DIFFERS FROM"
+                print(f"Run {run}: {stats.total_repos} repos in {elapsed:.2f}s ({stats.total_repos / elapsed:.1f} repos/s), "
+                      f"{match} the synthetic org")
+                print("  " + ", ".join(f"{count} {name}" for name, count in counts.most_common()))
+        finally:
+            transport.uninstall()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare the single-pass bytes workflow scanner with decoding and three regexes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_workflows [--files 20000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from src.detectors import parse_workflow_content
+from src.models import RepoFeatures
+
+# The patterns parse_workflow_content used to run one after another.
+_OLD_PATTERNS = [
+    (re.compile(r"anthropics/claude-code-action", re.IGNORECASE), "claude-code-action"),
+    (re.compile(r"anthropics/claude-code-base-action", re.IGNORECASE), "claude-code-base-action"),
+    (re.compile(r"claude-code", re.IGNORECASE), "claude-code (ref)"),
+]
+
+_STEP = """      - name: Step {i}
+        uses: actions/{action}@v{version}
+        with:
+          path: ./build/{i}
+          cache: true
+"""
+_CLAUDE_STEP = "      - uses: anthropics/claude-code-action@{ref}\n"
+
+
+def synthetic_workflows(count: int, seed: int = 0) -> list[bytes]:
+    """``count`` workflow files of 10-60 steps; about one in ten uses a Claude action."""
+    rng = random.Random(seed)
+    files = []
+    for _ in range(count):
+        lines = ["name: CI\non: [push, pull_request]\njobs:\n  build:\n    runs-on: ubuntu-latest\n    steps:\n"]
+        for i in range(rng.randint(10, 60)):
+            lines.append(_STEP.format(i=i, action=rng.choice(["checkout", "cache", "setup-node"]), version=rng.randint(1, 4)))
+        if rng.random() < 0.1:
+            lines.insert(rng.randint(1, len(lines)), _CLAUDE_STEP.format(ref=rng.choice(["v1", "beta", "a" * 40])))
+        files.append("".join(lines).encode())
+    return files
+
+
+def decode_and_search(files: list[bytes]) -> list[list[str]]:
+    results = []
+    for content in files:
+        text = content.decode("utf-8", errors="replace")
+        results.append([name for pattern, name in _OLD_PATTERNS if pattern.search(text)])
+    return results
+
+
+def single_pass(files: list[bytes]) -> list[list[str]]:
+    results = []
+    for content in files:
+        features = RepoFeatures(name="bench")
+        parse_workflow_content(content, features)
+        results.append(list(features.claude_action_names))
+    return results
+
+
+def _best(fn, files: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(files)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = synthetic_workflows(args.files)
+    if decode_and_search(files) != single_pass(files):
+        raise SystemExit("Single-pass results differ from the three regexes.")
+
+    old = _best(decode_and_search, files, args.repeat)
+    new = _best(single_pass, files, args.repeat)
+    size = sum(map(len, files)) / 1e6
+    print(f"{len(files)} workflow files ({size:.1f} MB), best of {args.repeat}:")
+    print(f"  decode + three regexes:  {old * 1000:8.1f} ms")
+    print(f"  single-pass over bytes:  {new * 1000:8.1f} ms  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,745 @@
+"""A local stand-in for the GitHub API, serving synthetic organizations.
+
+Serves the REST and GraphQL subsets a scan uses: org and repo lookups, the
+org repo listing, git refs, trees and blobs, file contents (read and
+update), ``/rate_limit``, and the inventory, enterprise, probe and blob
+queries the scanner sends. Commits through the Git Data API (blobs, trees,
+commits, then a fast-forward ref update) are applied too. Repos come from
+:mod:`benchmarks.synthetic`.
+
+Responses carry ETags and rate-limit headers; a GET whose ``If-None-Match``
+matches is answered 304 and not counted against the rate limit. Latency,
+jitter, server errors and secondary rate limits can be injected. Run::
+
+    python -m benchmarks.fake_github [--repos 1000] [--port 8000] [--latency 0.05]
+
+and point the action at it with ``API_URL=http://127.0.0.1:8000``.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .synthetic import synthetic_org
+
+README = "# Synthetic org\n\n<!--START_SECTION:claude-stats-->\n<!--END_SECTION:claude-stats-->\n"
+
+_LANGUAGES = ["Python", "TypeScript", "Go", "Java", "Rust", None]
+_NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+_SECONDARY_MESSAGE = "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."
+_PER_PAGE = 30
+_MAX_PER_PAGE = 100
+# GitHub truncates recursive trees past about this many entries.
+TREE_LIMIT = 100_000
+
+
+def git_sha(kind: str, data: bytes) -> str:
+    """The SHA git gives an object of ``kind`` ("blob", "tree", ...) with ``data``."""
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+def _timestamp(value: datetime.datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass
+class Faults:
+    """What to inject into responses; rates are shares of all requests."""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # up to this many seconds more or less, uniformly
+    error_rate: float = 0.0  # answered 502
+    secondary_rate: float = 0.0  # answered 403 secondary rate limit, with Retry-After
+    retry_after: int = 1
+    seed: int = 0
+
+
+@dataclass
+class FakeRepo:
+    """One synthetic repo and its files at the head of ``main``."""
+
+    org: str
+    name: str
+    paths: list[str]
+    contents: dict[str, bytes]
+    archived: bool = False
+    fork: bool = False
+    language: str | None = None
+    visibility: str = "private"
+    created_at: datetime.datetime = _NOW
+    pushed_at: datetime.datetime = _NOW
+    # Files written through the contents or Git Data API, over ``contents``;
+    # None for a file deleted through the Git Data API
+    written: dict[str, bytes | None] = field(default_factory=dict)
+    # Git objects created through the Git Data API, by SHA
+    objects: dict[str, object] = field(default_factory=dict)
+    # Head of ``main`` once something has been committed
+    head: str = ""
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.org}/{self.name}"
+
+    @property
+    def node_id(self) -> str:
+        return "R_" + hashlib.sha1(self.full_name.encode()).hexdigest()[:16]
+
+    @property
+    def head_sha(self) -> str:
+        return self.head or git_sha("commit", f"{self.full_name}\n{self.tree_sha}".encode())
+
+    def advance(self, files: dict[str, bytes], message: str) -> str:
+        """Commit ``files`` on top of the head, as a write through the contents API does."""
+        commit = {"tree": self.tree_sha, "parents": [self.head_sha], "message": message, "files": dict(files)}
+        sha = git_sha("commit", json.dumps(commit, sort_keys=True, default=str).encode())
+        self.objects[sha] = commit
+        self.written.update(files)
+        self.head = sha
+        return sha
+
+    @property
+    def tree_sha(self) -> str:
+        return self.dir_sha("")
+
+    def dir_sha(self, directory: str) -> str:
+        return git_sha("tree", f"{self.full_name}:{directory}".encode())
+
+    def content(self, path: str) -> bytes | None:
+        if path in self.written:
+            return self.written[path]
+        if path in self.contents:
+            return self.contents[path]
+        if path in self._files:
+            return f"synthetic {path}\n".encode()
+        if path == "README.md":
+            return README.encode()
+        return None
+
+    @cached_property
+    def _files(self) -> frozenset[str]:
+        return frozenset(self.paths) - self._children.keys()
+
+    @cached_property
+    def _children(self) -> dict[str, list[str]]:
+        """Each directory's entries by full path ("" is the root)."""
+        dirs: set[str] = {""}
+        for path in self.paths:
+            parts = path.split("/")
+            dirs.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        # A listed path that is another's parent (".claude/commands") is a directory.
+        children: dict[str, list[str]] = {d: [] for d in dirs}
+        for path in sorted(set(self.paths) | (dirs - {""})):
+            children[path.rpartition("/")[0]].append(path)
+        return children
+
+    @cached_property
+    def _dirs_by_sha(self) -> dict[str, str]:
+        return {self.dir_sha(d): d for d in self._children}
+
+    def is_dir(self, path: str) -> bool:
+        return path in self._children
+
+    def entries(self, directory: str) -> list[tuple[str, str, str]]:
+        """``(path, type, sha)`` of the entries of ``directory``."""
+        entries = []
+        for path in self._children.get(directory, []):
+            if path in self._children:
+                entries.append((path, "tree", self.dir_sha(path)))
+            elif self.content(path) is not None:
+                entries.append((path, "blob", git_sha("blob", self.content(path))))
+        return entries
+
+    def walk(self, directory: str = "") -> list[tuple[str, str, str]]:
+        """Every entry under ``directory``, as a recursive tree lists them."""
+        result = []
+        for entry in self.entries(directory):
+            result.append(entry)
+            if entry[1] == "tree":
+                result.extend(self.walk(entry[0]))
+        return result
+
+    def extra_entries(self) -> list[tuple[str, str, str]]:
+        """Blob entries of the README and written files outside ``paths``, for recursive listings."""
+        extra = sorted(({"README.md"} | self.written.keys()) - self._files - self._children.keys())
+        return [(path, "blob", git_sha("blob", self.content(path))) for path in extra if self.content(path) is not None]
+
+    def directory(self, sha: str) -> str | None:
+        return self._dirs_by_sha.get(sha)
+
+    def blob(self, sha: str) -> bytes | None:
+        if isinstance(self.objects.get(sha), bytes):
+            return self.objects[sha]
+        for path in [*self.written, *self._files, *self.contents, "README.md"]:
+            data = self.content(path)
+            if data is not None and git_sha("blob", data) == sha:
+                return data
+        return None
+
+
+def synthetic_repos(org: str, repos: int, max_tree_paths: int = 5000, seed: int = 0) -> list[FakeRepo]:
+    """``repos`` repos of ``org`` with listing metadata to go with their files."""
+    rng = random.Random(f"{org}:{seed}")
+    result = []
+    for repo in synthetic_org(repos, max_tree_paths, seed):
+        created = _NOW - datetime.timedelta(days=rng.randint(1, 2000))
+        pushed = max(created, _NOW - datetime.timedelta(days=int(rng.expovariate(1 / 60))))
+        result.append(FakeRepo(
+            org=org,
+            name=repo.name,
+            paths=repo.paths,
+            contents=repo.contents,
+            archived=rng.random() < 0.03,
+            fork=rng.random() < 0.05,
+            language=rng.choice(_LANGUAGES),
+            visibility=rng.choice(["private", "private", "internal", "public"]),
+            created_at=created,
+            pushed_at=pushed,
+        ))
+    return sorted(result, key=lambda repo: repo.name)
+
+
+class FakeGitHub:
+    """The stand-in server. Use as a context manager, or :meth:`start` and :meth:`stop`.
+
+    ``orgs`` maps each org login to its repos. Every enterprise slug lists
+    all of them. :attr:`counts` tallies requests by route, plus ``304``,
+    ``error`` and ``secondary`` for what was answered that way.
+    """
+
+    def __init__(
+        self,
+        orgs: dict[str, list[FakeRepo]],
+        faults: Faults | None = None,
+        rate_limit: int = 5000,
+        port: int = 0,
+    ):
+        self.orgs = orgs
+        self.faults = faults or Faults()
+        self.rate_limit = rate_limit
+        self.port = port
+        self.repos = {repo.full_name.lower(): repo for repos in orgs.values() for repo in repos}
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._used: Counter = Counter()
+        self._reset = int(time.time()) + 3600
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeGitHub:
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        serve = partial(self._server.serve_forever, poll_interval=0.05)
+        threading.Thread(target=serve, name="fake-github", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> FakeGitHub:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- request handling ---------------------------------------------------
+
+    def _fault(self) -> str:
+        with self._lock:
+            roll = self._rng.random()
+            delay = self.faults.latency + self._rng.uniform(-self.faults.jitter, self.faults.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.faults.error_rate:
+            return "error"
+        if roll < self.faults.error_rate + self.faults.secondary_rate:
+            return "secondary"
+        return ""
+
+    def _rate_headers(self, resource: str, count: bool) -> dict[str, str]:
+        with self._lock:
+            if count:
+                self._used[resource] += 1
+            used = self._used[resource]
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - used)),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(self._reset),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def handle(self, method: str, url: str, headers, body: bytes) -> tuple[int, dict[str, str], bytes]:
+        parsed = urllib.parse.urlsplit(url)
+        query = {key: values[-1] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+        resource = "graphql" if parsed.path == "/graphql" else "core"
+        for verb, pattern, name in _ROUTES:
+            match = pattern.fullmatch(parsed.path)
+            if verb == method and match:
+                break
+        else:
+            name, match = "", None
+        with self._lock:
+            self.counts[name or "unknown"] += 1
+
+        fault = self._fault()
+        if fault:
+            with self._lock:
+                self.counts[fault] += 1
+            if fault == "secondary":
+                extra = {"Retry-After": str(self.faults.retry_after)}
+                return self._json(403, {"message": _SECONDARY_MESSAGE}, {**self._rate_headers(resource, False), **extra})
+            return self._json(502, {"message": "Server Error"}, {})
+        if self._used[resource] >= self.rate_limit:
+            return self._json(403, {"message": "API rate limit exceeded"}, self._rate_headers(resource, False))
+        if match is None:
+            return self._json(404, {"message": "Not Found"}, self._rate_headers(resource, True))
+
+        args = {key: urllib.parse.unquote(value) for key, value in match.groupdict().items()}
+        data = json.loads(body) if body else {}
+        status, payload = getattr(self, f"_{name}")(query=query, data=data, **args)
+        encoded = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(encoded).hexdigest()}"'
+        if method == "GET" and status == 200 and headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.counts["304"] += 1
+            return 304, {"ETag": etag, **self._rate_headers(resource, False)}, b""
+        response_headers = self._rate_headers(resource, True)
+        if method == "GET" and status == 200:
+            response_headers["ETag"] = etag
+        if name == "org_repos":
+            response_headers.update(self._link(parsed.path, query))
+        return status, {"Content-Type": "application/json", **response_headers}, encoded
+
+    @staticmethod
+    def _json(status: int, payload: dict, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        return status, {"Content-Type": "application/json", **headers}, json.dumps(payload).encode()
+
+    def _repo(self, owner: str, repo: str) -> FakeRepo | None:
+        return self.repos.get(f"{owner}/{repo}".lower())
+
+    def _repo_json(self, repo: FakeRepo) -> dict:
+        return {
+            "id": zlib.crc32(repo.full_name.encode()),
+            "node_id": repo.node_id,
+            "name": repo.name,
+            "full_name": repo.full_name,
+            "owner": {"login": repo.org, "type": "Organization"},
+            "private": repo.visibility != "public",
+            "visibility": repo.visibility,
+            "fork": repo.fork,
+            "archived": repo.archived,
+            "language": repo.language,
+            "default_branch": "main",
+            "created_at": _timestamp(repo.created_at),
+            "pushed_at": _timestamp(repo.pushed_at),
+            "url": f"{self.url}/repos/{repo.full_name}",
+        }
+
+    def _content_json(self, repo: FakeRepo, path: str, data: bytes) -> dict:
+        return {
+            "type": "file",
+            "encoding": "base64",
+            "name": path.rpartition("/")[2],
+            "path": path,
+            "size": len(data),
+            "sha": git_sha("blob", data),
+            "content": base64.b64encode(data).decode(),
+            "url": f"{self.url}/repos/{repo.full_name}/contents/{urllib.parse.quote(path)}",
+        }
+
+    def _page(self, query: dict) -> tuple[int, int]:
+        per_page = min(int(query.get("per_page", _PER_PAGE)), _MAX_PER_PAGE)
+        return int(query.get("page", 1)), per_page
+
+    def _link(self, path: str, query: dict) -> dict[str, str]:
+        page, per_page = self._page(query)
+        org = self.orgs.get(path.split("/")[2], [])
+        if page * per_page >= len(org):
+            return {}
+        next_query = urllib.parse.urlencode({**query, "page": page + 1, "per_page": per_page})
+        return {"Link": f'<{self.url}{path}?{next_query}>; rel="next"'}
+
+    # -- REST routes --------------------------------------------------------
+
+    def _rate_limit(self, **_) -> tuple[int, dict]:
+        resources = {}
+        for resource in ("core", "graphql", "search"):
+            headers = self._rate_headers(resource, False)
+            resources[resource] = {
+                "limit": self.rate_limit,
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "used": int(headers["X-RateLimit-Used"]),
+                "reset": self._reset,
+            }
+        return 200, {"resources": resources, "rate": resources["core"]}
+
+    def _org(self, org: str, **_) -> tuple[int, dict]:
+        if org not in self.orgs:
+            return 404, {"message": "Not Found"}
+        return 200, {"login": org, "id": zlib.crc32(org.encode()), "url": f"{self.url}/orgs/{org}"}
+
+    def _org_repos(self, org: str, query: dict, **_) -> tuple[int, list | dict]:
+        if org not in self.orgs:
+            return 404, {"message": "Not Found"}
+        page, per_page = self._page(query)
+        repos = self.orgs[org][(page - 1) * per_page:page * per_page]
+        return 200, [self._repo_json(repo) for repo in repos]
+
+    def _get_repo(self, owner: str, repo: str, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        return 200, self._repo_json(found)
+
+    def _ref_json(self, repo: FakeRepo, ref: str) -> dict:
+        return {
+            "ref": f"refs/{ref}",
+            "url": f"{self.url}/repos/{repo.full_name}/git/refs/{ref}",
+            "object": {"sha": repo.head_sha, "type": "commit"},
+        }
+
+    def _git_ref(self, owner: str, repo: str, ref: str, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None or ref != "heads/main":
+            return 404, {"message": "Not Found"}
+        return 200, self._ref_json(found, ref)
+
+    def _update_ref(self, owner: str, repo: str, ref: str, data: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None or ref != "heads/main":
+            return 404, {"message": "Not Found"}
+        with self._lock:
+            commit = found.objects.get(data.get("sha"))
+            if not isinstance(commit, dict) or "parents" not in commit:
+                return 422, {"message": "Object does not exist"}
+            if found.head_sha not in commit["parents"] and not data.get("force"):
+                return 422, {"message": "Update is not a fast forward"}
+            tree = found.objects[commit["tree"]]
+            found.written.update({path: found.objects.get(sha) for path, sha in tree["files"].items()})
+            found.head = data["sha"]
+        return 200, self._ref_json(found, ref)
+
+    def _commit_json(self, repo: FakeRepo, sha: str, commit: dict) -> dict:
+        return {
+            "sha": sha,
+            "url": f"{self.url}/repos/{repo.full_name}/git/commits/{sha}",
+            "message": commit["message"],
+            "tree": {"sha": commit["tree"], "url": f"{self.url}/repos/{repo.full_name}/git/trees/{commit['tree']}"},
+            "parents": [{"sha": parent} for parent in commit["parents"]],
+        }
+
+    def _git_commit(self, owner: str, repo: str, sha: str, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        if sha == found.head_sha and not found.head:
+            return 200, self._commit_json(found, sha, {"message": "Synthetic", "tree": found.tree_sha, "parents": []})
+        commit = found.objects.get(sha)
+        if not isinstance(commit, dict) or "parents" not in commit:
+            return 404, {"message": "Not Found"}
+        return 200, self._commit_json(found, sha, commit)
+
+    def _create_blob(self, owner: str, repo: str, data: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        content = data["content"]
+        blob = base64.b64decode(content) if data.get("encoding") == "base64" else content.encode()
+        sha = git_sha("blob", blob)
+        with self._lock:
+            found.objects[sha] = blob
+        return 201, {"sha": sha, "url": f"{self.url}/repos/{found.full_name}/git/blobs/{sha}"}
+
+    def _create_tree(self, owner: str, repo: str, data: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        entries = data.get("tree", [])
+        # A null SHA deletes the path.
+        missing = [
+            entry["path"] for entry in entries
+            if entry.get("sha") is not None and not isinstance(found.objects.get(entry.get("sha")), bytes)
+        ]
+        if missing:
+            return 422, {"message": f"Blobs missing for {', '.join(missing)}"}
+        tree = {"base_tree": data.get("base_tree"), "files": {entry["path"]: entry["sha"] for entry in entries}}
+        sha = git_sha("tree", json.dumps(tree, sort_keys=True).encode())
+        with self._lock:
+            found.objects[sha] = tree
+        return 201, {"sha": sha, "url": f"{self.url}/repos/{found.full_name}/git/trees/{sha}", "tree": entries}
+
+    def _create_commit(self, owner: str, repo: str, data: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        if not isinstance(found.objects.get(data.get("tree")), dict):
+            return 422, {"message": "Tree does not exist"}
+        commit = {"tree": data["tree"], "parents": data.get("parents", []), "message": data.get("message", "")}
+        sha = git_sha("commit", json.dumps({**commit, "committer": data.get("committer")}, sort_keys=True).encode())
+        with self._lock:
+            found.objects[sha] = commit
+        return 201, self._commit_json(found, sha, commit)
+
+    def _tree(self, owner: str, repo: str, sha: str, query: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        # Trees made through the Git Data API are served as the repo's current tree.
+        root = sha in ("main", "HEAD", found.head_sha) or isinstance(found.objects.get(sha), dict)
+        directory = "" if root else found.directory(sha)
+        if directory is None:
+            return 404, {"message": "Not Found"}
+        recursive = query.get("recursive") not in (None, "", "0", "false")
+        entries = found.walk(directory) if recursive else found.entries(directory)
+        if recursive and not directory:
+            entries += found.extra_entries()
+        truncated = len(entries) > TREE_LIMIT
+        prefix = len(directory) + 1 if directory else 0
+        tree = [
+            {"path": path[prefix:], "mode": "040000" if kind == "tree" else "100644", "type": kind, "sha": entry_sha}
+            for path, kind, entry_sha in entries[:TREE_LIMIT]
+        ]
+        return 200, {"sha": found.dir_sha(directory), "tree": tree, "truncated": truncated}
+
+    def _blob(self, owner: str, repo: str, sha: str, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        data = found.blob(sha) if found is not None else None
+        if data is None:
+            return 404, {"message": "Not Found"}
+        return 200, {"sha": sha, "size": len(data), "encoding": "base64", "content": base64.b64encode(data).decode()}
+
+    def _contents(self, owner: str, repo: str, path: str, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        data = found.content(path) if found is not None else None
+        if data is None:
+            return 404, {"message": "Not Found"}
+        return 200, self._content_json(found, path, data)
+
+    def _put_contents(self, owner: str, repo: str, path: str, data: dict, **_) -> tuple[int, dict]:
+        found = self._repo(owner, repo)
+        if found is None:
+            return 404, {"message": "Not Found"}
+        current = found.content(path)
+        if current is not None and data.get("sha") != git_sha("blob", current):
+            return 409, {"message": f"{path} does not match {data.get('sha')}"}
+        new = base64.b64decode(data["content"])
+        with self._lock:
+            sha = found.advance({path: new}, data.get("message", ""))
+        commit = {"sha": sha, "message": data.get("message", "")}
+        return 200 if current is not None else 201, {"content": self._content_json(found, path, new), "commit": commit}
+
+    # -- GraphQL ------------------------------------------------------------
+
+    def _graphql(self, data: dict, **_) -> tuple[int, dict]:
+        query, variables = data.get("query", ""), data.get("variables") or {}
+        if "enterprise(slug:" in query:
+            return 200, self._gql_enterprise(variables)
+        if "organization(login:" in query:
+            return 200, self._gql_inventory(variables)
+        if "...Probe" in query:
+            return 200, self._gql_aliases(query, _PROBE_REPO, self._gql_probe)
+        if "object(expression:" in query:
+            return 200, self._gql_aliases(query, _BLOB_REPO, self._gql_blobs)
+        return 200, {"errors": [{"message": "Query not supported by the fake server"}]}
+
+    def _rate_limit_node(self) -> dict:
+        return {"cost": 1, "remaining": int(self._rate_headers("graphql", False)["X-RateLimit-Remaining"])}
+
+    def _gql_enterprise(self, variables: dict) -> dict:
+        nodes = [{"login": org} for org in self.orgs]
+        page = {"hasNextPage": False, "endCursor": None}
+        return {"data": {"enterprise": {"organizations": {"pageInfo": page, "nodes": nodes}}}}
+
+    def _gql_inventory(self, variables: dict) -> dict:
+        repos = self.orgs.get(variables.get("login"))
+        if repos is None:
+            return {"data": {"organization": None}, "errors": [{"type": "NOT_FOUND", "message": "No organization"}]}
+        start = int(variables.get("after") or 0)
+        end = start + int(variables.get("first") or _MAX_PER_PAGE)
+        nodes = []
+        for repo in repos[start:end]:
+            nodes.append({
+                "id": repo.node_id,
+                "name": repo.name,
+                "nameWithOwner": repo.full_name,
+                "isArchived": repo.archived,
+                "isFork": repo.fork,
+                "pushedAt": _timestamp(repo.pushed_at),
+                "createdAt": _timestamp(repo.created_at),
+                "visibility": repo.visibility.upper(),
+                "diskUsage": len(repo.paths),
+                "primaryLanguage": {"name": repo.language} if repo.language else None,
+                "repositoryTopics": {"nodes": []},
+                "defaultBranchRef": {"name": "main", "target": {"oid": repo.head_sha, "tree": {"oid": repo.tree_sha}}},
+            })
+        page = {"hasNextPage": end < len(repos), "endCursor": str(end)}
+        return {
+            "data": {"organization": {"repositories": {"pageInfo": page, "nodes": nodes}}, "rateLimit": self._rate_limit_node()},
+        }
+
+    def _gql_aliases(self, query: str, repo_pattern: re.Pattern, resolve) -> dict:
+        """Answer a query of aliased ``repository(owner:, name:)`` lookups with ``resolve(repo, body)``."""
+        data: dict = {}
+        errors = []
+        for match in repo_pattern.finditer(query):
+            repo = self._repo(json.loads(match["owner"]), json.loads(match["name"]))
+            if repo is None:
+                data[match["alias"]] = None
+                errors.append({"type": "NOT_FOUND", "path": [match["alias"]], "message": "Could not resolve to a Repository"})
+            else:
+                data[match["alias"]] = resolve(repo, match["body"] or "")
+        data["rateLimit"] = self._rate_limit_node()
+        return {"data": data, "errors": errors} if errors else {"data": data}
+
+    def _gql_text(self, repo: FakeRepo, path: str) -> dict | None:
+        data = repo.content(path)
+        if data is None or repo.is_dir(path):
+            return None
+        return {"oid": git_sha("blob", data), "text": data.decode("utf-8", "replace"), "isBinary": False, "isTruncated": False}
+
+    def _gql_tree(self, repo: FakeRepo, directory: str, depth: int, text: bool) -> dict | None:
+        """A ``... on Tree { entries { name type oid object { ... } } }`` result, ``depth`` levels deep."""
+        if not repo.is_dir(directory):
+            return None
+        entries = []
+        for path, kind, sha in repo.entries(directory):
+            entry = {"name": path.rpartition("/")[2], "type": kind, "oid": sha}
+            if kind == "tree" and depth > 1:
+                entry["object"] = self._gql_tree(repo, path, depth - 1, text)
+            elif kind == "blob" and text:
+                entry["object"] = self._gql_text(repo, path)
+            elif depth > 1:
+                entry["object"] = {}
+            entries.append(entry)
+        return {"entries": entries}
+
+    def _gql_probe(self, repo: FakeRepo, _body: str) -> dict:
+        def oid(path: str) -> dict | None:
+            data = repo.content(path)
+            return {"oid": git_sha("blob", data)} if data is not None and not repo.is_dir(path) else None
+
+        return {
+            "defaultBranchRef": {"target": {"oid": repo.head_sha}},
+            "claudeDir": self._gql_tree(repo, ".claude", 3, text=False),
+            "claudeMd": oid("CLAUDE.md"),
+            "memoryMd": oid("MEMORY.md"),
+            "mcpJson": self._gql_text(repo, ".mcp.json"),
+            "settingsJson": self._gql_text(repo, ".claude/settings.json"),
+            "workflows": self._gql_tree(repo, ".github/workflows", 1, text=True),
+        }
+
+    def _gql_blobs(self, repo: FakeRepo, body: str) -> dict:
+        return {match["alias"]: self._gql_text(repo, json.loads(match["expression"])[len("HEAD:"):])
+                for match in _BLOB_FIELD.finditer(body)}
+
+
+_REPO = r'(?P<alias>r\d+): repository\(owner: (?P<owner>"(?:[^"\\]|\\.)*"), name: (?P<name>"(?:[^"\\]|\\.)*")\)'
+_PROBE_REPO = re.compile(_REPO + r" \{ \.\.\.Probe \}(?P<body>)")
+_BLOB_REPO = re.compile(_REPO + r" \{\n(?P<body>.*?)\n  \}", re.DOTALL)
+_BLOB_FIELD = re.compile(r'(?P<alias>f\d+): object\(expression: (?P<expression>"(?:[^"\\]|\\.)*")\)')
+
+_OWNER_REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+_ROUTES = [
+    (verb, re.compile(pattern), name)
+    for verb, pattern, name in [
+        ("GET", r"/rate_limit", "rate_limit"),
+        ("GET", r"/orgs/(?P<org>[^/]+)", "org"),
+        ("GET", r"/orgs/(?P<org>[^/]+)/repos", "org_repos"),
+        ("GET", _OWNER_REPO, "get_repo"),
+        ("GET", _OWNER_REPO + r"/git/ref/(?P<ref>.+)", "git_ref"),
+        ("PATCH", _OWNER_REPO + r"/git/refs/(?P<ref>.+)", "update_ref"),
+        ("GET", _OWNER_REPO + r"/git/commits/(?P<sha>[^/]+)", "git_commit"),
+        ("POST", _OWNER_REPO + r"/git/blobs", "create_blob"),
+        ("POST", _OWNER_REPO + r"/git/trees", "create_tree"),
+        ("POST", _OWNER_REPO + r"/git/commits", "create_commit"),
+        ("GET", _OWNER_REPO + r"/git/trees/(?P<sha>[^/]+)", "tree"),
+        ("GET", _OWNER_REPO + r"/git/blobs/(?P<sha>[^/]+)", "blob"),
+        ("GET", _OWNER_REPO + r"/contents/(?P<path>.+)", "contents"),
+        ("PUT", _OWNER_REPO + r"/contents/(?P<path>.+)", "put_contents"),
+        ("POST", r"/graphql", "graphql"),
+    ]
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.fake.handle(self.command, self.path, self.headers, body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _serve
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orgs", default="synthetic-org", help="Comma-separated org logins")
+    parser.add_argument("--repos", type=int, default=1000, help="Repos per org")
+    parser.add_argument("--max-tree-paths", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered 502")
+    parser.add_argument("--secondary-rate", type=float, default=0.0, help="Share answered 403 secondary rate limit")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    orgs = {
+        org: synthetic_repos(org, args.repos, args.max_tree_paths, args.seed)
+        for org in (o.strip() for o in args.orgs.split(",")) if org
+    }
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.secondary_rate, args.retry_after, args.seed)
+    server = FakeGitHub(orgs, faults, args.rate_limit, args.port).start()
+    print(f"Serving {', '.join(orgs)} ({args.repos} repos each) at {server.url}; Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(", ".join(f"{count} {name}" for name, count in server.counts.most_common()))
+
+
+if __name__ == "__main__":
+    main()
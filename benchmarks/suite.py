@@ -0,0 +1,182 @@
+"""Benchmark detectors, aggregation and rendering on synthetic orgs of several sizes.
+
+Each stage is timed (best of ``--repeat``) and then run once more under
+tracemalloc for its peak memory. Results are written as JSON; compare two
+runs to spot regressions between commits. Run from the repository root::
+
+    python -m benchmarks.suite [--sizes 100,10000,100000] [--output bench.json]
+    python -m benchmarks.suite --sizes 100,10000 --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from src.config import Config
+from src.detectors import CONTENT_PARSERS, classify_paths
+from src.models import OrgStats, RepoFeatures
+from src.renderer import render_stats
+
+from .synthetic import SyntheticRepo, synthetic_org, synthetic_tree
+
+RESULTS_VERSION = 1
+
+SECTIONS = ["adoption", "skills", "agents", "hooks", "actions", "versions", "mcp", "details"]
+
+
+def detect(repos: list[SyntheticRepo]) -> list[RepoFeatures]:
+    """Run the tree detectors and content parsers over every repo, as a scan would."""
+    results = []
+    for repo in repos:
+        features = RepoFeatures(name=repo.name)
+        for kind, paths in classify_paths(repo.paths, features).items():
+            parse = CONTENT_PARSERS[kind][0]
+            for path in paths:
+                parse(repo.contents.get(path, b""), features)
+        results.append(features)
+    return results
+
+
+def _measure(fn: Callable, repeat: int) -> tuple[float, int, object]:
+    """Best wall time of ``fn()`` over ``repeat`` runs, its peak traced memory, and its result."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def _row(stage: str, repos: int, items: int, unit: str, seconds: float, peak: int) -> dict:
+    return {
+        "stage": stage,
+        "repos": repos,
+        "items": items,
+        "unit": unit,
+        "seconds": round(seconds, 6),
+        "per_second": round(items / seconds) if seconds else None,
+        "peak_bytes": peak,
+    }
+
+
+def run_size(repos: int, max_tree_paths: int, repeat: int, seed: int = 0) -> list[dict]:
+    """Benchmark every stage on one synthetic org of ``repos`` repos."""
+    org = list(synthetic_org(repos, max_tree_paths, seed))
+    paths = sum(len(repo.paths) for repo in org)
+    config = Config(gh_token="", org_name="bench", show_sections=SECTIONS, bar_sections=SECTIONS)
+
+    seconds, peak, features = _measure(lambda: detect(org), repeat)
+    rows = [_row("detectors", repos, paths, "paths", seconds, peak)]
+    seconds, peak, stats = _measure(lambda: OrgStats.aggregate("bench", features), repeat)
+    rows.append(_row("aggregate", repos, repos, "repos", seconds, peak))
+    seconds, peak, rendered = _measure(lambda: render_stats(stats, config), repeat)
+    rows.append(_row("render", repos, repos, "repos", seconds, peak))
+    rows[-1]["output_bytes"] = len(rendered.encode())
+    return rows
+
+
+def run_monorepo(paths: int, repeat: int, seed: int = 0) -> dict:
+    """Benchmark the tree detectors on one tree of ``paths`` paths."""
+    tree = synthetic_tree(random.Random(seed), paths)
+    tree += [".claude", "CLAUDE.md", ".claude/commands/review.md", ".github/workflows/claude.yml"]
+    seconds, peak, _ = _measure(lambda: classify_paths(tree, RepoFeatures(name="monorepo")), repeat)
+    return _row("detectors (one tree)", 1, len(tree), "paths", seconds, peak)
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_suite(sizes: list[int], max_tree_paths: int, monorepo_paths: int, repeat: int, seed: int = 0) -> dict:
+    results = []
+    for size in sizes:
+        results.extend(run_size(size, max_tree_paths, repeat, seed))
+    if monorepo_paths:
+        results.append(run_monorepo(monorepo_paths, repeat, seed))
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Stages more than ``threshold`` (a fraction) slower or bigger than in ``baseline``."""
+    before = {(row["stage"], row["repos"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = before.get((row["stage"], row["repos"]))
+        if old is None:
+            continue
+        for key in ("seconds", "peak_bytes"):
+            if old[key] and row[key] > old[key] * (1 + threshold):
+                regressions.append(f"{row['stage']} at {row['repos']} repos: {key} {old[key]} -> {row[key]}")
+    return regressions
+
+
+def _print(data: dict) -> None:
+    print(f"{'stage':<22}{'repos':>8}{'items':>11}{'ms':>11}{'items/s':>12}{'peak MiB':>10}")
+    for row in data["results"]:
+        print(
+            f"{row['stage']:<22}{row['repos']:>8}{row['items']:>11}{row['seconds'] * 1000:>11.1f}"
+            f"{row['per_second'] or 0:>12}{row['peak_bytes'] / 2**20:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000,100000", help="Comma-separated repo counts")
+    parser.add_argument("--max-tree-paths", type=int, default=5000, help="Largest tree in a synthetic org")
+    parser.add_argument("--monorepo-paths", type=int, default=1_000_000, help="Paths in the single-tree run (0 skips it)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="Write results as JSON to this file")
+    parser.add_argument("--compare", default="", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown or growth that counts as a regression")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    data = run_suite(sizes, args.max_tree_paths, args.monorepo_paths, args.repeat, args.seed)
+    _print(data)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, data, args.threshold)
+        for line in regressions:
+            print(f"Regression: {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {baseline.get('commit') or args.compare}.")
+
+
+if __name__ == "__main__":
+    main()
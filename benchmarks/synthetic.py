@@ -0,0 +1,139 @@
+"""Synthetic organizations for benchmarks.
+
+Repos are shaped like a real org's: tree sizes follow a heavy-tailed
+(Pareto) distribution, about one repo in five uses Claude Code, and names
+of skills, agents and MCP servers are drawn Zipf-style, so a few are common
+and most are rare. Everything is derived from ``seed``.
+"""
+from __future__ import annotations
+
+import json
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+_DIRS = ["src", "lib", "services", "packages", "docs", "test", "node_modules", "vendor", "tools", "internal"]
+_EXTENSIONS = ["py", "ts", "go", "md", "json", "yml"]
+_WORKFLOWS = ["ci", "release", "lint", "deploy", "codeql", "nightly"]
+_SERVERS = [f"mcp-{i}" for i in range(60)] + ["github", "slack", "postgres", "sentry", "linear", "filesystem"]
+_SKILLS = [f"skill-{i}" for i in range(400)]
+_AGENTS = [f"agent-{i}" for i in range(150)]
+_HOOKS = ["PreToolUse", "PostToolUse", "Notification", "Stop", "SubagentStop", "UserPromptSubmit", "SessionStart"]
+_ACTION_REFS = ["v1", "v1.0.3", "beta", "main", "a" * 40, "0123456789abcdef0123456789abcdef01234567"]
+
+_STEP = "      - name: Step {i}\n        uses: actions/{action}@v{version}\n        with:\n          cache: true\n"
+_CLAUDE_STEP = "      - uses: anthropics/{action}@{ref}\n"
+
+# Share of repos using Claude Code, and of those, each feature.
+ADOPTION = 0.2
+_FEATURE_RATES = {
+    "claude_md": 0.9,
+    "commands": 0.3,
+    "skills": 0.2,
+    "agents": 0.15,
+    "settings": 0.25,
+    "mcp_json": 0.3,
+    "workflow": 0.4,
+    "memory": 0.05,
+}
+
+
+@dataclass
+class SyntheticRepo:
+    name: str
+    paths: list[str]
+    contents: dict[str, bytes] = field(default_factory=dict)
+
+
+def _zipf_sample(rng: random.Random, names: list[str], k: int) -> list[str]:
+    """``k`` distinct names; the i-th (1-based) is drawn with probability 1/(i(i+1))."""
+    picked: list[str] = []
+    while len(picked) < min(k, len(names)):
+        name = names[min(int(rng.paretovariate(1.0)) - 1, len(names) - 1)]
+        if name not in picked:
+            picked.append(name)
+    return picked
+
+
+def tree_size(rng: random.Random, max_paths: int) -> int:
+    """A repo's path count: median around 40, a long tail up to ``max_paths``."""
+    return min(int(rng.paretovariate(1.2) * 25), max_paths)
+
+
+def synthetic_tree(rng: random.Random, size: int, pool: list[str] | None = None) -> list[str]:
+    """``size`` ordinary paths, drawn from ``pool`` when given (cheaper for many repos)."""
+    if pool is not None and size <= len(pool):
+        return rng.sample(pool, size)
+    paths = set()
+    while len(paths) < size:
+        parts = [rng.choice(_DIRS) + str(rng.randint(0, 50)) for _ in range(rng.randint(1, 6))]
+        paths.add("/".join([*parts, f"file{rng.randint(0, 10_000)}.{rng.choice(_EXTENSIONS)}"]))
+    return list(paths)
+
+
+def _workflow(rng: random.Random, claude: bool) -> bytes:
+    lines = ["name: CI\non: [push, pull_request]\njobs:\n  build:\n    runs-on: ubuntu-latest\n    steps:\n"]
+    for i in range(rng.randint(5, 40)):
+        lines.append(_STEP.format(i=i, action=rng.choice(["checkout", "cache", "setup-node"]), version=rng.randint(1, 4)))
+    if claude:
+        action = rng.choice(["claude-code-action", "claude-code-action", "claude-code-base-action"])
+        lines.insert(rng.randint(1, len(lines)), _CLAUDE_STEP.format(action=action, ref=rng.choice(_ACTION_REFS)))
+    return "".join(lines).encode()
+
+
+def _claude_files(rng: random.Random, repo: SyntheticRepo, workflows: list[bytes]) -> None:
+    """Add Claude Code paths and file contents to ``repo``; workflows are picked from ``workflows``."""
+    def has(feature: str) -> bool:
+        return rng.random() < _FEATURE_RATES[feature]
+
+    paths = repo.paths
+    if has("claude_md"):
+        paths.append("CLAUDE.md")
+    paths.append(".claude")
+    start = len(paths)
+    if has("commands"):
+        paths.append(".claude/commands")
+        paths.extend(f".claude/commands/{name}.md" for name in _zipf_sample(rng, _SKILLS, rng.randint(1, 8)))
+    if has("skills"):
+        paths.append(".claude/skills")
+        paths.extend(f".claude/skills/{name}/SKILL.md" for name in _zipf_sample(rng, _SKILLS, rng.randint(1, 5)))
+    if has("agents"):
+        paths.append(".claude/agents")
+        paths.extend(f".claude/agents/{name}.md" for name in _zipf_sample(rng, _AGENTS, rng.randint(1, 4)))
+    if has("memory"):
+        paths.append("MEMORY.md")
+    if has("settings"):
+        hooks = {hook: [{"hooks": [{"type": "command", "command": "make lint"}]}] for hook in rng.sample(_HOOKS, rng.randint(0, 3))}
+        servers = {name: {"command": "npx"} for name in _zipf_sample(rng, _SERVERS, rng.randint(0, 2))}
+        paths.append(".claude/settings.json")
+        repo.contents[".claude/settings.json"] = json.dumps({"hooks": hooks, "mcpServers": servers}).encode()
+    if has("mcp_json"):
+        servers = {name: {"command": "npx"} for name in _zipf_sample(rng, _SERVERS, rng.randint(1, 4))}
+        paths.append(".mcp.json")
+        repo.contents[".mcp.json"] = json.dumps({"mcpServers": servers}).encode()
+    if has("workflow"):
+        path = f".github/workflows/{rng.choice(['claude', 'claude-review', 'assistant'])}.yml"
+        paths.append(path)
+        repo.contents[path] = rng.choice(workflows)
+    if not any(path.startswith(".claude/") for path in paths[start:]):
+        # Git has no empty directories.
+        paths.append(".claude/settings.local.json")
+
+
+def synthetic_org(repos: int, max_tree_paths: int = 5000, seed: int = 0) -> Iterator[SyntheticRepo]:
+    """Yield ``repos`` synthetic repos, each tree at most ``max_tree_paths`` paths."""
+    rng = random.Random(seed)
+    pool = synthetic_tree(rng, min(max_tree_paths, 20_000))
+    # Repos share workflow bytes, so 100k repos fit in memory.
+    plain_workflows = [_workflow(rng, claude=False) for _ in range(64)]
+    claude_workflows = [_workflow(rng, claude=True) for _ in range(64)]
+    for i in range(repos):
+        repo = SyntheticRepo(name=f"repo-{i}", paths=synthetic_tree(rng, tree_size(rng, max_tree_paths), pool))
+        for _ in range(rng.randint(0, 3)):
+            path = f".github/workflows/{rng.choice(_WORKFLOWS)}.yml"
+            if path not in repo.contents:
+                repo.paths.append(path)
+                repo.contents[path] = rng.choice(plain_workflows)
+        if rng.random() < ADOPTION:
+            _claude_files(rng, repo, claude_workflows)
+        yield repo
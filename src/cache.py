@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+)
+"""
+
+# Commit after this many writes; the rest are flushed by close().
+_COMMIT_EVERY = 200
+
+
+class BlobCache:
+    """Persistent, size-bounded LRU cache of parsed detector results.
+
+    Keys are content addresses (see :func:`blob_key`), so an entry is valid
+    for every repo and every run that sees the same blob. Values are any
+    JSON-serializable result. Entries live in a SQLite file; once the stored
+    values exceed ``max_bytes`` the least recently used are evicted.
+
+    :meth:`claim` single-flights lookups: the first caller to miss a key owns
+    it and must :meth:`resolve` it (or :meth:`release` it on failure); other
+    callers get a future for the owner's result instead of doing the work
+    again.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(_SCHEMA)
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        self._inflight: dict[str, Future] = {}
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            return self._get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._put(key, value)
+
+    def claim(self, key: str) -> tuple[Any | None, Future | None]:
+        """Look up ``key``, claiming it on a miss.
+
+        Returns ``(value, None)`` on a hit, ``(None, future)`` when another
+        caller is already computing it, and ``(None, None)`` when the caller
+        now owns the key.
+        """
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                return value, None
+            if key in self._inflight:
+                return None, self._inflight[key]
+            self._inflight[key] = Future()
+            return None, None
+
+    def resolve(self, key: str, value: Any | None) -> None:
+        """Store an owned key's value (unless None) and wake its waiters."""
+        with self._lock:
+            if value is not None:
+                self._put(key, value)
+            future = self._inflight.pop(key, None)
+        if future is not None:
+            future.set_result(value)
+
+    def release(self, key: str) -> None:
+        """Give up an owned key without a value; its waiters get a :class:`LookupError`."""
+        with self._lock:
+            future = self._inflight.pop(key, None)
+        if future is not None:
+            future.set_exception(LookupError(f"{key} was released without a value"))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def _get(self, key: str) -> Any | None:
+        row = self._db.execute("SELECT value FROM blobs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute("UPDATE blobs SET used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def _put(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        old = self._db.execute("SELECT size FROM blobs WHERE key = ?", (key,)).fetchone()
+        if old is not None:
+            self._size -= old[0]
+        self._db.execute(
+            "INSERT OR REPLACE INTO blobs (key, value, size, used) VALUES (?, ?, ?, ?)",
+            (key, encoded, len(encoded), time.time()),
+        )
+        self._size += len(encoded)
+        if self._size > self.max_bytes:
+            self._evict()
+        self._writes += 1
+        if self._writes % _COMMIT_EVERY == 0:
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is 90% full."""
+        target = self.max_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM blobs ORDER BY used ASC").fetchall()
+        for key, size in rows:
+            if self._size <= target:
+                break
+            self._db.execute("DELETE FROM blobs WHERE key = ?", (key,))
+            self._size -= size
+            self.evictions += 1
+
+
+def blob_key(kind: str, version: int, sha: str) -> str:
+    """Cache key for the result of parser ``kind`` at ``version`` on blob ``sha``."""
+    return f"{kind}:v{version}:{sha}"
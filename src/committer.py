@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+from collections.abc import Callable
+
+from github import GithubException, InputGitAuthor, InputGitTreeElement, UnknownObjectException
+from github.Repository import Repository
+
+# A file's new content: fixed bytes, or a function of its current content
+# (None if it doesn't exist yet) that returns the new content. None deletes
+# the file, if it exists.
+FileChange = bytes | Callable[[bytes | None], bytes] | None
+
+# Statuses GitHub answers a ref update with when the branch moved since it
+# was read (422: not a fast-forward; 409: conflicting update in flight).
+_MOVED = (409, 422)
+
+
+def blob_sha(data: bytes) -> str:
+    """The SHA git gives a blob of ``data``."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def read_blob(repo: Repository, sha: str) -> bytes:
+    """The content of blob ``sha``, whatever its size."""
+    return base64.b64decode(repo.get_git_blob(sha).content)
+
+
+def read_file(repo: Repository, path: str, ref: str) -> bytes | None:
+    """``path``'s content at ``ref``, or None if it doesn't exist."""
+    try:
+        existing = repo.get_contents(path, ref=ref)
+    except UnknownObjectException:
+        return None
+    if isinstance(existing, list):
+        raise GithubException(422, {"message": f"{path} is a directory"}, None)
+    # Files over 1 MB come back without their content; read the blob instead.
+    if existing.content:
+        return existing.decoded_content
+    return read_blob(repo, existing.sha)
+
+
+class Committer:
+    """Commit several files to a branch in one commit, through the Git Data API.
+
+    :meth:`commit` reads the branch head and the blob SHAs in its tree, in
+    one recursive listing, and uploads blobs only for files whose new
+    content has a different SHA (computed locally). Only files whose new
+    content is a function of the current one are downloaded. Files to
+    delete are dropped from the tree if they are in it. It then builds
+    one tree on top of the head's, commits it and moves the branch to the
+    commit with a fast-forward-only ref update. If the branch moved in the
+    meantime, it starts over from the new head, re-running content
+    functions against what is there now, up to ``attempts`` times.
+    """
+
+    def __init__(
+        self,
+        repo: Repository,
+        branch: str,
+        message: str,
+        committer: InputGitAuthor,
+        attempts: int = 5,
+    ):
+        self.repo = repo
+        self.branch = branch
+        self.message = message
+        self.committer = committer
+        self.attempts = attempts
+        # Blobs already uploaded, kept across attempts.
+        self._uploaded: set[str] = set()
+
+    def _blob_shas(self, tree_sha: str, paths: list[str], ref: str) -> dict[str, str]:
+        """The blob SHA of each of ``paths`` that exists in the tree."""
+        tree = self.repo.get_git_tree(tree_sha, recursive=True)
+        wanted = set(paths)
+        shas = {item.path: item.sha for item in tree.tree if item.type == "blob" and item.path in wanted}
+        if tree.truncated:
+            # Too many entries to list at once: look up the rest one by one.
+            for path in wanted - shas.keys():
+                try:
+                    existing = self.repo.get_contents(path, ref=ref)
+                except UnknownObjectException:
+                    continue
+                if not isinstance(existing, list):
+                    shas[path] = existing.sha
+        return shas
+
+    def _changes(self, files: dict[str, FileChange], head) -> dict[str, str | None]:
+        """Upload the files that differ from ``head``; return their blob SHAs by path.
+
+        Files to delete that exist map to None.
+        """
+        current_shas = self._blob_shas(head.tree.sha, list(files), head.sha)
+        changed: dict[str, str | None] = {}
+        for path, change in files.items():
+            current_sha = current_shas.get(path, "")
+            if change is None:
+                if current_sha:
+                    changed[path] = None
+                continue
+            if callable(change):
+                data = change(read_blob(self.repo, current_sha) if current_sha else None)
+            else:
+                data = change
+            sha = blob_sha(data)
+            if sha == current_sha:
+                continue
+            if sha not in self._uploaded:
+                self.repo.create_git_blob(base64.b64encode(data).decode("ascii"), "base64")
+                self._uploaded.add(sha)
+            changed[path] = sha
+        return changed
+
+    def commit(self, files: dict[str, FileChange]) -> list[str]:
+        """Commit ``files`` (path -> change) in one commit; return the paths that changed.
+
+        Nothing is committed, and [] returned, if every file is unchanged
+        (and every file to delete is already gone).
+        """
+        for attempt in range(1, self.attempts + 1):
+            ref = self.repo.get_git_ref(f"heads/{self.branch}")
+            head = self.repo.get_git_commit(ref.object.sha)
+            changed = self._changes(files, head)
+            if not changed:
+                return []
+            # A None SHA removes the path from the tree.
+            elements = [InputGitTreeElement(path, "100644", "blob", sha=sha) for path, sha in changed.items()]
+            tree = self.repo.create_git_tree(elements, head.tree)
+            commit = self.repo.create_git_commit(
+                self.message, tree, [head], author=self.committer, committer=self.committer
+            )
+            try:
+                ref.edit(commit.sha)
+            except GithubException as e:
+                if e.status not in _MOVED or attempt == self.attempts:
+                    raise
+                print(f"  {self.branch} moved while committing; retrying on its new head.")
+                continue
+            return list(changed)
+        return []
@@ -23,12 +23,55 @@ class Config:
     commit_message: str = "Update Claude Code adoption stats"
     committer_name: str = "github-actions[bot]"
     committer_email: str = "github-actions[bot]@users.noreply.github.com"
+    scan_concurrency: int = 1
+    content_fetch: str = "rest"  # "rest" or "graphql"
+    content_batch_size: int = 50
+    cache_dir: str = ""
+    blob_cache_max_mb: int = 64
+    http_cache_max_mb: int = 256
+    full_rescan: bool = False
+    rate_limit_reserve: int = 50
+    gh_tokens: list[str] = field(default_factory=list)
+    app_id: str = ""
+    app_private_key: str = ""
+    app_installation_ids: list[str] = field(default_factory=list)
+    scan_mode: str = "tree"  # "tree" or "probe"
+    probe_batch_size: int = 25
+    tree_ignore: list[str] = field(default_factory=list)
+    tree_walk_max_dirs: int = 2000
+    shard: str = ""  # "k/n", 1-based
+    shard_output: str = "claude-stats-partial.json"
+    merge_inputs: list[str] = field(default_factory=list)
+    repo_listing: str = "rest"  # "rest" or "graphql"
+    org_names: list[str] = field(default_factory=list)  # every org in ORG_NAME; empty means [org_name]
+    enterprise: str = ""
+    history_path: str = ""
+    api_url: str = "https://api.github.com"
+    metrics_path: str = ""
+    metrics_prometheus_path: str = ""
+    step_summary: bool = True
+    profile: list[str] = field(default_factory=list)  # "cpu" and/or "memory"
+    profile_dir: str = "claude-stats-profile"
+    profile_sample_ms: int = 0
+    details_path: str = "claude-stats-details.md"
+    details_max_kb: int = 256  # 0 keeps the details table in the README
+    details_split: str = "file"  # "file" or "initial"
+
+    def orgs(self) -> list[str]:
+        """The organizations to scan, unless an enterprise is given."""
+        return self.org_names or ([self.org_name] if self.org_name else [])
 
     @staticmethod
     def from_env() -> Config:
         def get(name: str, default: str = "") -> str:
             return os.environ.get(f"INPUT_{name}", os.environ.get(name, default))
 
+        def choice(name: str, default: str, allowed: tuple[str, ...]) -> str:
+            value = get(name, default).strip().lower()
+            if value not in allowed:
+                raise ValueError(f"unknown {name} {value!r}; expected {' or '.join(allowed)}")
+            return value
+
         sections_raw = get("SHOW_SECTIONS", "adoption,skills,agents,hooks,actions")
         sections = [s.strip() for s in sections_raw.split(",") if s.strip()]
 
@@ -38,9 +81,27 @@ class Config:
         bar_raw = get("BAR_SECTIONS", "adoption,skills,agents,hooks,actions")
         bar_sections = [s.strip() for s in bar_raw.split(",") if s.strip()]
 
+        tokens_raw = get("GH_TOKENS", "")
+        tokens = [t.strip() for t in tokens_raw.replace("\n", ",").split(",") if t.strip()]
+
+        installations_raw = get("APP_INSTALLATION_IDS", "")
+        installations = [i.strip() for i in installations_raw.split(",") if i.strip()]
+
+        ignore_raw = get("TREE_IGNORE", "")
+        tree_ignore = [g.strip() for g in ignore_raw.split(",") if g.strip()]
+
+        orgs_raw = get("ORG_NAME")
+        org_names = [o.strip() for o in orgs_raw.replace("\n", ",").split(",") if o.strip()]
+
+        profile_raw = get("PROFILE", "")
+        profile = [p.strip().lower() for p in profile_raw.split(",") if p.strip()]
+
+        merge_raw = get("MERGE_INPUTS", "")
+        merge_inputs = [m.strip() for m in merge_raw.replace("\n", ",").split(",") if m.strip()]
+
         return Config(
             gh_token=get("GH_TOKEN"),
-            org_name=get("ORG_NAME"),
+            org_name=org_names[0] if org_names else "",
             repository=get("REPOSITORY"),
             show_sections=sections,
             blocks=get("BLOCKS", "░█"),
@@ -56,4 +117,38 @@ class Config:
             commit_message=get("COMMIT_MESSAGE", "Update Claude Code adoption stats"),
             committer_name=get("COMMITTER_NAME", "github-actions[bot]"),
             committer_email=get("COMMITTER_EMAIL", "github-actions[bot]@users.noreply.github.com"),
+            scan_concurrency=max(1, int(get("SCAN_CONCURRENCY", "1"))),
+            content_fetch=choice("CONTENT_FETCH", "rest", ("rest", "graphql")),
+            content_batch_size=max(1, int(get("CONTENT_BATCH_SIZE", "50"))),
+            cache_dir=get("CACHE_DIR", ""),
+            blob_cache_max_mb=int(get("BLOB_CACHE_MAX_MB", "64")),
+            http_cache_max_mb=int(get("HTTP_CACHE_MAX_MB", "256")),
+            full_rescan=get("FULL_RESCAN", "false").lower() == "true",
+            rate_limit_reserve=int(get("RATE_LIMIT_RESERVE", "50")),
+            gh_tokens=tokens,
+            app_id=get("APP_ID", ""),
+            app_private_key=get("APP_PRIVATE_KEY", ""),
+            app_installation_ids=installations,
+            scan_mode=choice("SCAN_MODE", "tree", ("tree", "probe")),
+            probe_batch_size=max(1, int(get("PROBE_BATCH_SIZE", "25"))),
+            tree_ignore=tree_ignore,
+            tree_walk_max_dirs=max(1, int(get("TREE_WALK_MAX_DIRS", "2000"))),
+            shard=get("SHARD", "").strip(),
+            shard_output=get("SHARD_OUTPUT", "claude-stats-partial.json"),
+            merge_inputs=merge_inputs,
+            repo_listing=choice("REPO_LISTING", "rest", ("rest", "graphql")),
+            org_names=org_names,
+            enterprise=get("ENTERPRISE", "").strip(),
+            history_path=get("HISTORY_PATH", ""),
+            # Actions sets GITHUB_API_URL, which also covers GitHub Enterprise Server.
+            api_url=(get("API_URL") or os.environ.get("GITHUB_API_URL") or "https://api.github.com").rstrip("/"),
+            metrics_path=get("METRICS_PATH", ""),
+            metrics_prometheus_path=get("METRICS_PROMETHEUS_PATH", ""),
+            step_summary=get("STEP_SUMMARY", "true").lower() == "true",
+            profile=profile,
+            profile_dir=get("PROFILE_DIR", "claude-stats-profile"),
+            profile_sample_ms=max(0, int(get("PROFILE_SAMPLE_MS", "0"))),
+            details_path=get("DETAILS_PATH", "claude-stats-details.md"),
+            details_max_kb=max(0, int(get("DETAILS_MAX_KB", "256"))),
+            details_split=choice("DETAILS_SPLIT", "file", ("file", "initial")),
         )
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
 from pathlib import PurePosixPath
 
 from .models import RepoFeatures
@@ -84,7 +87,233 @@ def paths_needing_content(tree_paths: set[str]) -> dict[str, list[str]]:
     return result
 
 
-def parse_mcp_json_content(content: str, features: RepoFeatures) -> None:
+# ---------------------------------------------------------------------------
+# Single-pass detection: every detector's path rules compiled together
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class PathRule:
+    """Which paths a detector looks at.
+
+    Set one of ``basename`` (file name anywhere in the tree), ``path`` (an
+    exact path) or ``prefix`` (anything under a directory; ends with "/").
+    ``suffixes``, when given, must also match the end of the path.
+    """
+
+    basename: str = ""
+    path: str = ""
+    prefix: str = ""
+    suffixes: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Detector:
+    """A named set of path rules.
+
+    Tree detectors update ``RepoFeatures`` from a matching path with
+    ``on_match``; content detectors (no ``on_match``) collect matching paths
+    under their :data:`CONTENT_PARSERS` key to be fetched.
+    """
+
+    name: str
+    rules: tuple[PathRule, ...]
+    on_match: Callable[[str, RepoFeatures], None] | None = None
+
+
+class DetectorRegistry:
+    """Classify every path of a tree against all detectors in one pass.
+
+    Rules are compiled into a map of basenames, a map of exact paths and a
+    trie of directory prefixes, so each path costs a few dict lookups and
+    string slices however many detectors there are.
+    """
+
+    def __init__(self, detectors: Iterable[Detector] = ()):
+        self._detectors: list[Detector] = []
+        self._compiled = None
+        for detector in detectors:
+            self.register(detector)
+
+    def register(self, detector: Detector) -> None:
+        self._detectors.append(detector)
+        self._compiled = None
+
+    @property
+    def content_kinds(self) -> list[str]:
+        return [d.name for d in self._detectors if d.on_match is None]
+
+    def _compile(self):
+        if self._compiled is None:
+            basenames: dict[str, list] = {}
+            paths: dict[str, list] = {}
+            trie: tuple[dict, list] = ({}, [])
+            for detector in self._detectors:
+                for rule in detector.rules:
+                    entry = (detector, rule.suffixes)
+                    if rule.basename:
+                        basenames.setdefault(rule.basename, []).append(entry)
+                    elif rule.path:
+                        paths.setdefault(rule.path, []).append(entry)
+                    else:
+                        node = trie
+                        for segment in rule.prefix.rstrip("/").split("/"):
+                            node = node[0].setdefault(segment, ({}, []))
+                        node[1].append(entry)
+            self._compiled = (basenames, paths, trie)
+        return self._compiled
+
+    def _matches(self, path: str) -> list:
+        basenames, paths, trie = self._compile()
+        matches = []
+        found = basenames.get(path[path.rfind("/") + 1:])
+        if found:
+            matches.extend(found)
+        found = paths.get(path)
+        if found:
+            matches.extend(found)
+        children = trie[0]
+        start = 0
+        while (end := path.find("/", start)) != -1:
+            node = children.get(path[start:end])
+            if node is None:
+                break
+            matches.extend(node[1])
+            children = node[0]
+            start = end + 1
+        return [detector for detector, suffixes in matches if not suffixes or path.endswith(suffixes)]
+
+    def matches(self, path: str) -> bool:
+        """True if any detector looks at ``path``."""
+        return bool(self._matches(path))
+
+    def classify(self, tree_paths: Iterable[str], features: RepoFeatures) -> dict[str, list[str]]:
+        """Run every detector over ``tree_paths`` in a single pass.
+
+        Updates ``features`` the way the individual ``detect_*`` functions do
+        and returns the paths needing content, like :func:`paths_needing_content`.
+        """
+        return self.classify_entries(((path, "") for path in tree_paths), features)[0]
+
+    def classify_entries(
+        self,
+        entries: Iterable[tuple[str, str]],
+        features: RepoFeatures,
+    ) -> tuple[dict[str, list[str]], dict[str, str]]:
+        """Like :meth:`classify`, for ``(path, blob_sha)`` entries.
+
+        Also returns the blob SHA of each path needing content; nothing else
+        about an entry is kept.
+        """
+        needed: dict[str, list[str]] = {kind: [] for kind in self.content_kinds}
+        shas: dict[str, str] = {}
+        basenames, paths, trie = self._compile()
+        for path, sha in entries:
+            # Inlined _matches: this loop runs once per path in the tree.
+            matches = None
+            found = basenames.get(path[path.rfind("/") + 1:])
+            if found:
+                matches = list(found)
+            found = paths.get(path)
+            if found:
+                matches = (matches or []) + found
+            children = trie[0]
+            start = 0
+            while (end := path.find("/", start)) != -1:
+                node = children.get(path[start:end])
+                if node is None:
+                    break
+                if node[1]:
+                    matches = (matches or []) + node[1]
+                children = node[0]
+                start = end + 1
+            if not matches:
+                continue
+            for detector, suffixes in matches:
+                if suffixes and not path.endswith(suffixes):
+                    continue
+                if detector.on_match is None:
+                    needed[detector.name].append(path)
+                    shas[path] = sha
+                else:
+                    detector.on_match(path, features)
+        return needed, shas
+
+
+def _stem(path: str) -> str:
+    """``PurePosixPath(path).stem`` without building a path object."""
+    name = path[path.rfind("/") + 1:]
+    dot = name.rfind(".")
+    return name[:dot] if 0 < dot < len(name) - 1 else name
+
+
+def _on_command(path: str, features: RepoFeatures) -> None:
+    features.custom_commands.add(_stem(path))
+    features.has_custom_commands = True
+
+
+def _on_skill(path: str, features: RepoFeatures) -> None:
+    # Skills use directory-based structure: .claude/skills/<name>/SKILL.md
+    rest = path[len(".claude/skills/"):]
+    slash = rest.find("/")
+    features.custom_commands.add(rest if slash == -1 else rest[:slash])
+    features.has_custom_commands = True
+
+
+def _on_agent(path: str, features: RepoFeatures) -> None:
+    features.agent_names.add(_stem(path))
+    features.has_agents = True
+
+
+def _set(flag: str) -> Callable[[str, RepoFeatures], None]:
+    def on_match(path: str, features: RepoFeatures) -> None:
+        setattr(features, flag, True)
+    return on_match
+
+
+# The detect_* functions and paths_needing_content, as rules. Content
+# detector names are CONTENT_PARSERS keys.
+DETECTORS = DetectorRegistry([
+    Detector("claude_md", (PathRule(basename="CLAUDE.md"),), _set("has_claude_md")),
+    Detector("claude_dir", (PathRule(path=".claude"), PathRule(prefix=".claude/")), _set("has_claude_dir")),
+    Detector("commands", (PathRule(prefix=".claude/commands/"),), _on_command),
+    Detector("skills", (PathRule(prefix=".claude/skills/"),), _on_skill),
+    Detector("memory", (PathRule(basename="MEMORY.md"),), _set("has_memory")),
+    Detector("agents", (PathRule(prefix=".claude/agents/"),), _on_agent),
+    Detector("mcp_json", (PathRule(basename=".mcp.json"),)),
+    Detector("settings_json", (PathRule(path=".claude/settings.json"),)),
+    Detector("workflows", (PathRule(prefix=".github/workflows/", suffixes=(".yml", ".yaml")),)),
+])
+
+
+def classify_paths(tree_paths: Iterable[str], features: RepoFeatures) -> dict[str, list[str]]:
+    """Run all tree detectors and return the paths needing content, in one pass."""
+    return DETECTORS.classify(tree_paths, features)
+
+
+# Directories never walked when a tree has to be read directory by directory.
+PRUNED_DIRS = frozenset({"node_modules", "vendor", "third_party", "bower_components", ".venv", "venv", ".git"})
+
+
+def is_detector_path(path: str) -> bool:
+    """True if any detector looks at ``path``, file or directory."""
+    return DETECTORS.matches(path)
+
+
+def is_pruned_dir(path: str, ignore: tuple[str, ...] = ()) -> bool:
+    """True if directory ``path`` should not be walked for detector targets.
+
+    ``ignore`` globs match either the whole path or the directory name.
+    ``.claude/`` and ``.github/workflows/`` are never pruned.
+    """
+    if path in (".claude", ".github", ".github/workflows") or path.startswith(".claude/"):
+        return False
+    name = PurePosixPath(path).name
+    if name in PRUNED_DIRS:
+        return True
+    return any(fnmatchcase(path, glob) or fnmatchcase(name, glob) for glob in ignore)
+
+
+def parse_mcp_json_content(content: str | bytes, features: RepoFeatures) -> None:
     """Parse .mcp.json content to extract MCP server names."""
     try:
         data = json.loads(content)
@@ -93,15 +322,16 @@ def parse_mcp_json_content(content: str, features: RepoFeatures) -> None:
             for name in servers:
                 if name not in features.mcp_servers:
                     features.mcp_servers.append(name)
-    except (json.JSONDecodeError, AttributeError):
+    except (ValueError, AttributeError):
+        # ValueError covers both bad JSON and bytes that aren't UTF-8.
         return
 
 
-def parse_settings_json_content(content: str, features: RepoFeatures) -> None:
+def parse_settings_json_content(content: str | bytes, features: RepoFeatures) -> None:
     """Parse .claude/settings.json to extract MCP servers and hooks."""
     try:
         data = json.loads(content)
-    except (json.JSONDecodeError, AttributeError):
+    except (ValueError, AttributeError):
         return
 
     # MCP servers
@@ -121,18 +351,108 @@ def parse_settings_json_content(content: str, features: RepoFeatures) -> None:
                     features.hook_types.append(hook_type)
 
 
-# Claude-related patterns in workflow files
-_CLAUDE_ACTION_PATTERNS = [
-    (re.compile(r"anthropics/claude-code-action", re.IGNORECASE), "claude-code-action"),
-    (re.compile(r"anthropics/claude-code-base-action", re.IGNORECASE), "claude-code-base-action"),
-    (re.compile(r"claude-code", re.IGNORECASE), "claude-code (ref)"),
-]
+# Claude-related references in workflow files, as one alternation. The
+# first branch is a ``uses:`` step with its pinned ref, the second any other
+# mention of an action, the third anything else mentioning claude-code.
+# Compiled for bytes (files fetched over REST are never decoded) and for
+# text (GraphQL returns it decoded).
+_WORKFLOW_PATTERN = (
+    rb"uses:[ \t]*[\"']?anthropics/(?P<uses>claude-code(?:-base)?-action)(?:/[^@\s\"']*)?@(?P<ref>[^\s\"'#]+)"
+    rb"|anthropics/(?P<action>claude-code(?:-base)?-action)"
+    rb"|claude-code"
+)
+_WORKFLOW_PATTERNS = {
+    bytes: re.compile(_WORKFLOW_PATTERN, re.IGNORECASE),
+    str: re.compile(_WORKFLOW_PATTERN.decode(), re.IGNORECASE),
+}
+# Every branch contains this, so files without it (most of them) are
+# rejected by one plain substring search.
+_WORKFLOW_NEEDLE = {bytes: b"claude-code", str: "claude-code"}
+_NEWLINE = {bytes: b"\n", str: "\n"}
+
+# Names recorded per match, in the order they are added to features.
+_CLAUDE_ACTION_NAMES = ("claude-code-action", "claude-code-base-action", "claude-code (ref)")
+
+
+def _text(value: str | bytes) -> str:
+    return value if isinstance(value, str) else value.decode("utf-8", errors="replace")
+
 
+def parse_workflow_content(content: str | bytes, features: RepoFeatures) -> None:
+    """Parse GitHub workflow YAML content for Claude-related references.
 
-def parse_workflow_content(content: str, features: RepoFeatures) -> None:
-    """Parse GitHub workflow YAML content for Claude-related references."""
-    for pattern, name in _CLAUDE_ACTION_PATTERNS:
-        if pattern.search(content):
-            if name not in features.claude_action_names:
-                features.claude_action_names.append(name)
+    Every ``uses: anthropics/claude-code[-base]-action@ref`` is also recorded
+    as ``<action>@<ref>`` in ``claude_action_refs``.
+    """
+    kind = type(content)
+    lowered = content.lower()
+    start = lowered.find(_WORKFLOW_NEEDLE[kind])
+    if start < 0:
+        return
+    # A match can begin no earlier than the line of the first mention. (Only
+    # str.lower() can change the length, for a few non-ASCII characters.)
+    start = content.rfind(_NEWLINE[kind], 0, start) + 1 if len(lowered) == len(content) else 0
+    found = set()
+    for match in _WORKFLOW_PATTERNS[kind].finditer(content, start):
+        # Any mention counts as a generic claude-code reference too.
+        found.add("claude-code (ref)")
+        action = match.group("uses") or match.group("action")
+        if action:
+            found.add(_text(action).lower())
+        if match.group("ref"):
+            features.claude_action_refs.add(f"{_text(action).lower()}@{_text(match.group('ref'))}")
+    for name in _CLAUDE_ACTION_NAMES:
+        if name in found:
+            features.claude_action_names.add(name)
             features.has_claude_actions = True
+
+
+# ---------------------------------------------------------------------------
+# Parsed results, for caching by blob
+# ---------------------------------------------------------------------------
+
+# Content parsers by paths_needing_content key, with a version to bump
+# whenever a parser's output for the same file changes. Cached results are
+# keyed on the version, so bumping it invalidates them.
+CONTENT_PARSERS = {
+    "mcp_json": (parse_mcp_json_content, 1),
+    "settings_json": (parse_settings_json_content, 1),
+    "workflows": (parse_workflow_content, 2),
+}
+
+
+def detectors_fingerprint() -> str:
+    """Identify the current content parser versions, for results saved across runs."""
+    return ",".join(f"{kind}:{version}" for kind, (_, version) in sorted(CONTENT_PARSERS.items()))
+
+
+# RepoFeatures fields the content parsers can set.
+_PARSED_FIELDS = (
+    "has_hooks", "has_claude_actions", "mcp_servers", "hook_types", "claude_action_names", "claude_action_refs"
+)
+
+
+def parse_content(kind: str, content: str | bytes) -> dict:
+    """Run the ``kind`` content parser on its own and return what it found.
+
+    The result is JSON-serializable and holds only the fields the parser set.
+    """
+    scratch = RepoFeatures(name="")
+    CONTENT_PARSERS[kind][0](content, scratch)
+    parsed = {}
+    for field in _PARSED_FIELDS:
+        value = getattr(scratch, field)
+        if value:
+            parsed[field] = list(value) if isinstance(value, list) else value
+    return parsed
+
+
+def apply_parsed(parsed: dict, features: RepoFeatures) -> None:
+    """Merge a :func:`parse_content` result into ``features``."""
+    for field, value in parsed.items():
+        if isinstance(value, list):
+            names = getattr(features, field)
+            for name in value:
+                names.add(name)
+        elif value:
+            setattr(features, field, True)
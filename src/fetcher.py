@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable
+
+from github import GithubException
+from github.Requester import Requester
+
+# Errors GitHub returns when a query is too big to run rather than wrong.
+_LIMIT_ERRORS = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED", "complexity", "timeout")
+
+# Marker for blobs that exist but weren't returned as text.
+_NEEDS_REST = object()
+
+
+class Unavailable:
+    """The type of :data:`UNAVAILABLE`."""
+
+    def __repr__(self) -> str:
+        return "UNAVAILABLE"
+
+
+# Content of a file that couldn't be fetched, as opposed to one that isn't there (None).
+UNAVAILABLE = Unavailable()
+
+# A fetched file: its text (GraphQL) or bytes (REST), None if it doesn't
+# exist, or UNAVAILABLE.
+FileContent = str | bytes | Unavailable | None
+
+
+class ContentFetcher:
+    """Fetch file contents from many repos with batched GraphQL queries.
+
+    Each request is a ``(full_name, path)`` pair read at ``HEAD``. Requests are
+    packed into queries of aliased ``object(expression: "HEAD:path")`` lookups,
+    grouped by repo. The batch size adapts: it grows by ``step`` after each
+    query that stays within ``max_cost``, shrinks when a query costs more, and
+    halves when GitHub rejects a query as too large; it never grows back to a
+    size that was rejected. A batch that fails at size 1, and any blob GraphQL
+    won't return as text, falls back to ``rest_fetch``.
+    """
+
+    def __init__(
+        self,
+        requester: Callable[[], Requester],
+        rest_fetch: Callable[[str, str], FileContent],
+        batch_size: int = 50,
+        max_batch_size: int = 250,
+        max_cost: int = 1,
+        step: int = 5,
+    ):
+        self._requester = requester
+        self._rest_fetch = rest_fetch
+        self._lock = threading.Lock()
+        self.batch_size = max(1, min(batch_size, max_batch_size))
+        self.max_batch_size = max_batch_size
+        self._ceiling = max_batch_size
+        self.max_cost = max_cost
+        self.step = step
+        self.queries = 0
+        self.rest_fallbacks = 0
+
+    def fetch(self, requests: list[tuple[str, str]]) -> list[FileContent]:
+        """Return the content of each ``(full_name, path)``, in request order."""
+        results: list[FileContent] = []
+        while len(results) < len(requests):
+            chunk = requests[len(results):len(results) + self.batch_size]
+            chunk = chunk[:_owner_run([full_name for full_name, _ in chunk])]
+            results.extend(self._fetch_chunk(chunk))
+        return results
+
+    def _fetch_chunk(self, chunk: list[tuple[str, str]]) -> list[FileContent]:
+        try:
+            texts, cost = self._query(chunk)
+        except GithubException as e:
+            if len(chunk) == 1:
+                return [self._fallback(*chunk[0])]
+            # Only size problems shrink later batches; other errors (a
+            # renamed repo, missing access) are bisected down to the file.
+            if _is_limit_error(e):
+                self._shrink(len(chunk))
+            mid = len(chunk) // 2
+            return self._fetch_chunk(chunk[:mid]) + self._fetch_chunk(chunk[mid:])
+
+        self._grow(len(chunk), cost)
+        return [
+            self._fallback(full_name, path) if text is _NEEDS_REST else text
+            for (full_name, path), text in zip(chunk, texts)
+        ]
+
+    def _fallback(self, full_name: str, path: str) -> FileContent:
+        with self._lock:
+            self.rest_fallbacks += 1
+        return self._rest_fetch(full_name, path)
+
+    def _shrink(self, size: int) -> None:
+        with self._lock:
+            self._ceiling = min(self._ceiling, max(1, size - 1))
+            self.batch_size = min(self.batch_size, max(1, size // 2))
+
+    def _grow(self, size: int, cost: int) -> None:
+        with self._lock:
+            if cost > self.max_cost:
+                self.batch_size = max(1, min(self.batch_size, size * self.max_cost // cost))
+            elif size >= self.batch_size:
+                self.batch_size = min(self._ceiling, self.batch_size + self.step)
+
+    def _query(self, chunk: list[tuple[str, str]]) -> tuple[list, int]:
+        query, aliases = build_blob_query(chunk)
+        with self._lock:
+            self.queries += 1
+        _, response = self._requester().graphql_query(query, {})
+        data = response.get("data") or {}
+        texts: list = []
+        for repo_alias, file_alias in aliases:
+            blob = (data.get(repo_alias) or {}).get(file_alias)
+            if blob is None:
+                texts.append(None)
+            elif blob.get("isBinary") or blob.get("isTruncated") or blob.get("text") is None:
+                texts.append(_NEEDS_REST)
+            else:
+                texts.append(blob["text"])
+        cost = ((data.get("rateLimit") or {}).get("cost")) or 1
+        return texts, cost
+
+
+def _owner_run(full_names: list[str]) -> int:
+    """How many of ``full_names``, from the first, have its owner.
+
+    A query is signed for one account (an App installation only sees its
+    own), so a batch never spans owners.
+    """
+    owner = full_names[0].split("/", 1)[0].lower()
+    for i, full_name in enumerate(full_names):
+        if full_name.split("/", 1)[0].lower() != owner:
+            return i
+    return len(full_names)
+
+
+def _is_limit_error(error: GithubException) -> bool:
+    """True when GitHub refused a query for its size rather than its content."""
+    if error.status >= 500:
+        return True
+    message = json.dumps(error.data) if error.data else ""
+    return any(marker in message for marker in _LIMIT_ERRORS)
+
+
+def build_blob_query(chunk: list[tuple[str, str]]) -> tuple[str, list[tuple[str, str]]]:
+    """Build one GraphQL query reading every ``(full_name, path)`` in ``chunk``.
+
+    Returns the query and, per request, the ``(repo_alias, file_alias)`` its
+    blob will be found under in the response.
+    """
+    repo_aliases: dict[str, str] = {}
+    fields: dict[str, list[str]] = {}
+    aliases: list[tuple[str, str]] = []
+    for full_name, path in chunk:
+        if full_name not in repo_aliases:
+            repo_aliases[full_name] = f"r{len(repo_aliases)}"
+            fields[full_name] = []
+        file_alias = f"f{len(fields[full_name])}"
+        expression = json.dumps(f"HEAD:{path}")
+        fields[full_name].append(
+            f"{file_alias}: object(expression: {expression}) {{ ... on Blob {{ text isBinary isTruncated }} }}"
+        )
+        aliases.append((repo_aliases[full_name], file_alias))
+
+    parts = ["query {"]
+    for full_name, repo_alias in repo_aliases.items():
+        owner, name = full_name.split("/", 1)
+        parts.append(f"  {repo_alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{")
+        parts.extend(f"    {field}" for field in fields[full_name])
+        parts.append("  }")
+    parts.append("  rateLimit { cost remaining }")
+    parts.append("}")
+    return "\n".join(parts), aliases
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import datetime
+import gzip
+import io
+import json
+from dataclasses import dataclass, field
+
+from .models import OrgStats, RepoFeatures
+
+# Bump when the record layout changes; older histories are rejected, not
+# misread.
+HISTORY_VERSION = 1
+
+# Features recorded per repo, bit ``j`` for ``HISTORY_FIELDS[j]``. Only ever
+# append: saved bitsets keep their meaning.
+HISTORY_FIELDS = (
+    "has_claude_md",
+    "has_claude_dir",
+    "has_custom_commands",
+    "has_claude_actions",
+    "has_hooks",
+    "has_agents",
+    "has_memory",
+    "is_stale",
+    "is_new",
+    "mcp_servers",
+    "custom_commands",
+    "claude_action_names",
+    "hook_types",
+    "agent_names",
+    "claude_action_refs",
+)
+
+
+@dataclass
+class Snapshot:
+    """One run's aggregated counts.
+
+    ``counts`` holds ``repos`` (total), ``adopting`` and the number of repos
+    with each of :data:`HISTORY_FIELDS`; ``counters`` the name counts.
+    """
+
+    date: datetime.datetime
+    counts: dict[str, int] = field(default_factory=dict)
+    counters: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+class History:
+    """Every run's snapshot, plus each repo's features as of the latest one.
+
+    Stored as gzipped JSON lines, one record per run. A record carries the
+    run's counts and, per repo, only what changed since the record before:
+    the feature bitset of each new or changed repo and the names of repos
+    that are gone. Each run appends one gzip member, so the file is never
+    recompressed, and it is read back in one streaming pass.
+    """
+
+    def __init__(self):
+        self.snapshots: list[Snapshot] = []
+        self.repos: dict[str, int] = {}
+
+    @staticmethod
+    def load(data: bytes) -> History:
+        """Read a history file (any number of concatenated gzip members)."""
+        history = History()
+        if not data:
+            return history
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as f:
+            for line in f:
+                history._apply(json.loads(line))
+        return history
+
+    def _apply(self, record: dict) -> Snapshot:
+        if record.get("v") != HISTORY_VERSION:
+            raise ValueError(f"Unsupported history record version {record.get('v')!r}")
+        self.repos.update(record["repos"])
+        for name in record["gone"]:
+            self.repos.pop(name, None)
+        snapshot = Snapshot(datetime.datetime.fromisoformat(record["date"]), record["counts"], record["counters"])
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def record(self, stats: OrgStats, date: datetime.datetime | None = None) -> bytes:
+        """Add a snapshot of ``stats``; return the gzip member to append to the file."""
+        date = date or datetime.datetime.now(datetime.timezone.utc)
+        store = stats.store
+        current = dict(zip(store.repo_names, store.row_bits(HISTORY_FIELDS)))
+        counts = {"repos": stats.total_repos, "adopting": stats.adopting().bit_count()}
+        counts.update((name, store.count(name)) for name in HISTORY_FIELDS)
+        record = {
+            "v": HISTORY_VERSION,
+            "date": date.isoformat(),
+            "org": stats.org_name,
+            "counts": counts,
+            "counters": {name: dict(store.name_counts(name)) for name in RepoFeatures.NAME_FIELDS},
+            "repos": {name: bits for name, bits in current.items() if self.repos.get(name) != bits},
+            "gone": sorted(self.repos.keys() - current.keys()),
+        }
+        self._apply(record)
+        return gzip.compress(json.dumps(record, separators=(",", ":")).encode() + b"\n", mtime=0)
+
+    def before(self, date: datetime.datetime) -> Snapshot | None:
+        """The latest snapshot taken at or before ``date``."""
+        found = None
+        for snapshot in self.snapshots:
+            if snapshot.date > date:
+                break
+            found = snapshot
+        return found
+
+    def weekly(self, key: str, weeks: int = 12) -> list[int]:
+        """``counts[key]`` of the last snapshot of each of the latest ``weeks`` ISO weeks.
+
+        A week without a snapshot repeats the week before it, so the values
+        stay one per calendar week.
+        """
+        by_week: dict[datetime.date, int] = {}
+        for snapshot in self.snapshots:
+            day = snapshot.date.date()
+            by_week[day - datetime.timedelta(days=day.weekday())] = snapshot.counts.get(key, 0)
+        if not by_week:
+            return []
+        values = []
+        monday, last = min(by_week), max(by_week)
+        while monday <= last:
+            values.append(by_week.get(monday, values[-1] if values else 0))
+            monday += datetime.timedelta(weeks=1)
+        return values[-weeks:]
+
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from github import GithubException
+from github.Requester import Requester
+
+INVENTORY_PAGE_SIZE = 100
+
+# Most topics read per repo.
+_MAX_TOPICS = 20
+
+INVENTORY_QUERY = f"""
+query($login: String!, $first: Int!, $after: String) {{
+  organization(login: $login) {{
+    repositories(first: $first, after: $after, orderBy: {{field: NAME, direction: ASC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        id name nameWithOwner isArchived isFork pushedAt createdAt visibility diskUsage
+        primaryLanguage {{ name }}
+        repositoryTopics(first: {_MAX_TOPICS}) {{ nodes {{ topic {{ name }} }} }}
+        defaultBranchRef {{ name target {{ oid ... on Commit {{ tree {{ oid }} }} }} }}
+      }}
+    }}
+  }}
+  rateLimit {{ cost remaining }}
+}}
+"""
+
+ENTERPRISE_ORGS_QUERY = """
+query($slug: String!, $after: String) {
+  enterprise(slug: $slug) {
+    organizations(first: 100, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { login }
+    }
+  }
+}
+"""
+
+
+@dataclass
+class RepoInfo:
+    """One repo as listed by the GraphQL inventory.
+
+    Attribute names match PyGithub's ``Repository``, so a ``RepoInfo`` can
+    stand in for a listed repo. ``head_sha`` and ``tree_sha`` are the default
+    branch's head commit and its root tree ("" for an empty repo).
+    """
+
+    name: str
+    full_name: str
+    node_id: str = ""
+    archived: bool = False
+    fork: bool = False
+    pushed_at: datetime.datetime | None = None
+    created_at: datetime.datetime | None = None
+    default_branch: str = ""
+    language: str | None = None
+    visibility: str = ""
+    disk_usage: int = 0  # KB
+    topics: list[str] = field(default_factory=list)
+    head_sha: str = ""
+    tree_sha: str = ""
+
+
+def _datetime(value: str | None) -> datetime.datetime | None:
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def parse_repo_node(node: dict) -> RepoInfo:
+    """Turn one ``repositories.nodes`` entry of :data:`INVENTORY_QUERY` into a :class:`RepoInfo`."""
+    branch = node.get("defaultBranchRef") or {}
+    target = branch.get("target") or {}
+    return RepoInfo(
+        name=node["name"],
+        full_name=node["nameWithOwner"],
+        node_id=node.get("id", ""),
+        archived=bool(node.get("isArchived")),
+        fork=bool(node.get("isFork")),
+        pushed_at=_datetime(node.get("pushedAt")),
+        created_at=_datetime(node.get("createdAt")),
+        default_branch=branch.get("name", ""),
+        language=(node.get("primaryLanguage") or {}).get("name"),
+        visibility=(node.get("visibility") or "").lower(),
+        disk_usage=node.get("diskUsage") or 0,
+        topics=[topic["topic"]["name"] for topic in (node.get("repositoryTopics") or {}).get("nodes") or []],
+        head_sha=target.get("oid", ""),
+        tree_sha=(target.get("tree") or {}).get("oid", ""),
+    )
+
+
+def fetch_inventory(requester: Requester, org_name: str, page_size: int = INVENTORY_PAGE_SIZE) -> Iterator[RepoInfo]:
+    """Yield every repo of ``org_name`` in name order, ``page_size`` per GraphQL query."""
+    after = None
+    while True:
+        variables = {"login": org_name, "first": page_size, "after": after}
+        _, response = requester.graphql_query(INVENTORY_QUERY, variables)
+        org = (response.get("data") or {}).get("organization")
+        if org is None:
+            raise GithubException(404, response, None)
+        repos = org["repositories"]
+        for node in repos["nodes"]:
+            if node is not None:
+                yield parse_repo_node(node)
+        page = repos["pageInfo"]
+        if not page["hasNextPage"]:
+            return
+        after = page["endCursor"]
+
+
+def fetch_enterprise_orgs(requester: Requester, slug: str) -> list[str]:
+    """Logins of every organization in enterprise ``slug`` visible to the token."""
+    logins: list[str] = []
+    after = None
+    while True:
+        _, response = requester.graphql_query(ENTERPRISE_ORGS_QUERY, {"slug": slug, "after": after})
+        enterprise = (response.get("data") or {}).get("enterprise")
+        if enterprise is None:
+            raise GithubException(404, response, None)
+        orgs = enterprise["organizations"]
+        logins.extend(node["login"] for node in orgs["nodes"] if node is not None)
+        if not orgs["pageInfo"]["hasNextPage"]:
+            return logins
+        after = orgs["pageInfo"]["endCursor"]
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import datetime
+import os
 import re
 import sys
+from collections.abc import Callable
 
 from github import Auth, Github, GithubException, InputGitAuthor
+from github.Repository import Repository
 
+from . import transport
+from .committer import Committer, FileChange, read_file
 from .config import Config
-from .renderer import render_stats
-from .scanner import scan_organization
+from .history import History
+from .metrics import Metrics
+from .profiling import Profiler
+from .renderer import detail_pages, render_stats
+from .scanner import scan_organizations
+from .shards import expand_inputs, merge_partials, parse_shard, save_partial
+from .tokens import build_pool
+from .transport import ResponseCache, Transport
 
 
 def _replace_section(readme: str, section_name: str, content: str) -> str:
@@ -30,9 +42,9 @@ def _replace_section(readme: str, section_name: str, content: str) -> str:
     return readme
 
 
-def update_readme(config: Config, rendered: str) -> None:
-    """Update the README file in the repository with rendered stats."""
-    gh = Github(auth=Auth.Token(config.gh_token))
+def _target_repo(config: Config) -> tuple[Repository, str]:
+    """The repository and branch the README (and history) live in."""
+    gh = Github(auth=Auth.Token(config.gh_token), base_url=config.api_url)
 
     # Determine the repository to update
     if config.repository:
@@ -41,57 +53,187 @@ def update_readme(config: Config, rendered: str) -> None:
         repo = gh.get_repo(f"{config.org_name}/{config.org_name}")
 
     # Determine branch
-    branch = config.target_branch or repo.default_branch
-
-    # Get current README
+    return repo, config.target_branch or repo.default_branch
+
+
+def update_readme(
+    config: Config,
+    rendered: str,
+    files: dict[str, str] | None = None,
+    history_record: Callable[[bytes], bytes] | None = None,
+) -> None:
+    """Commit the README with rendered stats, along with ``files`` and the history, in one commit.
+
+    ``files`` (path -> content) are written as given, and detail pages
+    not among them (left from an earlier layout, or a letter no repo starts
+    with any more) are deleted. ``history_record`` builds this run's record
+    from the history file as it is at commit time, and the record is
+    appended to it. Files that wouldn't change are left out, and nothing is
+    committed if none would.
+    """
+    repo, branch = _target_repo(config)
+
+    def readme(current: bytes | None) -> bytes:
+        if current is None:
+            print(f"Error: Could not read {config.target_path}.")
+            sys.exit(1)
+        return _replace_section(current.decode("utf-8"), config.section_name, rendered).encode("utf-8")
+
+    changes: dict[str, FileChange] = {config.target_path: readme}
+    for path, content in (files or {}).items():
+        changes[path] = content.encode("utf-8")
+    if files is not None:
+        for path in detail_pages(config):
+            changes.setdefault(path, None)
+    if history_record is not None:
+        # Built and appended at commit time, so a concurrent run's record is kept.
+        changes[config.history_path] = lambda current: (current or b"") + history_record(current or b"")
+
+    committer = Committer(
+        repo, branch, config.commit_message, InputGitAuthor(config.committer_name, config.committer_email)
+    )
     try:
-        readme_file = repo.get_contents(config.target_path, ref=branch)
-    except GithubException as e:
-        print(f"Error: Could not read {config.target_path}: {e}")
+        changed = committer.commit(changes)
+    except (GithubException, OSError, EOFError, ValueError) as e:
+        # The latter from a history file that can no longer be read.
+        print(f"Error committing update: {e}")
         sys.exit(1)
 
-    current_content = readme_file.decoded_content.decode("utf-8")
-    new_content = _replace_section(current_content, config.section_name, rendered)
-
-    if new_content == current_content:
+    if not changed:
         print("No changes to README. Skipping commit.")
         return
+    print(f"Updated {', '.join(changed)} on {branch} in one commit.")
 
-    # Commit the update
-    committer = InputGitAuthor(config.committer_name, config.committer_email)
-    try:
-        repo.update_file(
-            path=config.target_path,
-            message=config.commit_message,
-            content=new_content,
-            sha=readme_file.sha,
-            branch=branch,
-            committer=committer,
-        )
-        print(f"Updated {config.target_path} on {branch}.")
-    except GithubException as e:
-        print(f"Error committing update: {e}")
-        sys.exit(1)
+
+def load_history(config: Config) -> History:
+    """Read the history file next to the README."""
+    repo, branch = _target_repo(config)
+    return History.load(read_file(repo, config.history_path, branch) or b"")
 
 
 def main() -> None:
-    config = Config.from_env()
+    try:
+        config = Config.from_env()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-    if not config.gh_token:
-        print("Error: GH_TOKEN is required.")
+    if not (config.gh_token or config.gh_tokens or (config.app_id and config.app_private_key)):
+        print("Error: GH_TOKEN, GH_TOKENS or APP_ID and APP_PRIVATE_KEY are required.")
         sys.exit(1)
-    if not config.org_name:
-        print("Error: ORG_NAME is required.")
+    if not (config.org_name or config.enterprise):
+        print("Error: ORG_NAME or ENTERPRISE is required.")
         sys.exit(1)
+    if not (config.org_name or config.repository):
+        print("Error: REPOSITORY is required when scanning an ENTERPRISE without ORG_NAME.")
+        sys.exit(1)
+    try:
+        shard = parse_shard(config.shard)
+        profiler = Profiler(config.profile, config.profile_dir, config.profile_sample_ms)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # Every GitHub request below, on any client, goes through this transport.
+    metrics = Metrics()
+    response_cache = None
+    if config.cache_dir:
+        response_cache = ResponseCache(os.path.join(config.cache_dir, "http"), config.http_cache_max_mb * 1024 * 1024)
+    pool = build_pool(config)
+    active = Transport(response_cache, pool=pool, metrics=metrics)
+    transport.install(active)
+    # Clients are built from gh_token; the transport re-signs each request
+    # with whichever pooled credential has the most budget left.
+    if not config.gh_token:
+        config.gh_token = pool.credentials[0].auth.token
 
-    stats = scan_organization(config)
-    rendered = render_stats(stats, config)
+    try:
+        run(config, shard, active, metrics, profiler)
+    finally:
+        # Also on failure: a run that died is the one worth looking into.
+        metrics.count("rate_limit_sleep_seconds", round(active.slept, 3))
+        if response_cache is not None:
+            metrics.count("http_cache_evictions", response_cache.evictions)
+        write_metrics(config, metrics)
+        if profiler.written:
+            print(f"Wrote {len(profiler.written)} profile files to {config.profile_dir}.")
+
+
+def run(
+    config: Config,
+    shard: tuple[int, int] | None,
+    active: Transport,
+    metrics: Metrics,
+    profiler: Profiler,
+) -> None:
+    """Scan (or merge shards), render, and commit the README and history."""
+    pool = active.pool
+    if config.merge_inputs:
+        # Final job of a sharded scan: combine the partials, scan nothing.
+        paths = expand_inputs(config.merge_inputs)
+        if not paths:
+            print(f"Error: no partials match MERGE_INPUTS {', '.join(config.merge_inputs)}.")
+            sys.exit(1)
+        try:
+            with metrics.phase("aggregation"), profiler.phase("aggregate"):
+                stats = merge_partials(config.org_name, paths)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: could not merge partials: {e}")
+            sys.exit(1)
+        print(f"Merged {len(paths)} partials: {stats.total_repos} repos.")
+    else:
+        with profiler.phase("scan"):
+            scanned = scan_organizations(config, metrics)
+        # Repos are counted as they are scanned; only the orgs' rollup is left.
+        with metrics.phase("aggregation"), profiler.phase("aggregate"):
+            stats = scanned.rollup()
+        if shard is not None:
+            save_partial(stats, config.shard_output, shard)
+            print(f"Wrote shard {config.shard} ({stats.total_repos} repos) to {config.shard_output}.")
+            print(f"GitHub API: {active.summary()}.")
+            return
+
+    history = None
+    history_record = None
+    if config.history_path:
+        try:
+            history = load_history(config)
+        except (GithubException, OSError, EOFError, ValueError) as e:
+            # Never add to a history that can't be read.
+            print(f"Warning: could not read {config.history_path}; not recording this run: {e}")
+        else:
+            date = datetime.datetime.now(datetime.timezone.utc)
+            # Recorded here for the trends section, and again at commit time
+            # against the history then, which another run may have added to.
+            history.record(stats, date)
+
+            def history_record(current: bytes) -> bytes:
+                return History.load(current).record(stats, date)
+
+    # Pages the details table is moved to when it's too big for the README.
+    files: dict[str, str] = {}
+    with metrics.phase("render"), profiler.phase("render"):
+        rendered = render_stats(stats, config, history, files)
 
     print("\n--- Rendered Output ---")
     print(rendered)
     print("--- End Output ---\n")
 
-    update_readme(config, rendered)
+    pool.release_reserve()
+    with metrics.phase("commit"):
+        update_readme(config, rendered, files, history_record)
+    print(f"GitHub API: {active.summary()}.")
+    for line in pool.report():
+        print(f"  {line}")
+
+
+def write_metrics(config: Config, metrics: Metrics) -> None:
+    """Write the run's metrics where configured; never fails the run."""
+    summary_path = os.environ.get("GITHUB_STEP_SUMMARY", "") if config.step_summary else ""
+    try:
+        metrics.write(config.metrics_path, config.metrics_prometheus_path, summary_path)
+    except OSError as e:
+        print(f"Warning: could not write metrics: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from .files import atomic_write
+
+METRICS_VERSION = 1
+
+# Phases in the order they are reported. Scan phases run concurrently, so
+# their times are summed over workers.
+PHASES = ("listing", "trees", "content", "detection", "aggregation", "render", "commit")
+
+_QUANTILES = (0.5, 0.9, 0.99)
+_SLOWEST = 10
+_PROMETHEUS_PREFIX = "claude_org_stats"
+
+# URL path segments that vary per request, for grouping requests by endpoint.
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"/git/(trees|blobs|commits)/[^/]+"), r"/git/\1/{sha}"),
+    (re.compile(r"/git/(refs?)/.+"), r"/git/\1/{ref}"),
+    (re.compile(r"/contents/.*"), "/contents/{path}"),
+    (re.compile(r"/app/installations/\d+"), "/app/installations/{id}"),
+]
+
+
+def endpoint_for(verb: str, url: str) -> str:
+    """``verb`` and the path of ``url`` with per-request segments replaced, e.g. ``GET /repos/{owner}/{repo}``."""
+    path = url.split("?", 1)[0]
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path, count=1)
+    return f"{verb} {path}"
+
+
+def quantile(values: list[float], q: float) -> float:
+    """The ``q`` quantile of sorted ``values`` (nearest rank)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0  # status 400 and up
+    not_modified: int = 0  # answered from the response cache
+    bytes: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "not_modified": self.not_modified,
+            "bytes": self.bytes,
+            "latency_seconds": {
+                **{f"p{round(q * 100)}": round(quantile(latencies, q), 4) for q in _QUANTILES},
+                "max": round(latencies[-1], 4) if latencies else 0.0,
+                "sum": round(sum(latencies), 4),
+            },
+        }
+
+
+class Metrics:
+    """Counters and timings for one run, safe to update from any thread.
+
+    Requests are grouped by :func:`endpoint_for`; :meth:`phase` and
+    :meth:`timed` add to the time spent per phase; :meth:`record_repo` keeps
+    the slowest repos. Report with :meth:`to_dict`, :meth:`to_prometheus` and
+    :meth:`to_markdown`.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self.phases: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.counters: Counter = Counter()
+        self._slowest: list[tuple[float, str]] = []
+
+    def record_request(self, endpoint: str, status: int, seconds: float, size: int, cached: bool = False) -> None:
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.errors += status >= 400
+            stats.not_modified += cached
+            stats.bytes += size
+            stats.latencies.append(seconds)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add_phase(name, self._clock() - start)
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from ``iterable``, adding the time spent producing each item to phase ``name``."""
+        iterator = iter(iterable)
+        while True:
+            start = self._clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_phase(name, self._clock() - start)
+            yield item
+
+    def record_repo(self, name: str, seconds: float) -> None:
+        """Note how long a repo took, keeping the slowest few."""
+        with self._lock:
+            self.counters["repos"] += 1
+            if len(self._slowest) < _SLOWEST:
+                heapq.heappush(self._slowest, (seconds, name))
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, name))
+
+    def slowest_repos(self) -> list[tuple[str, float]]:
+        with self._lock:
+            return [(name, seconds) for seconds, name in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())}
+            counters = dict(sorted(self.counters.items()))
+            phases = {name: round(seconds, 3) for name, seconds in self.phases.items()}
+        return {
+            "version": METRICS_VERSION,
+            "duration_seconds": round(self._clock() - self._started, 3),
+            "phase_seconds": phases,
+            "counters": counters,
+            "api": {
+                **{key: sum(e[key] for e in endpoints.values()) for key in ("requests", "errors", "not_modified", "bytes")},
+                "endpoints": endpoints,
+            },
+            "slowest_repos": [{"repo": name, "seconds": round(seconds, 3)} for name, seconds in self.slowest_repos()],
+        }
+
+    def to_prometheus(self) -> str:
+        """The metrics in Prometheus text exposition format, for a node_exporter textfile."""
+        data = self.to_dict()
+        p = _PROMETHEUS_PREFIX
+        lines = [
+            f"# TYPE {p}_duration_seconds gauge",
+            f"{p}_duration_seconds {data['duration_seconds']}",
+            f"# TYPE {p}_phase_seconds gauge",
+        ]
+        lines += [f'{p}_phase_seconds{{phase="{name}"}} {seconds}' for name, seconds in data["phase_seconds"].items()]
+        for name, value in data["counters"].items():
+            metric = f"{p}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        lines.append(f"# TYPE {p}_api_requests_total counter")
+        for key in ("errors", "not_modified", "bytes"):
+            lines.append(f"# TYPE {p}_api_{key}_total counter")
+        lines.append(f"# TYPE {p}_api_latency_seconds summary")
+        for endpoint, stats in data["api"]["endpoints"].items():
+            label = f'endpoint="{_escape(endpoint)}"'
+            lines.append(f"{p}_api_requests_total{{{label}}} {stats['requests']}")
+            for key in ("errors", "not_modified", "bytes"):
+                lines.append(f"{p}_api_{key}_total{{{label}}} {stats[key]}")
+            latency = stats["latency_seconds"]
+            for q in _QUANTILES:
+                lines.append(f'{p}_api_latency_seconds{{{label},quantile="{q}"}} {latency[f"p{round(q * 100)}"]}')
+            lines.append(f"{p}_api_latency_seconds_sum{{{label}}} {latency['sum']}")
+            lines.append(f"{p}_api_latency_seconds_count{{{label}}} {stats['requests']}")
+        return "\n".join(_group_types(lines)) + "\n"
+
+    def to_markdown(self) -> str:
+        """A readable report for ``$GITHUB_STEP_SUMMARY``."""
+        data = self.to_dict()
+        api = data["api"]
+        counters = data["counters"]
+        lines = [
+            "### Claude Code adoption scan",
+            "",
+            f"{counters.get('repos', 0)} repos in {_duration(data['duration_seconds'])}, "
+            f"{api['requests']} API requests ({_megabytes(api['bytes'])}), "
+            f"{_duration(counters.get('rate_limit_sleep_seconds', 0))} waiting on rate limits.",
+            "",
+            "| Phase | Time |",
+            "|-------|-----:|",
+        ]
+        lines += [f"| {name} | {_duration(seconds)} |" for name, seconds in data["phase_seconds"].items() if seconds]
+        if api["endpoints"]:
+            lines += [
+                "",
+                "| Endpoint | Requests | Errors | 304 | Data | p50 | p90 | p99 |",
+                "|----------|---------:|-------:|----:|-----:|----:|----:|----:|",
+            ]
+            by_requests = sorted(api["endpoints"].items(), key=lambda item: -item[1]["requests"])
+            for endpoint, stats in by_requests:
+                latency = stats["latency_seconds"]
+                lines.append(
+                    f"| `{endpoint}` | {stats['requests']} | {stats['errors']} | {stats['not_modified']} "
+                    f"| {_megabytes(stats['bytes'])} | {_ms(latency['p50'])} | {_ms(latency['p90'])} | {_ms(latency['p99'])} |"
+                )
+        other = {name: value for name, value in counters.items() if name not in ("repos", "rate_limit_sleep_seconds")}
+        if other:
+            lines += ["", "| Counter | Value |", "|---------|------:|"]
+            lines += [f"| {name.replace('_', ' ')} | {value:g} |" for name, value in other.items()]
+        if data["slowest_repos"]:
+            lines += ["", "| Slowest repos | Time |", "|---------------|-----:|"]
+            lines += [f"| {repo['repo']} | {_duration(repo['seconds'])} |" for repo in data["slowest_repos"]]
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: str = "", prometheus_path: str = "", summary_path: str = "") -> None:
+        """Write the JSON and Prometheus files, and append the report to ``summary_path``; "" skips one."""
+        if json_path:
+            with atomic_write(json_path) as f:
+                f.write(json.dumps(self.to_dict(), indent=2) + "\n")
+        if prometheus_path:
+            # node_exporter may read the file at any moment: replace it whole.
+            with atomic_write(prometheus_path) as f:
+                f.write(self.to_prometheus())
+        if summary_path:
+            with open(summary_path, "a", encoding="utf-8") as f:
+                f.write(self.to_markdown())
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _group_types(lines: list[str]) -> list[str]:
+    """Move each ``# TYPE`` line right before its metric's samples, as the format requires."""
+    types = {line.split()[2]: line for line in lines if line.startswith("# TYPE")}
+    samples: dict[str, list[str]] = {}
+    for line in lines:
+        if not line.startswith("#"):
+            name = re.match(r"[a-zA-Z_:][a-zA-Z0-9_:]*", line).group()
+            family = re.sub(r"_(sum|count)$", "", name) if name not in types else name
+            samples.setdefault(family, []).append(line)
+    grouped = []
+    for family, family_lines in samples.items():
+        if family in types:
+            grouped.append(types[family])
+        grouped.extend(family_lines)
+    return grouped
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 1e6:.1f} MB"
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
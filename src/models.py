@@ -1,91 +1,629 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from array import array
 from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+
+def _reindexing(method):
+    """Wrap a list method that may drop or replace names so the index is rebuilt."""
+
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._index = None
+        return result
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+class NameSet(list):
+    """Insertion-ordered list of unique names with fast membership tests.
+
+    It is a list, so it compares, iterates and serializes like one. Once it
+    holds more than a few names, ``in`` uses a set instead of scanning. Names
+    are interned: one shared by thousands of repos is stored once.
+    """
+
+    __slots__ = ("_index",)
+
+    # Below this size a scan is as fast as hashing.
+    _INDEX_FROM = 8
+
+    def __init__(self, names: Iterable[str] = ()):
+        super().__init__()
+        self._index: set[str] | None = None
+        for name in names:
+            self.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        if self._index is None:
+            if len(self) <= self._INDEX_FROM:
+                return list.__contains__(self, name)
+            self._index = set(self)
+        return name in self._index
+
+    def add(self, name: str) -> None:
+        """Append ``name`` unless it is already present."""
+        if name not in self:
+            self.append(name)
+
+    def append(self, name: str) -> None:
+        if type(name) is str:
+            name = sys.intern(name)
+        list.append(self, name)
+        if self._index is not None:
+            self._index.add(name)
+
+    def extend(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.append(name)
+
+    def __iadd__(self, names: Iterable[str]) -> NameSet:
+        self.extend(names)
+        return self
+
+    insert = _reindexing(list.insert)
+    remove = _reindexing(list.remove)
+    pop = _reindexing(list.pop)
+    clear = _reindexing(list.clear)
+    __setitem__ = _reindexing(list.__setitem__)
+    __delitem__ = _reindexing(list.__delitem__)
+
+
+def _flag(bit: int) -> property:
+    mask = 1 << bit
+
+    def get(self) -> bool:
+        return bool(self._flags & mask)
+
+    def set(self, value: bool) -> None:
+        self._flags = self._flags | mask if value else self._flags & ~mask
+
+    return property(get, set)
+
+
+def _names(slot: str) -> property:
+    def get(self) -> NameSet:
+        names = getattr(self, slot)
+        if names is None:
+            names = NameSet()
+            setattr(self, slot, names)
+        return names
+
+    def set(self, names: Iterable[str]) -> None:
+        names = names if type(names) is NameSet else NameSet(names)
+        setattr(self, slot, names or None)
+
+    return property(get, set)
 
 
-@dataclass
 class RepoFeatures:
-    name: str
-    has_claude_md: bool = False
-    has_claude_dir: bool = False
-    has_custom_commands: bool = False
-    has_claude_actions: bool = False
-    has_hooks: bool = False
-    has_agents: bool = False
-    has_memory: bool = False
-    is_stale: bool = False  # True if no commits in 3+ months
-    is_new: bool = False  # True if created within last 7 days
-    mcp_servers: list[str] = field(default_factory=list)
-    custom_commands: list[str] = field(default_factory=list)
-    claude_action_names: list[str] = field(default_factory=list)
-    hook_types: list[str] = field(default_factory=list)
-    agent_names: list[str] = field(default_factory=list)
+    """What the detectors found in one repository.
+
+    Built for holding one per repo in orgs of 100k repos: no ``__dict__``,
+    the boolean flags packed into one integer and the name lists stored as
+    :class:`NameSet`, only once something has been added. Attributes read
+    and write like plain bools and lists; :meth:`names` reads a list without
+    allocating an empty one.
+    """
+
+    FLAGS = (
+        "has_claude_md",
+        "has_claude_dir",
+        "has_custom_commands",
+        "has_claude_actions",
+        "has_hooks",
+        "has_agents",
+        "has_memory",
+        "is_stale",  # True if no commits in 3+ months
+        "is_new",  # True if created within last 7 days
+    )
+    NAME_FIELDS = (
+        "mcp_servers", "custom_commands", "claude_action_names", "hook_types", "agent_names",
+        "claude_action_refs",  # "<action>@<ref>" per pinned uses: step
+    )
+    FIELDS = ("name", *FLAGS, *NAME_FIELDS)
+
+    __slots__ = ("name", "_flags", *(f"_{key}" for key in NAME_FIELDS))
+
+    def __init__(
+        self,
+        name: str,
+        has_claude_md: bool = False,
+        has_claude_dir: bool = False,
+        has_custom_commands: bool = False,
+        has_claude_actions: bool = False,
+        has_hooks: bool = False,
+        has_agents: bool = False,
+        has_memory: bool = False,
+        is_stale: bool = False,
+        is_new: bool = False,
+        mcp_servers: Iterable[str] = (),
+        custom_commands: Iterable[str] = (),
+        claude_action_names: Iterable[str] = (),
+        hook_types: Iterable[str] = (),
+        agent_names: Iterable[str] = (),
+        claude_action_refs: Iterable[str] = (),
+    ):
+        self.name = name
+        flags = (has_claude_md, has_claude_dir, has_custom_commands, has_claude_actions, has_hooks,
+                 has_agents, has_memory, is_stale, is_new)
+        self._flags = sum(1 << bit for bit, value in enumerate(flags) if value)
+        self._mcp_servers = NameSet(mcp_servers) or None
+        self._custom_commands = NameSet(custom_commands) or None
+        self._claude_action_names = NameSet(claude_action_names) or None
+        self._hook_types = NameSet(hook_types) or None
+        self._agent_names = NameSet(agent_names) or None
+        self._claude_action_refs = NameSet(claude_action_refs) or None
+
+    has_claude_md = _flag(0)
+    has_claude_dir = _flag(1)
+    has_custom_commands = _flag(2)
+    has_claude_actions = _flag(3)
+    has_hooks = _flag(4)
+    has_agents = _flag(5)
+    has_memory = _flag(6)
+    is_stale = _flag(7)
+    is_new = _flag(8)
+    mcp_servers = _names("_mcp_servers")
+    custom_commands = _names("_custom_commands")
+    claude_action_names = _names("_claude_action_names")
+    hook_types = _names("_hook_types")
+    agent_names = _names("_agent_names")
+    claude_action_refs = _names("_claude_action_refs")
 
     @property
     def has_mcp_servers(self) -> bool:
-        return len(self.mcp_servers) > 0
+        return self._mcp_servers is not None and len(self._mcp_servers) > 0
+
+    def names(self, key: str) -> NameSet | tuple:
+        """The names in the ``key`` field, or an empty tuple if none were ever added."""
+        return getattr(self, f"_{key}") or ()
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not RepoFeatures:
+            return NotImplemented
+        return self.name == other.name and self._flags == other._flags and all(
+            list(self.names(key)) == list(other.names(key)) for key in self.NAME_FIELDS
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.FIELDS)
+        return f"RepoFeatures({values})"
+
+    def to_dict(self) -> dict:
+        data: dict = {"name": self.name}
+        for key in self.FLAGS:
+            data[key] = getattr(self, key)
+        for key in self.NAME_FIELDS:
+            data[key] = list(self.names(key))
+        return data
+
+    @staticmethod
+    def from_dict(data: dict) -> RepoFeatures:
+        """Inverse of :meth:`to_dict`; unknown keys are ignored."""
+        return RepoFeatures(**{key: value for key, value in data.items() if key in RepoFeatures.FIELDS})
+
+
+class _Bits:
+    """A growable bitset over repo positions, packed eight to a byte.
+
+    Bits are set in a bytearray, which is cheap to grow; :meth:`value`
+    converts it to an int once per change, so counting and masking are
+    single big-int operations.
+    """
+
+    __slots__ = ("_bytes", "_value")
+
+    def __init__(self):
+        self._bytes = bytearray()
+        self._value: int | None = 0
+
+    def set(self, i: int) -> None:
+        byte = i >> 3
+        if byte >= len(self._bytes):
+            self._bytes.extend(bytes(byte - len(self._bytes) + 1))
+        self._bytes[byte] |= 1 << (i & 7)
+        self._value = None
+
+    def value(self) -> int:
+        if self._value is None:
+            self._value = int.from_bytes(self._bytes, "little")
+        return self._value
+
+    @staticmethod
+    def from_int(value: int) -> _Bits:
+        bits = _Bits()
+        bits._bytes = bytearray(value.to_bytes((value.bit_length() + 7) // 8, "little"))
+        bits._value = value
+        return bits
+
+
+class _NameColumn:
+    """One name field for every repo, CSR-style.
+
+    The names of repo ``i`` are ``values[offsets[i]:offsets[i + 1]]``, as ids
+    into ``vocab``. Per-name bitsets, for counts within a subset of repos,
+    are built from it on first use.
+    """
+
+    __slots__ = ("vocab", "_ids", "offsets", "values", "nonempty", "_bits")
+
+    def __init__(self):
+        self.vocab: list[str] = []
+        self._ids: dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.values = array("I")
+        self.nonempty = _Bits()
+        self._bits: list[_Bits] | None = None
+
+    def _id(self, name: str) -> int:
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = self._ids[name] = len(self.vocab)
+            self.vocab.append(name)
+        return name_id
+
+    def append(self, i: int, names: Iterable[str]) -> None:
+        for name in names:
+            self.values.append(self._id(name))
+        if len(self.values) > self.offsets[-1]:
+            self.nonempty.set(i)
+            self._bits = None
+        self.offsets.append(len(self.values))
+
+    def extend(self, other: _NameColumn, start: int) -> None:
+        """Append every row of ``other``, whose first row becomes row ``start``."""
+        ids = [self._id(name) for name in other.vocab]
+        base = len(self.values)
+        self.values.extend(ids[name_id] for name_id in other.values)
+        self.offsets.extend(base + offset for offset in other.offsets[1:])
+        self.nonempty = _Bits.from_int(self.nonempty.value() | other.nonempty.value() << start)
+        self._bits = None
+
+    def to_dict(self) -> dict:
+        return {"vocab": self.vocab, "offsets": self.offsets.tolist(), "values": self.values.tolist()}
+
+    @staticmethod
+    def from_dict(data: dict) -> _NameColumn:
+        column = _NameColumn()
+        column.vocab = list(data["vocab"])
+        column._ids = {name: name_id for name_id, name in enumerate(column.vocab)}
+        column.offsets = array("I", data["offsets"])
+        column.values = array("I", data["values"])
+        offsets = column.offsets
+        column.nonempty = _Bits.from_int(
+            sum(1 << i for i in range(len(offsets) - 1) if offsets[i + 1] > offsets[i])
+        )
+        return column
+
+    def names(self, i: int) -> list[str]:
+        return [self.vocab[name_id] for name_id in self.values[self.offsets[i]:self.offsets[i + 1]]]
+
+    def counts(self, where: int | None = None) -> Counter:
+        if where is None:
+            return Counter({self.vocab[name_id]: n for name_id, n in Counter(self.values).items()})
+        counts = Counter()
+        for name_id, bits in enumerate(self._name_bits()):
+            n = (bits.value() & where).bit_count()
+            if n:
+                counts[self.vocab[name_id]] = n
+        return counts
+
+    def _name_bits(self) -> list[_Bits]:
+        if self._bits is None:
+            bits = [_Bits() for _ in self.vocab]
+            offsets, values = self.offsets, self.values
+            for i in range(len(offsets) - 1):
+                for name_id in values[offsets[i]:offsets[i + 1]]:
+                    bits[name_id].set(i)
+            self._bits = bits
+        return self._bits
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _NameColumn):
+            return NotImplemented
+        rows = len(self.offsets) - 1
+        return rows == len(other.offsets) - 1 and all(self.names(i) == other.names(i) for i in range(rows))
+
+
+class FeatureStore:
+    """Columnar features of every scanned repo.
+
+    Each flag is one bitset over repo positions and each name field a
+    :class:`_NameColumn`; free-form repo attributes (language, visibility, a
+    team...) are id columns. Counts are bit counts, subsets are bitset masks,
+    so a breakdown by any attribute costs a few big-int operations per value
+    instead of another pass over the repos.
+    """
+
+    def __init__(self):
+        self._size = 0
+        self.repo_names: list[str] = []
+        self._flags = {flag: _Bits() for flag in RepoFeatures.FLAGS}
+        self._names = {name_field: _NameColumn() for name_field in RepoFeatures.NAME_FIELDS}
+        self._attributes: dict[str, tuple[list[str], dict[str, int], array]] = {}
+        self._groups: dict[str, dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, repo: RepoFeatures, attributes: dict[str, str] | None = None) -> None:
+        i = self._size
+        self.repo_names.append(repo.name)
+        flags = repo._flags
+        if flags:
+            for bit, bits in enumerate(self._flags.values()):
+                if flags >> bit & 1:
+                    bits.set(i)
+        for name_field, column in self._names.items():
+            column.append(i, repo.names(name_field))
+        for key, value in (attributes or {}).items():
+            self._attribute(key)
+        for key, (vocab, ids, column) in self._attributes.items():
+            value = (attributes or {}).get(key, "")
+            if value not in ids:
+                ids[value] = len(vocab)
+                vocab.append(value)
+            column.append(ids[value])
+        self._groups.clear()
+        self._size += 1
+
+    def _attribute(self, key: str) -> None:
+        if key not in self._attributes:
+            # Repos added before the attribute first appeared have "" for it.
+            self._attributes[key] = ([""], {"": 0}, array("I", bytes(4 * self._size)))
+
+    def extend(self, other: FeatureStore) -> None:
+        """Append every repo of ``other`` after this store's own."""
+        start = self._size
+        self.repo_names.extend(other.repo_names)
+        for flag, bits in other._flags.items():
+            self._flags[flag] = _Bits.from_int(self.mask(flag) | bits.value() << start)
+        for name_field, column in other._names.items():
+            self._names[name_field].extend(column, start)
+        for key in other._attributes:
+            self._attribute(key)
+        for key, (vocab, ids, column) in self._attributes.items():
+            if key not in other._attributes:
+                # "" is always id 0.
+                column.extend(array("I", bytes(4 * other._size)))
+                continue
+            other_vocab, _, other_column = other._attributes[key]
+            remap = []
+            for value in other_vocab:
+                if value not in ids:
+                    ids[value] = len(vocab)
+                    vocab.append(value)
+                remap.append(ids[value])
+            column.extend(remap[value_id] for value_id in other_column)
+        self._groups.clear()
+        self._size += other._size
+
+    def to_dict(self) -> dict:
+        """A JSON-serializable copy; bitsets are hex strings."""
+        return {
+            "size": self._size,
+            "repo_names": self.repo_names,
+            "flags": {flag: format(bits.value(), "x") for flag, bits in self._flags.items()},
+            "names": {name_field: column.to_dict() for name_field, column in self._names.items()},
+            "attributes": {
+                key: {"vocab": vocab, "values": column.tolist()}
+                for key, (vocab, _, column) in self._attributes.items()
+            },
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> FeatureStore:
+        """Inverse of :meth:`to_dict`."""
+        store = FeatureStore()
+        store._size = data["size"]
+        store.repo_names = list(data["repo_names"])
+        for flag, value in data["flags"].items():
+            store._flags[flag] = _Bits.from_int(int(value, 16))
+        for name_field, column in data["names"].items():
+            store._names[name_field] = _NameColumn.from_dict(column)
+        for key, column in data["attributes"].items():
+            vocab = list(column["vocab"])
+            store._attributes[key] = (
+                vocab, {value: value_id for value_id, value in enumerate(vocab)}, array("I", column["values"])
+            )
+        return store
+
+    def everything(self) -> int:
+        """Mask of every repo."""
+        return (1 << self._size) - 1
+
+    def mask(self, flag: str) -> int:
+        """Mask of repos with ``flag`` set, or with any name in a name field."""
+        if flag in self._flags:
+            return self._flags[flag].value()
+        return self._names[flag].nonempty.value()
+
+    def row_bits(self, fields: Iterable[str]) -> list[int]:
+        """Per repo, an int with bit ``j`` set if the repo has ``fields[j]`` (see :meth:`mask`)."""
+        rows = [0] * self._size
+        for j, name in enumerate(fields):
+            bits = self._flags[name] if name in self._flags else self._names[name].nonempty
+            # Walk set bits byte by byte: most repos have few features.
+            for byte_index, byte in enumerate(bits._bytes):
+                while byte:
+                    low = byte & -byte
+                    rows[(byte_index << 3) + low.bit_length() - 1] |= 1 << j
+                    byte ^= low
+        return rows
+
+    def count(self, flag: str, where: int | None = None) -> int:
+        bits = self.mask(flag)
+        return (bits if where is None else bits & where).bit_count()
+
+    def name_counts(self, name_field: str, where: int | None = None) -> Counter:
+        """How many repos (within ``where``) have each name in ``name_field``."""
+        return self._names[name_field].counts(where)
+
+    def top(self, name_field: str, k: int, where: int | None = None) -> list[tuple[str, int]]:
+        return self.name_counts(name_field, where).most_common(k)
+
+    def group_by(self, key: str) -> dict[str, int]:
+        """Mask of repos per value of attribute ``key``."""
+        if key not in self._groups:
+            groups: dict[str, _Bits] = {}
+            if key in self._attributes:
+                vocab, _, column = self._attributes[key]
+                for i, value_id in enumerate(column):
+                    groups.setdefault(vocab[value_id], _Bits()).set(i)
+            self._groups[key] = {value: bits.value() for value, bits in groups.items()}
+        return self._groups[key]
+
+    def where(self, key: str, value: str) -> int:
+        """Mask of repos whose attribute ``key`` is ``value``."""
+        return self.group_by(key).get(value, 0)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FeatureStore):
+            return NotImplemented
+        return (
+            self._size == other._size
+            and self.repo_names == other.repo_names
+            and all(self.mask(flag) == other.mask(flag) for flag in self._flags)
+            and self._names == other._names
+            and {key: self.group_by(key) for key in self._attributes}
+            == {key: other.group_by(key) for key in other._attributes}
+        )
+
+
+# Fields any of which counts a repo as using Claude Code.
+ADOPTION_FIELDS = (
+    "has_claude_md",
+    "has_claude_dir",
+    "mcp_servers",
+    "has_custom_commands",
+    "has_claude_actions",
+    "has_hooks",
+    "has_agents",
+    "has_memory",
+)
+
+
+def _count(flag: str) -> property:
+    return property(lambda self: self.store.count(flag))
+
+
+def _counter(name_field: str) -> property:
+    return property(lambda self: self.store.name_counts(name_field))
 
 
 @dataclass
 class OrgStats:
+    """Org-wide counts, derived from a columnar :class:`FeatureStore`.
+
+    ``repos`` holds the scanned repos themselves when they are kept for the
+    details table; every count comes from ``store``, and is read-only.
+    """
+
     org_name: str
-    total_repos: int = 0
     repos: list[RepoFeatures] = field(default_factory=list)
+    store: FeatureStore = field(default_factory=FeatureStore, repr=False)
 
     # Aggregated counts
-    claude_md_count: int = 0
-    claude_dir_count: int = 0
-    mcp_servers_count: int = 0
-    custom_commands_count: int = 0
-    claude_actions_count: int = 0
-    hooks_count: int = 0
-    agents_count: int = 0
-    memory_count: int = 0
-    stale_count: int = 0
-    new_count: int = 0
+    claude_md_count = _count("has_claude_md")
+    claude_dir_count = _count("has_claude_dir")
+    mcp_servers_count = _count("mcp_servers")
+    action_refs_count = _count("claude_action_refs")
+    custom_commands_count = _count("has_custom_commands")
+    claude_actions_count = _count("has_claude_actions")
+    hooks_count = _count("has_hooks")
+    agents_count = _count("has_agents")
+    memory_count = _count("has_memory")
+    stale_count = _count("is_stale")
+    new_count = _count("is_new")
 
     # Detailed breakdowns
-    mcp_server_counter: Counter = field(default_factory=Counter)
-    custom_command_counter: Counter = field(default_factory=Counter)
-    claude_action_counter: Counter = field(default_factory=Counter)
-    hook_type_counter: Counter = field(default_factory=Counter)
-    agent_name_counter: Counter = field(default_factory=Counter)
+    mcp_server_counter = _counter("mcp_servers")
+    custom_command_counter = _counter("custom_commands")
+    claude_action_counter = _counter("claude_action_names")
+    hook_type_counter = _counter("hook_types")
+    agent_name_counter = _counter("agent_names")
+    claude_action_ref_counter = _counter("claude_action_refs")
+
+    @property
+    def total_repos(self) -> int:
+        return len(self.store)
+
+    def adopting(self) -> int:
+        """Mask of repos using Claude Code in any way (see :data:`ADOPTION_FIELDS`)."""
+        mask = 0
+        for name in ADOPTION_FIELDS:
+            mask |= self.store.mask(name)
+        return mask
+
+    def add(self, repo: RepoFeatures, keep: bool = True, attributes: dict[str, str] | None = None) -> None:
+        """Fold a single repo into the store.
+
+        With ``keep=False`` the repo is counted but not retained, so a scan
+        that doesn't render per-repo details keeps a few bytes per repo.
+        ``attributes`` (e.g. ``{"language": "Go"}``) can be grouped by later.
+        """
+        self.store.append(repo, attributes)
+        if keep:
+            self.repos.append(repo)
 
     @staticmethod
     def aggregate(org_name: str, repos: list[RepoFeatures]) -> OrgStats:
-        stats = OrgStats(org_name=org_name, total_repos=len(repos), repos=repos)
+        stats = OrgStats(org_name=org_name)
         for repo in repos:
-            if repo.has_claude_md:
-                stats.claude_md_count += 1
-            if repo.has_claude_dir:
-                stats.claude_dir_count += 1
-            if repo.has_mcp_servers:
-                stats.mcp_servers_count += 1
-            if repo.has_custom_commands:
-                stats.custom_commands_count += 1
-            if repo.has_claude_actions:
-                stats.claude_actions_count += 1
-            if repo.has_hooks:
-                stats.hooks_count += 1
-            if repo.has_agents:
-                stats.agents_count += 1
-            if repo.has_memory:
-                stats.memory_count += 1
-            if repo.is_stale:
-                stats.stale_count += 1
-            if repo.is_new:
-                stats.new_count += 1
-
-            for server in repo.mcp_servers:
-                stats.mcp_server_counter[server] += 1
-            for cmd in repo.custom_commands:
-                stats.custom_command_counter[cmd] += 1
-            for action in repo.claude_action_names:
-                stats.claude_action_counter[action] += 1
-            for hook in repo.hook_types:
-                stats.hook_type_counter[hook] += 1
-            for agent in repo.agent_names:
-                stats.agent_name_counter[agent] += 1
+            stats.add(repo)
+        return stats
+
+    @staticmethod
+    def merge(org_name: str, parts: Iterable[OrgStats]) -> OrgStats:
+        """Combine stats of disjoint sets of repos, e.g. the shards of one scan.
 
+        Repos are concatenated in order, so every count is the sum of the
+        parts' counts; merging is associative.
+        """
+        stats = OrgStats(org_name=org_name)
+        for part in parts:
+            stats.store.extend(part.store)
+            stats.repos.extend(part.repos)
         return stats
+
+    def to_dict(self) -> dict:
+        return {
+            "org_name": self.org_name,
+            "repos": [repo.to_dict() for repo in self.repos],
+            "store": self.store.to_dict(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> OrgStats:
+        """Inverse of :meth:`to_dict`."""
+        return OrgStats(
+            org_name=data["org_name"],
+            repos=[RepoFeatures.from_dict(repo) for repo in data["repos"]],
+            store=FeatureStore.from_dict(data["store"]),
+        )
+
+
+@dataclass
+class MultiOrgStats:
+    """Stats of several organizations scanned in one run.
+
+    Each org keeps its own :class:`OrgStats`; :meth:`rollup` combines them.
+    Every repo carries an ``org`` attribute, so the rollup can still be
+    broken down by org.
+    """
+
+    name: str
+    orgs: dict[str, OrgStats] = field(default_factory=dict)
+
+    def rollup(self) -> OrgStats:
+        """Stats of every org together; the org's own stats if there is only one."""
+        if len(self.orgs) == 1:
+            return next(iter(self.orgs.values()))
+        return OrgStats.merge(self.name, self.orgs.values())
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from github import GithubException
+from github.Requester import Requester
+
+from .fetcher import _is_limit_error, _owner_run
+
+# Levels of .claude/ returned by a probe: enough for .claude/commands/<group>/<file>.
+_CLAUDE_DEPTH = 3
+
+# Root files whose existence is probed, by alias.
+_ROOT_FILES = {"claudeMd": "CLAUDE.md", "memoryMd": "MEMORY.md"}
+
+# Files probed with their text, by alias.
+_TEXT_FILES = {"mcpJson": ".mcp.json", "settingsJson": ".claude/settings.json"}
+
+_WORKFLOWS = ".github/workflows"
+
+
+def _tree_fragment(depth: int) -> str:
+    if depth == 1:
+        return "... on Tree { entries { name type oid } }"
+    return f"... on Tree {{ entries {{ name type oid object {{ {_tree_fragment(depth - 1)} }} }} }}"
+
+
+def _probe_fragment() -> str:
+    fields = ["defaultBranchRef { target { oid } }"]
+    fields.append(f'claudeDir: object(expression: "HEAD:.claude") {{ {_tree_fragment(_CLAUDE_DEPTH)} }}')
+    for alias, path in _ROOT_FILES.items():
+        fields.append(f"{alias}: object(expression: {json.dumps('HEAD:' + path)}) {{ oid }}")
+    for alias, path in _TEXT_FILES.items():
+        fields.append(f"{alias}: object(expression: {json.dumps('HEAD:' + path)}) {{ ...Text }}")
+    fields.append(
+        f'workflows: object(expression: "HEAD:{_WORKFLOWS}") '
+        "{ ... on Tree { entries { name type oid object { ...Text } } } }"
+    )
+    lines = ["fragment Text on Blob { oid text isBinary isTruncated }", "fragment Probe on Repository {"]
+    lines.extend(f"  {line}" for line in fields)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+_FRAGMENTS = _probe_fragment()
+
+
+@dataclass
+class Probe:
+    """What a probe found in one repo, shaped like a slice of its tree.
+
+    ``paths`` maps each path found to its blob SHA ("" for directories), so
+    it can go through the same detectors as a full tree. ``contents`` holds
+    the text of the detector files GraphQL returned inline.
+    """
+
+    head_sha: str = ""
+    paths: dict[str, str] = field(default_factory=dict)
+    contents: dict[str, str] = field(default_factory=dict)
+
+
+class PathProber:
+    """Look up the well-known Claude Code paths of many repos per GraphQL query.
+
+    Instead of a repo's full recursive tree, a probe reads only ``.claude/``
+    (a few levels deep), the root ``CLAUDE.md``, ``MEMORY.md`` and
+    ``.mcp.json``, and ``.github/workflows/``, with the text of the files the
+    content detectors parse. A batch GitHub rejects as too large is halved,
+    and a repo that fails on its own comes back as None.
+    """
+
+    def __init__(self, requester: Callable[[], Requester], batch_size: int = 25):
+        self._requester = requester
+        self._lock = threading.Lock()
+        self.batch_size = max(1, batch_size)
+        self.queries = 0
+
+    def probe(self, full_names: list[str]) -> list[Probe | None]:
+        """Return a :class:`Probe` per repo, in request order."""
+        results: list[Probe | None] = []
+        while len(results) < len(full_names):
+            chunk = full_names[len(results):len(results) + self.batch_size]
+            results.extend(self._probe_chunk(chunk[:_owner_run(chunk)]))
+        return results
+
+    def _probe_chunk(self, chunk: list[str]) -> list[Probe | None]:
+        try:
+            query = build_probe_query(chunk)
+            with self._lock:
+                self.queries += 1
+            _, response = self._requester().graphql_query(query, {})
+        except GithubException as e:
+            if len(chunk) == 1:
+                return [None]
+            if _is_limit_error(e):
+                with self._lock:
+                    self.batch_size = min(self.batch_size, max(1, len(chunk) // 2))
+            mid = len(chunk) // 2
+            return self._probe_chunk(chunk[:mid]) + self._probe_chunk(chunk[mid:])
+
+        data = response.get("data") or {}
+        return [parse_probe(data.get(f"r{i}")) for i in range(len(chunk))]
+
+
+def build_probe_query(full_names: list[str]) -> str:
+    """Build one GraphQL query probing every repo in ``full_names``, aliased ``r0``, ``r1``, ..."""
+    parts = ["query {"]
+    for i, full_name in enumerate(full_names):
+        owner, name = full_name.split("/", 1)
+        parts.append(f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ ...Probe }}")
+    parts.append("  rateLimit { cost remaining }")
+    parts.append("}")
+    return "\n".join(parts) + "\n" + _FRAGMENTS
+
+
+def parse_probe(repo: dict | None) -> Probe | None:
+    """Turn one repo's part of a probe response into a :class:`Probe`."""
+    if repo is None:
+        return None
+    probe = Probe()
+    head = repo.get("defaultBranchRef") or {}
+    probe.head_sha = (head.get("target") or {}).get("oid", "")
+
+    claude_dir = repo.get("claudeDir")
+    if claude_dir is not None:
+        probe.paths[".claude"] = ""
+        _walk(claude_dir, ".claude", probe)
+    for alias, path in {**_ROOT_FILES, **_TEXT_FILES}.items():
+        blob = repo.get(alias)
+        if blob is not None:
+            _add_blob(path, blob, probe)
+    workflows = repo.get("workflows")
+    if workflows is not None:
+        _walk(workflows, _WORKFLOWS, probe)
+    return probe
+
+
+def _walk(tree: dict, prefix: str, probe: Probe) -> None:
+    for entry in tree.get("entries") or []:
+        path = f"{prefix}/{entry['name']}"
+        if entry.get("type") == "tree":
+            probe.paths[path] = ""
+            _walk(entry.get("object") or {}, path, probe)
+        else:
+            _add_blob(path, {**(entry.get("object") or {}), "oid": entry.get("oid", "")}, probe)
+
+
+def _add_blob(path: str, blob: dict, probe: Probe) -> None:
+    probe.paths[path] = blob.get("oid", "")
+    if blob.get("text") is not None and not blob.get("isBinary") and not blob.get("isTruncated"):
+        probe.contents[path] = blob["text"]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cpu", "memory")
+
+# Frames kept per allocation in memory mode; deeper costs more per malloc.
+MEMORY_FRAMES = 25
+
+# Whether one cProfile.Profile sees every thread (it runs on sys.monitoring).
+_PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_group(name: str) -> str:
+    """Workers of one stage share a root in flame graphs: "tree-3" -> "tree"."""
+    return re.sub(r"[-_]\d+$", "", name)
+
+
+class StackSampler:
+    """Count the stacks of every thread, every ``interval`` seconds.
+
+    Runs on its own thread, so the profiled code pays only for the GIL the
+    sampler takes a few hundred times a second. :meth:`collapsed` returns
+    the counts in the folded format flame graph tools read.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(_thread_group(names.get(ident, "thread")))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class _ThreadProfiles:
+    """cProfile on the calling thread and on every thread started meanwhile.
+
+    From Python 3.12, cProfile runs on :mod:`sys.monitoring`, which sees
+    every thread but allows one active profiler, so a single profile covers
+    the phase. Before that a :class:`cProfile.Profile` only sees the thread
+    that enabled it, and scan workers are started inside the profiled phase,
+    so each new thread enables its own profile; :meth:`stats` merges them.
+    """
+
+    def __init__(self):
+        self.profiles = [cProfile.Profile()]
+        self._lock = threading.Lock()
+
+    def _start_thread(self, frame, event, arg) -> None:
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profile)
+        sys.setprofile(None)
+        profile.enable()
+
+    def start(self) -> None:
+        if not _PROCESS_WIDE_CPROFILE:
+            threading.setprofile(self._start_thread)
+        self.profiles[0].enable()
+
+    def stop(self) -> None:
+        self.profiles[0].disable()
+        if not _PROCESS_WIDE_CPROFILE:
+            threading.setprofile(None)
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+def _memory_collapsed(snapshot: tracemalloc.Snapshot) -> str:
+    """Bytes still allocated, by allocating stack, in folded format."""
+    lines = []
+    for stat in snapshot.statistics("traceback"):
+        # Oldest frame first, as the folded format wants.
+        frames = [f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in stat.traceback]
+        lines.append(f"{';'.join(frames)} {stat.size}\n")
+    return "".join(lines)
+
+
+class Profiler:
+    """Profile named phases of a run and write one set of files per phase.
+
+    ``modes`` is a subset of :data:`PROFILE_MODES`:
+
+    - ``cpu``: with ``sample_ms`` 0, cProfile on every thread, written as
+      ``<phase>-cpu.pstats``. Otherwise a :class:`StackSampler` every
+      ``sample_ms`` milliseconds, written as ``<phase>-cpu.collapsed``;
+      cheap enough for full-size runs.
+    - ``memory``: tracemalloc, written as a ``<phase>-memory.tracemalloc``
+      snapshot (see :meth:`tracemalloc.Snapshot.load`) and as
+      ``<phase>-memory.collapsed``, the bytes still held at the end of the
+      phase by allocating stack. The peak is printed.
+
+    With no modes, :meth:`phase` does nothing.
+    """
+
+    def __init__(self, modes: list[str], directory: str, sample_ms: int = 0):
+        unknown = sorted(set(modes) - set(PROFILE_MODES))
+        if unknown:
+            raise ValueError(f"unknown PROFILE mode {', '.join(unknown)}; expected {' or '.join(PROFILE_MODES)}")
+        self.modes = modes
+        self.directory = directory
+        self.sample_ms = sample_ms
+        self.written: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.modes:
+            yield
+            return
+        sampler = profiles = None
+        if "cpu" in self.modes:
+            if self.sample_ms:
+                sampler = StackSampler(self.sample_ms / 1000)
+                sampler.start()
+            else:
+                profiles = _ThreadProfiles()
+                profiles.start()
+        tracing = "memory" in self.modes and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(MEMORY_FRAMES)
+        try:
+            yield
+        finally:
+            snapshot = peak = None
+            if tracing:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            if sampler is not None:
+                sampler.stop()
+            if profiles is not None:
+                profiles.stop()
+            self._write(name, sampler, profiles, snapshot, peak)
+
+    def _write(self, name, sampler, profiles, snapshot, peak) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if sampler is not None:
+                self._write_text(f"{name}-cpu.collapsed", sampler.collapsed())
+            if profiles is not None:
+                path = os.path.join(self.directory, f"{name}-cpu.pstats")
+                profiles.stats().dump_stats(path)
+                self.written.append(path)
+            if snapshot is not None:
+                path = os.path.join(self.directory, f"{name}-memory.tracemalloc")
+                snapshot.dump(path)
+                self.written.append(path)
+                self._write_text(f"{name}-memory.collapsed", _memory_collapsed(snapshot))
+                print(f"Profile: {name} peaked at {peak / 2**20:.1f} MiB traced memory.")
+        except OSError as e:
+            print(f"Warning: could not write the {name} profile: {e}")
+
+    def _write_text(self, filename: str, text: str) -> None:
+        path = os.path.join(self.directory, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.written.append(path)
+
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+RESOURCES = ("core", "graphql", "search")
+
+
+def resource_for(url: str) -> str:
+    """Rate-limit resource a request to ``url`` (path and query) counts against."""
+    path = url.split("?", 1)[0]
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+@dataclass
+class _Bucket:
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float = 0.0
+    in_flight: int = 0
+    next_slot: float = 0.0
+
+
+class RateBudget:
+    """Track GitHub's rate limits from response headers and pace requests.
+
+    Every response's ``X-RateLimit-Limit/Remaining/Reset/Resource`` headers
+    update the bucket for its resource, so no extra ``/rate_limit`` calls are
+    needed. Requests still in flight are subtracted from the last known
+    remaining count.
+
+    :meth:`acquire` never touches the last ``reserve`` requests (kept for the
+    final README commit) unless asked to. Until ``pace_below`` of the limit is
+    left, requests go out immediately; after that they are spaced evenly over
+    what is left of the reset window instead of running the budget dry and
+    sleeping until the reset.
+    """
+
+    def __init__(
+        self,
+        reserve: int = 50,
+        pace_below: float = 0.5,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {resource: _Bucket() for resource in RESOURCES}
+        self.slept = 0.0
+
+    def acquire(self, resource: str = "core", use_reserve: bool = False) -> float:
+        """Wait until a request against ``resource`` may be sent; return the wait."""
+        with self._lock:
+            bucket = self._buckets.setdefault(resource, _Bucket())
+            now = self._clock()
+            wait = 0.0
+            if bucket.remaining is not None and now < bucket.reset:
+                reserve = 0 if use_reserve else self.reserve
+                available = bucket.remaining - bucket.in_flight - reserve
+                if available <= 0:
+                    # Out of budget: wait for the window to reset.
+                    wait = bucket.reset - now + 1
+                elif bucket.limit and bucket.remaining < bucket.limit * self.pace_below:
+                    interval = (bucket.reset - now) / available
+                    slot = max(now, bucket.next_slot)
+                    bucket.next_slot = slot + interval
+                    wait = slot - now
+            bucket.in_flight += 1
+            self.slept += wait
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def update(self, resource: str, headers: Mapping[str, str] | None) -> None:
+        """Record a finished request and the rate-limit headers it came back with."""
+        with self._lock:
+            bucket = self._buckets.setdefault(resource, _Bucket())
+            bucket.in_flight = max(0, bucket.in_flight - 1)
+            if not headers:
+                return
+            headers = {k.lower(): v for k, v in headers.items()}
+            if "x-ratelimit-remaining" not in headers:
+                return
+            resource = headers.get("x-ratelimit-resource", resource)
+            bucket = self._buckets.setdefault(resource, _Bucket())
+            bucket.remaining = int(float(headers["x-ratelimit-remaining"]))
+            if "x-ratelimit-limit" in headers:
+                bucket.limit = int(float(headers["x-ratelimit-limit"]))
+            if "x-ratelimit-reset" in headers:
+                reset = float(headers["x-ratelimit-reset"])
+                if reset != bucket.reset:
+                    bucket.next_slot = 0.0
+                bucket.reset = reset
+
+    def available(self, resource: str = "core") -> float:
+        """Requests left before the reserve, or infinity while unknown."""
+        with self._lock:
+            bucket = self._buckets.setdefault(resource, _Bucket())
+            if bucket.remaining is None or self._clock() >= bucket.reset:
+                return float("inf")
+            return bucket.remaining - bucket.in_flight - self.reserve
+
+    def remaining(self, resource: str = "core") -> int | None:
+        with self._lock:
+            return self._buckets.setdefault(resource, _Bucket()).remaining
+
+    def release_reserve(self) -> None:
+        """Let the remaining requests use the reserve, e.g. for the final commit."""
+        with self._lock:
+            self.reserve = 0
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import datetime
+import io
+import posixpath
+import re
+import string
 from collections import Counter
+from collections.abc import Iterator
 
 from .config import Config
 from .graph import make_graph
-from .models import OrgStats
+from .history import History
+from .models import OrgStats, RepoFeatures
 
 
 def _format_row(label: str, count: int, total: int, config: Config, show_bar: bool = True) -> str:
@@ -30,7 +37,10 @@ def _render_ranked(
     if not counter:
         return []
     lines = [f"\n{title}"]
-    for name, count in counter.most_common(config.max_items):
+    # Ties are ordered by name, not by which repo was scanned first, so a
+    # merged sharded scan renders exactly like a single one.
+    ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    for name, count in ranked[:config.max_items]:
         if show_bar:
             percent = count / total * 100 if total > 0 else 0
             bar = make_graph(percent, bar_length=config.bar_length, blocks=config.blocks)
@@ -64,21 +74,73 @@ def _render_adoption(stats: OrgStats, config: Config, show_bar: bool = True) ->
     return lines
 
 
-def _render_details(stats: OrgStats, _config: Config) -> list[str]:
-    """Render per-repo detail table."""
-    if not stats.repos:
+def _render_orgs(stats: OrgStats, config: Config, show_bar: bool = True) -> list[str]:
+    """Render each organization's share of repos using Claude Code, for multi-org scans."""
+    groups = stats.store.group_by("org")
+    if len(groups) < 2:
         return []
+    adopting = stats.adopting()
+    rows = [(org, (mask & adopting).bit_count(), mask.bit_count()) for org, mask in groups.items()]
+    rows.sort(key=lambda row: (-row[1] / row[2], row[0]))
+    lines = [f"\n🏢 Adoption by Organization ({adopting.bit_count()} of {stats.total_repos} repos)"]
+    for org, count, total in rows:
+        lines.append(_format_row(org, count, total, config, show_bar))
+    return lines
 
-    active_repos = stats.repos
 
-    headers = ["Repo", "CLAUDE.md", ".claude/", "MCP", "Skills", "Actions", "Hooks", "Agents", "Memory", "New", "Stale"]
-    lines = [
-        "\n<details>",
-        "<summary>Per-repo breakdown</summary>",
-        "",
-        "| " + " | ".join(headers) + " |",
-        "| " + " | ".join(["---"] * len(headers)) + " |",
-    ]
+# Rows of the trends section: label, History counts key.
+_TREND_ROWS = [
+    ("Repos scanned", "repos"),
+    ("Using Claude Code", "adopting"),
+    ("Has CLAUDE.md", "has_claude_md"),
+    ("Has .claude/ Dir", "has_claude_dir"),
+    ("Has MCP Servers", "mcp_servers"),
+    ("Has Skills", "has_custom_commands"),
+    ("Has Agents", "has_agents"),
+    ("Has Hooks", "has_hooks"),
+    ("Has GitHub Actions", "has_claude_actions"),
+]
+
+_SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+_TREND_WEEKS = 12
+
+
+def _sparkline(values: list[int]) -> str:
+    """One make_graph cell per value, scaled between the lowest and highest."""
+    low, high = min(values), max(values)
+    span = high - low
+    return "".join(make_graph((v - low) / span * 100 if span else 0, bar_length=1, blocks=_SPARK_BLOCKS) for v in values)
+
+
+def _render_trends(history: History | None, _config: Config, show_bar: bool = True) -> list[str]:
+    """Render week-over-week changes, with a sparkline of recent weeks."""
+    if history is None or not history.snapshots:
+        return []
+    latest = history.snapshots[-1]
+    previous = history.before(latest.date - datetime.timedelta(days=7))
+    lines = [f"\n📈 Trends (week over week, last {_TREND_WEEKS} weeks)"]
+    for label, key in _TREND_ROWS:
+        count = latest.counts.get(key, 0)
+        before = previous.counts.get(key, 0) if previous else count
+        if not count and not before:
+            continue
+        change = f"{count - before:+d}" if previous else ""
+        line = f"{label:<22}{count:>3} repos  {change:>5}"
+        if show_bar:
+            line += f"  {_sparkline(history.weekly(key, _TREND_WEEKS))}"
+        lines.append(line.rstrip())
+    return lines
+
+
+_DETAILS_HEADERS = ["Repo", "CLAUDE.md", ".claude/", "MCP", "Skills", "Actions", "Hooks", "Agents", "Memory", "New", "Stale"]
+
+
+def _details_head() -> str:
+    return "| " + " | ".join(_DETAILS_HEADERS) + " |\n| " + " | ".join(["---"] * len(_DETAILS_HEADERS)) + " |"
+
+
+def _details_rows(repos: list[RepoFeatures]) -> Iterator[tuple[str, str]]:
+    """Yield ``(name, table row)`` for each repo, sorted by name."""
 
     def check(val: bool) -> str:
         return "✅" if val else ""
@@ -89,7 +151,7 @@ def _render_details(stats: OrgStats, _config: Config) -> list[str]:
     def stale(val: bool) -> str:
         return "⚠️" if val else ""
 
-    for repo in sorted(active_repos, key=lambda r: r.name.lower()):
+    for repo in sorted(repos, key=lambda r: r.name.lower()):
         row = [
             repo.name,
             check(repo.has_claude_md),
@@ -103,17 +165,111 @@ def _render_details(stats: OrgStats, _config: Config) -> list[str]:
             new(repo.is_new),
             stale(repo.is_stale),
         ]
-        lines.append("| " + " | ".join(row) + " |")
+        yield repo.name, "| " + " | ".join(row) + " |"
 
-    lines.append("")
-    lines.append("</details>")
-    return lines
+
+def _page_key(name: str) -> str:
+    """The details page a repo is listed on when paginating by initial."""
+    initial = name[:1].lower()
+    if initial.isdigit():
+        return "0-9"
+    return initial if "a" <= initial <= "z" else "other"
+
+
+def _page_label(key: str) -> str:
+    return key.upper() if len(key) == 1 else key
+
+
+def _page_path(config: Config, key: str | None) -> str:
+    if key is None:
+        return config.details_path
+    stem, ext = posixpath.splitext(config.details_path)
+    return f"{stem}-{key}{ext or '.md'}"
+
+
+def detail_pages(config: Config) -> list[str]:
+    """Every path the details table can be moved to, in either layout."""
+    keys = [None, "0-9", *string.ascii_lowercase, "other"]
+    return [_page_path(config, key) for key in keys]
+
+
+def _link(config: Config, path: str) -> str:
+    """``path`` (from the repository root) relative to the README."""
+    return posixpath.relpath(path, posixpath.dirname(config.target_path) or ".")
+
+
+def _write_pages(stats: OrgStats, config: Config, files: dict[str, str]) -> list[tuple[str, str]]:
+    """Write the details table to one page, or one per initial, in ``files``.
+
+    Returns ``(label, path)`` for each page written.
+    """
+    by_initial = config.details_split == "initial"
+    pages: dict[str | None, io.StringIO] = {}
+    for name, row in _details_rows(stats.repos):
+        key = _page_key(name) if by_initial else None
+        page = pages.get(key)
+        if page is None:
+            title = "Per-repo breakdown" + (f": {_page_label(key)}" if key else "")
+            page = pages[key] = io.StringIO()
+            page.write(f"# {title}\n\nClaude Code features per repo in {stats.org_name}.\n\n{_details_head()}\n")
+        page.write(row + "\n")
+
+    written = []
+    # Symbols sort on both sides of the digits: list their page last.
+    for key in sorted(pages, key=lambda key: (key == "other", key or "")):
+        path = _page_path(config, key)
+        files[path] = pages.pop(key).getvalue()
+        written.append((_page_label(key) if key else posixpath.basename(path), path))
+    return written
+
+
+def _write_details(out: io.StringIO, stats: OrgStats, config: Config, files: dict[str, str] | None = None) -> bool:
+    """Write the per-repo detail table to ``out``, row by row.
+
+    With ``files``, a table over ``details_max_kb`` is taken back out of
+    ``out`` and written to separate pages in ``files`` instead (see
+    :func:`_write_pages`); ``out`` then only links to them.
+    """
+    if not stats.repos:
+        return False
+
+    limit = config.details_max_kb * 1024 if files is not None and config.details_max_kb > 0 else 0
+    start = out.tell()
+    out.write(f"\n<details>\n<summary>Per-repo breakdown</summary>\n\n{_details_head()}")
+    size = 0
+    for _, row in _details_rows(stats.repos):
+        out.write("\n" + row)
+        size += len(row.encode()) + 1
+        if limit and size > limit:
+            break
+    else:
+        out.write("\n\n</details>")
+        return True
+
+    out.seek(start)
+    out.truncate()
+    pages = _write_pages(stats, config, files)
+    links = " · ".join(f"[{label}]({_link(config, path)})" for label, path in pages)
+    out.write(f"\n**Per-repo breakdown** of {len(stats.repos)} repos (too large for this page): {links}")
+    return True
+
+
+_FULL_SHA = re.compile(r"@([0-9a-f]{40})$")
+
+
+def _short_refs(counter: Counter) -> Counter:
+    """Abbreviate commit SHAs pinned in ``action@ref`` labels to 7 characters."""
+    short = Counter()
+    for label, count in counter.items():
+        short[_FULL_SHA.sub(lambda m: "@" + m.group(1)[:7], label)] += count
+    return short
 
 
 # Chart sections return raw lines (no code fences); render_stats wraps them.
 # Each value is a callable(stats, config, show_bar) -> list[str].
 _CHART_SECTIONS = {
     "adoption": lambda stats, config, show_bar: _render_adoption(stats, config, show_bar),
+    "orgs": lambda stats, config, show_bar: _render_orgs(stats, config, show_bar),
     "skills": lambda stats, config, show_bar: _render_ranked(
         f"⚡ Top Skills (of {stats.custom_commands_count} repos)",
         stats.custom_command_counter,
@@ -142,6 +298,13 @@ _CHART_SECTIONS = {
         config,
         show_bar,
     ),
+    "versions": lambda stats, config, show_bar: _render_ranked(
+        f"📌 Claude Action Versions (of {stats.action_refs_count} repos)",
+        _short_refs(stats.claude_action_ref_counter),
+        stats.action_refs_count,
+        config,
+        show_bar,
+    ),
     "mcp": lambda stats, config, show_bar: _render_ranked(
         f"🔧 Top MCP Servers (of {stats.mcp_servers_count} repos with MCP)",
         stats.mcp_server_counter,
@@ -151,32 +314,56 @@ _CHART_SECTIONS = {
     ),
 }
 
-# Non-chart sections rendered outside the code block.
+# Chart sections drawn from the run history rather than this run's stats.
+_HISTORY_SECTIONS = {
+    "trends": _render_trends,
+}
+
+# Non-chart sections rendered outside the code block. Each value is a
+# callable(out, stats, config, files) that writes the section to ``out``
+# and returns whether it wrote anything.
 _OTHER_SECTIONS = {
-    "details": lambda stats, config: _render_details(stats, config),
+    "details": _write_details,
 }
 
 
-def render_stats(stats: OrgStats, config: Config) -> str:
-    """Render all configured sections into a markdown string."""
-    chart_lines: list[str] = []
-    other_lines: list[str] = []
+def render_stats(
+    stats: OrgStats,
+    config: Config,
+    history: History | None = None,
+    files: dict[str, str] | None = None,
+) -> str:
+    """Render all configured sections into a markdown string.
+
+    History sections (``trends``) render only when ``history`` is given.
+    Sections are written to one buffer as they are rendered. Given
+    ``files``, a details table over ``details_max_kb`` is moved to separate
+    pages, added to ``files`` by path, and linked from the output.
+    """
+    out = io.StringIO()
 
+    chart = False
     for section in config.show_sections:
         if section in _CHART_SECTIONS:
-            show_bar = section in config.bar_sections
-            lines = _CHART_SECTIONS[section](stats, config, show_bar)
-            if lines:
-                chart_lines.extend(lines)
-        elif section in _OTHER_SECTIONS:
-            lines = _OTHER_SECTIONS[section](stats, config)
-            if lines:
-                other_lines.extend(lines)
-
-    result_parts: list[str] = []
-    if chart_lines:
-        result_parts.append("```\n" + "\n".join(chart_lines) + "\n```")
-    if other_lines:
-        result_parts.append("\n".join(other_lines))
-
-    return "\n".join(result_parts)
+            lines = _CHART_SECTIONS[section](stats, config, section in config.bar_sections)
+        elif section in _HISTORY_SECTIONS:
+            lines = _HISTORY_SECTIONS[section](history, config, section in config.bar_sections)
+        else:
+            continue
+        if lines:
+            out.write("\n" if chart else "```\n")
+            out.write("\n".join(lines))
+            chart = True
+    if chart:
+        out.write("\n```")
+
+    for section in config.show_sections:
+        if section in _OTHER_SECTIONS:
+            mark = out.tell()
+            if mark:
+                out.write("\n")
+            if not _OTHER_SECTIONS[section](out, stats, config, files):
+                out.seek(mark)
+                out.truncate()
+
+    return out.getvalue()
@@ -1,52 +1,210 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import datetime
+import itertools
+import os
+import queue
+import threading
 import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 
-from github import Auth, Github, GithubException
+from github import Auth, Github, GithubException, UnknownObjectException
 
+from .cache import BlobCache, blob_key
 from .config import Config
-from .models import OrgStats, RepoFeatures
+from .fetcher import UNAVAILABLE, ContentFetcher, FileContent, Unavailable
+from .inventory import RepoInfo, fetch_enterprise_orgs, fetch_inventory
+from .metrics import Metrics
+from .models import MultiOrgStats, OrgStats, RepoFeatures
+from .prober import PathProber, Probe
+from .shards import in_shard, parse_shard
+from .state import ScanState
+from .trees import fetch_tree
 from .detectors import (
-    detect_agents,
-    detect_claude_dir,
-    detect_claude_md,
-    detect_custom_commands,
-    detect_memory,
-    parse_mcp_json_content,
-    parse_settings_json_content,
-    parse_workflow_content,
-    paths_needing_content,
+    CONTENT_PARSERS,
+    DETECTORS,
+    apply_parsed,
+    classify_paths,
+    detectors_fingerprint,
+    is_detector_path,
+    is_pruned_dir,
+    parse_content,
 )
 
 
-def _check_rate_limit(gh: Github, threshold: int = 10) -> None:
-    """Sleep until rate limit resets if remaining calls are below threshold."""
-    rate = gh.get_rate_limit().rate
-    if rate.remaining < threshold:
-        sleep_time = max(0, (rate.reset - datetime.datetime.now(
-            datetime.timezone.utc
-        )).total_seconds()) + 5
-        print(f"Rate limit low ({rate.remaining} remaining). Sleeping {sleep_time:.0f}s...")
-        time.sleep(sleep_time)
+def _make_github(config: Config) -> Github:
+    """Create a Github client for the configured token.
 
+    Clients are lazy so that binding a repo by name costs no API call.
+    """
+    return Github(auth=Auth.Token(config.gh_token), base_url=config.api_url, lazy=True)
 
-def _get_file_content(repo, path: str) -> str | None:
-    """Fetch a single file's content from a repo."""
+
+class _ThreadClients:
+    """Hand out one Github client per thread.
+
+    PyGithub keeps a single connection object per client whose request state
+    is not thread-safe, so concurrent workers must not share a client.
+    """
+
+    def __init__(self, config: Config):
+        self._config = config
+        self._local = threading.local()
+
+    def get(self) -> Github:
+        gh = getattr(self._local, "gh", None)
+        if gh is None:
+            gh = _make_github(self._config)
+            self._local.gh = gh
+        return gh
+
+
+def _get_file_content(repo, path: str) -> bytes | Unavailable | None:
+    """Fetch a single file's raw content from a repo; the parsers take bytes.
+
+    Returns None if the file doesn't exist, and :data:`UNAVAILABLE` if it
+    couldn't be fetched.
+    """
     try:
         content_file = repo.get_contents(path)
         if hasattr(content_file, "decoded_content"):
-            return content_file.decoded_content.decode("utf-8", errors="replace")
-    except GithubException:
+            return content_file.decoded_content
+    except UnknownObjectException:
         pass
+    except GithubException:
+        return UNAVAILABLE
     return None
 
 
-def scan_repo(gh: Github, repo) -> RepoFeatures:
-    """Scan a single repository for Claude Code features."""
-    features = RepoFeatures(name=repo.name)
+def _fetch_serially(repo, paths: list[str]) -> list[bytes | Unavailable | None]:
+    return [_get_file_content(repo, path) for path in paths]
+
+
+@dataclass
+class _TreeResult:
+    """A repo whose tree has been fetched and run through the tree detectors.
+
+    Content detectors then run in three steps: :meth:`claim` returns the paths
+    that have to be fetched (the rest come from the blob cache or from another
+    worker already parsing the same blob), :meth:`resolve` parses what was
+    fetched, and :meth:`apply` merges every result into ``features``. Batched
+    callers must resolve all their repos before applying any, since applying
+    may wait on blobs another worker has claimed.
+    """
+
+    features: RepoFeatures
+    api_repo: object = None
+    # (path, parser key, blob sha), in the order their results are applied
+    jobs: list[tuple[str, str, str]] = field(default_factory=list)
+    # Per job: the parsed result, a Future for it, or None until resolved
+    parsed: list = field(default_factory=list)
+    # Default-branch head the tree was read at, when known
+    head_sha: str = ""
+    # Contents that came with the tree (from a probe), by path
+    contents: dict[str, str] = field(default_factory=dict)
+    # Seconds spent on this repo so far, for the slowest-repos report
+    elapsed: float = 0.0
+    # False once a tree or file couldn't be fetched: the features may miss
+    # something, so they aren't saved in the scan state for later runs
+    complete: bool = True
+
+    def claim(self, cache: BlobCache | None) -> list[str]:
+        self.parsed = []
+        paths = []
+        for path, kind, sha in self.jobs:
+            value = waiting = None
+            if cache is not None and sha:
+                value, waiting = cache.claim(_job_key(kind, sha))
+            self.parsed.append(value if value is not None else waiting)
+            if value is None and waiting is None and path not in self.contents:
+                paths.append(path)
+        return paths
+
+    def resolve(self, contents: list[FileContent], cache: BlobCache | None) -> None:
+        fetched = iter(contents)
+        for i, (path, kind, sha) in enumerate(self.jobs):
+            if self.parsed[i] is not None:
+                continue
+            content = self.contents[path] if path in self.contents else next(fetched)
+            if content is UNAVAILABLE:
+                self.complete = False
+                if cache is not None and sha:
+                    cache.release(_job_key(kind, sha))
+                continue
+            value = parse_content(kind, content) if content else None
+            if cache is not None and sha:
+                cache.resolve(_job_key(kind, sha), value)
+            self.parsed[i] = value
+
+    def abandon(self, cache: BlobCache | None) -> None:
+        """Release claimed blobs after a failed fetch so waiters don't hang."""
+        if cache is None:
+            return
+        for i, (_, kind, sha) in enumerate(self.jobs):
+            if self.parsed[i] is None and sha:
+                cache.release(_job_key(kind, sha))
+
+    def apply(self) -> RepoFeatures:
+        for value in self.parsed:
+            if isinstance(value, Future):
+                try:
+                    value = value.result()
+                except LookupError:
+                    # The worker that claimed this blob couldn't fetch it.
+                    self.complete = False
+                    continue
+            if value:
+                apply_parsed(value, self.features)
+        return self.features
+
+
+def _job_key(kind: str, sha: str) -> str:
+    return blob_key(kind, CONTENT_PARSERS[kind][1], sha)
+
+
+def _head_sha(api_repo, branch: str) -> str:
+    """Return the commit SHA at the head of ``branch``, or "" if it has none."""
+    try:
+        return api_repo.get_git_ref(f"heads/{branch}").object.sha
+    except GithubException:
+        return ""
+
 
-    _check_rate_limit(gh)
+def _reuse(state: ScanState, saved: dict, features: RepoFeatures, head_sha: str) -> _TreeResult:
+    """Rebuild a repo's features from state, keeping what depends on today's date."""
+    state.note_reused()
+    reused = RepoFeatures.from_dict(saved)
+    reused.name = features.name
+    reused.is_stale = features.is_stale
+    reused.is_new = features.is_new
+    return _TreeResult(reused, head_sha=head_sha)
+
+
+def _reuse_unchanged(state: ScanState, repo, features: RepoFeatures) -> _TreeResult | None:
+    """Reuse a repo's saved features if the listing shows it unchanged since they were saved.
+
+    That is, if it hasn't been pushed to or, for a :class:`RepoInfo`, if its
+    default branch head is the one they were saved at.
+    """
+    saved = state.lookup(repo.node_id)
+    if saved is None:
+        return None
+    if saved.pushed_at == _timestamp(repo.pushed_at):
+        return _reuse(state, saved.features, features, saved.head_sha)
+    if isinstance(repo, RepoInfo) and repo.head_sha and saved.head_sha == repo.head_sha:
+        return _reuse(state, saved.features, features, repo.head_sha)
+    return None
+
+
+def _repo_features(repo) -> RepoFeatures:
+    """Start a repo's features from its listing metadata."""
+    features = RepoFeatures(name=repo.name)
 
     # Check if repo is stale (no commits in 3+ months)
     if repo.pushed_at:
@@ -58,65 +216,541 @@ def scan_repo(gh: Github, repo) -> RepoFeatures:
         days_since_creation = (datetime.datetime.now(datetime.timezone.utc) - repo.created_at).days
         features.is_new = days_since_creation < 7
 
-    # Get full tree in one API call
+    return features
+
+
+def _jobs(needed: dict[str, list[str]], shas: dict[str, str]) -> list[tuple[str, str, str]]:
+    return [(path, kind, shas.get(path, "")) for kind in CONTENT_PARSERS for path in needed[kind]]
+
+
+def _walk_tree(api_repo, tree_sha: str, ignore: tuple[str, ...], max_dirs: int) -> tuple[dict[str, str], bool]:
+    """Read a tree directory by directory, keeping only detector paths.
+
+    Returns each detector path found with its blob SHA ("" for directories),
+    and whether every directory could be read. Directories that can't hold
+    detector targets are skipped, and at most ``max_dirs`` are read,
+    shallowest first, so memory and API use stay bounded however big the
+    tree is.
+    """
+    found: dict[str, str] = {}
+    pending = deque([("", tree_sha)])
+    queued = 1
+    capped = False
+    complete = True
+    while pending:
+        prefix, sha = pending.popleft()
+        try:
+            tree = api_repo.get_git_tree(sha)
+        except GithubException:
+            complete = False
+            continue
+        for item in tree.tree:
+            path = prefix + item.path
+            if item.type == "tree":
+                if is_detector_path(path):
+                    found[path] = ""
+                if is_pruned_dir(path, ignore):
+                    continue
+                if queued < max_dirs:
+                    pending.append((path + "/", item.sha))
+                    queued += 1
+                else:
+                    capped = True
+            elif is_detector_path(path):
+                found[path] = item.sha
+    if capped:
+        print(f"  Warning: {api_repo.full_name} has more than {max_dirs} directories; walked the first {max_dirs}.")
+    return found, complete
+
+
+def _scan_tree(
+    gh: Github,
+    repo,
+    state: ScanState | None = None,
+    ignore: tuple[str, ...] = (),
+    max_dirs: int = 2000,
+) -> _TreeResult:
+    """Fetch a repo's tree and run the tree-based detectors on it.
+
+    With ``state``, a repo whose default branch hasn't moved since the last
+    scan is not fetched at all and its saved features are reused. Unchanged
+    ``pushed_at`` settles it for free; otherwise the head SHA is compared.
+
+    The tree is decoded entry by entry and only detector paths are kept.
+    GitHub truncates very large recursive trees; a truncated tree is dropped
+    and walked directory by directory instead (see :func:`_walk_tree`).
+    """
+    features = _repo_features(repo)
+    # A repo from the inventory already has its head and root tree, so it
+    # needs no ref lookup.
+    inventoried = isinstance(repo, RepoInfo)
+    api_repo = gh.get_repo(repo.full_name)
+    default_branch = repo.default_branch
+
+    head_sha = repo.head_sha if inventoried else ""
+    if state is not None:
+        reused = _reuse_unchanged(state, repo, features)
+        if reused is not None:
+            return reused
+        if not inventoried:
+            saved = state.lookup(repo.node_id)
+            head_sha = _head_sha(api_repo, default_branch)
+            if saved is not None and head_sha and saved.head_sha == head_sha:
+                return _reuse(state, saved.features, features, head_sha)
+    if inventoried and not repo.tree_sha:
+        # No default branch: the repo is empty.
+        return _TreeResult(features)
+
+    # Get full tree in one API call, classifying entries as they are decoded
     try:
-        default_branch = repo.default_branch
-        tree = repo.get_git_tree(default_branch, recursive=True)
-    except GithubException:
-        # Empty repo or other error
-        return features
+        tree = fetch_tree(api_repo, repo.tree_sha if inventoried else head_sha or default_branch)
+        needed, shas = DETECTORS.classify_entries(tree, features)
+    except GithubException as e:
+        # 409: the repo is empty. Anything else may go away by the next run.
+        return _TreeResult(features, head_sha=head_sha, complete=e.status == 409)
+    except ValueError:
+        # A body cut off or mangled on the way: try again next run.
+        return _TreeResult(features, head_sha=head_sha, complete=False)
+
+    if tree.truncated:
+        # Start over from the listing: the partial tree's matches are incomplete.
+        features = _repo_features(repo)
+        found, complete = _walk_tree(api_repo, tree.sha, ignore, max_dirs)
+        needed = classify_paths(set(found), features)
+        return _TreeResult(features, api_repo, _jobs(needed, found), head_sha=head_sha, complete=complete)
+
+    return _TreeResult(features, api_repo, _jobs(needed, shas), head_sha=head_sha)
+
 
-    tree_paths = {item.path for item in tree.tree}
+def _probe_tree(
+    gh: Github,
+    repo,
+    probe: Probe | None,
+    state: ScanState | None = None,
+    **tree_options,
+) -> _TreeResult:
+    """Run the tree-based detectors on what a probe found in a repo.
 
-    # Tree-based detectors (no API calls needed)
-    detect_claude_md(tree_paths, features)
-    detect_claude_dir(tree_paths, features)
-    detect_custom_commands(tree_paths, features)
-    detect_memory(tree_paths, features)
-    detect_agents(tree_paths, features)
+    Files the probe returned inline are not fetched again. A repo the probe
+    failed on is scanned from its full tree instead, with ``tree_options``.
+    """
+    if probe is None:
+        return _scan_tree(gh, repo, state, **tree_options)
+    features = _repo_features(repo)
+    if state is not None:
+        saved = state.lookup(repo.node_id)
+        if saved is not None and probe.head_sha and saved.head_sha == probe.head_sha:
+            return _reuse(state, saved.features, features, probe.head_sha)
 
-    # Content-based detectors (need file contents)
-    needed = paths_needing_content(tree_paths)
+    needed = classify_paths(set(probe.paths), features)
+    jobs = _jobs(needed, probe.paths)
+    return _TreeResult(features, gh.get_repo(repo.full_name), jobs, head_sha=probe.head_sha, contents=probe.contents)
 
-    for path in needed["mcp_json"]:
-        content = _get_file_content(repo, path)
-        if content:
-            parse_mcp_json_content(content, features)
 
-    for path in needed["settings_json"]:
-        content = _get_file_content(repo, path)
-        if content:
-            parse_settings_json_content(content, features)
+def _timestamp(value: datetime.datetime | None) -> str:
+    return value.isoformat() if value else ""
 
-    for path in needed["workflows"]:
-        content = _get_file_content(repo, path)
-        if content:
-            parse_workflow_content(content, features)
 
+def _scan_contents(
+    result: _TreeResult,
+    fetch: Callable[[list[str]], list[FileContent]] | None = None,
+    cache: BlobCache | None = None,
+    metrics: Metrics | None = None,
+) -> RepoFeatures:
+    """Fetch the files a tree scan asked for and run the content detectors."""
+    start = time.perf_counter()
+    paths = result.claim(cache)
+    try:
+        if not paths:
+            contents = []
+        elif fetch is None:
+            contents = _fetch_serially(result.api_repo, paths)
+        else:
+            contents = fetch(paths)
+    except BaseException:
+        result.abandon(cache)
+        raise
+    fetched = time.perf_counter()
+    # Contents may arrive out of order, but results are applied in job order.
+    result.resolve(contents, cache)
+    features = result.apply()
+    end = time.perf_counter()
+    result.elapsed += end - start
+    if metrics is not None:
+        metrics.add_phase("content", fetched - start)
+        metrics.add_phase("detection", end - fetched)
     return features
 
 
-def scan_organization(config: Config) -> OrgStats:
-    """Scan all repos in an organization for Claude Code features."""
-    gh = Github(auth=Auth.Token(config.gh_token))
-    org = gh.get_organization(config.org_name)
+def scan_repo(
+    gh: Github,
+    repo,
+    fetch: Callable[[list[str]], list[FileContent]] | None = None,
+    cache: BlobCache | None = None,
+) -> RepoFeatures:
+    """Scan a single repository for Claude Code features.
 
-    repos_data: list[RepoFeatures] = []
-    exclude_set = set(config.exclude_repos)
+    Metadata is read from ``repo`` as listed; API calls go through ``gh``.
+    ``fetch`` maps a list of paths to their contents (in the same order) and
+    defaults to fetching them one after another. Files whose parsed results
+    are in ``cache`` are not fetched at all.
+    """
+    return _scan_contents(_scan_tree(gh, repo), fetch, cache)
 
-    print(f"Scanning organization: {config.org_name}")
 
-    for repo in org.get_repos(type="all", sort="full_name"):
+def list_repos(gh: Github, config: Config, org_name: str | None = None) -> Iterator:
+    """Yield the repos of ``org_name`` (default: the configured org) that pass the configured filters.
+
+    With ``repo_listing="graphql"`` the repos are :class:`RepoInfo` from the
+    GraphQL inventory, 100 per request, which also carry each default
+    branch's head and root tree.
+    """
+    org_name = org_name or config.org_name
+    if config.repo_listing == "graphql":
+        listing = fetch_inventory(gh.requester, org_name)
+    else:
+        listing = gh.get_organization(org_name).get_repos(type="all", sort="full_name")
+    exclude_set = set(config.exclude_repos)
+    shard = parse_shard(config.shard)
+
+    for repo in listing:
         if config.exclude_archived and repo.archived:
             continue
         if config.exclude_forks and repo.fork:
             continue
         if repo.name in exclude_set:
             continue
+        if not in_shard(repo.full_name, shard):
+            continue
+        yield repo
+
+
+# Queue sentinel marking the end of a stage's input.
+_DONE = object()
+
+# How long a batching content worker waits for more repos before fetching.
+_GATHER_WAIT = 0.05
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+def iter_repo_features(
+    config: Config,
+    repos: Iterable | None = None,
+    cache: BlobCache | None = None,
+    state: ScanState | None = None,
+    metrics: Metrics | None = None,
+) -> Iterator[RepoFeatures]:
+    """Scan repos, yielding their features in listing order.
+
+    See :func:`iter_scanned_repos`, which also yields each listed repo.
+    """
+    for _, features in iter_scanned_repos(config, repos, cache, state, metrics):
+        yield features
+
+
+def iter_scanned_repos(
+    config: Config,
+    repos: Iterable | None = None,
+    cache: BlobCache | None = None,
+    state: ScanState | None = None,
+    metrics: Metrics | None = None,
+) -> Iterator[tuple[object, RepoFeatures]]:
+    """Scan repos through a staged pipeline, yielding ``(repo, features)`` in listing order.
+
+    The stages (enumerate -> tree -> content + detect) each run on their own
+    threads, ``scan_concurrency`` workers per stage, connected by bounded
+    queues. While one repo's files are being fetched and parsed, the next
+    repo's tree is already being fetched. The number of repos between
+    enumeration and the consumer is capped, so memory stays flat however
+    large the organization is.
+
+    With ``content_fetch="graphql"`` each content worker gathers queued repos
+    until it has a batch worth of files and fetches them all in one query.
+    With ``scan_mode="probe"`` tree workers likewise gather repos and probe
+    their well-known paths in one query instead of fetching each full tree.
+
+    ``repos`` defaults to the filtered listing of every configured org, one
+    org after another. Parsed file results are looked up in and added to
+    ``cache`` when one is given. Unchanged repos are taken from ``state``,
+    and every repo scanned without errors is recorded in it. Time spent per
+    stage and per repo is added to ``metrics``.
+    """
+    workers = config.scan_concurrency
+    clients = _ThreadClients(config)
+    tree_options = {"ignore": tuple(config.tree_ignore), "max_dirs": config.tree_walk_max_dirs}
+    metrics = metrics if metrics is not None else Metrics()
+    if repos is None:
+        repos = itertools.chain.from_iterable(list_repos(clients.get(), config, org) for org in config.orgs())
+    repos = metrics.timed("listing", repos)
+
+    def fetch_one(full_name: str, path: str) -> bytes | Unavailable | None:
+        return _get_file_content(clients.get().get_repo(full_name), path)
+
+    fetcher = None
+    if config.content_fetch == "graphql":
+        fetcher = ContentFetcher(lambda: clients.get().requester, fetch_one, batch_size=config.content_batch_size)
+    prober = None
+    if config.scan_mode == "probe":
+        prober = PathProber(lambda: clients.get().requester, batch_size=config.probe_batch_size)
+    content_pool = None
+    if fetcher is None and workers > 1:
+        content_pool = ThreadPoolExecutor(workers, thread_name_prefix="content")
+
+    # Batching workers need enough queued repos to fill a batch.
+    tree_depth = max(workers, config.probe_batch_size) if prober else workers
+    depth = max(workers, config.content_batch_size) if fetcher else workers
+    window = threading.Semaphore(tree_depth + workers + depth + 1)
+    stop = threading.Event()
+    tree_q: queue.Queue = queue.Queue(maxsize=tree_depth)
+    content_q: queue.Queue = queue.Queue(maxsize=depth)
+    result_q: queue.Queue = queue.Queue()
+
+    def fetch_pooled(full_name: str, paths: list[str]) -> list[bytes | Unavailable | None]:
+        futures = [content_pool.submit(fetch_one, full_name, path) for path in paths]
+        return [future.result() for future in futures]
+
+    def enumerate_stage() -> None:
+        try:
+            for seq, repo in enumerate(repos):
+                while not window.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                print(f"  Scanning {repo.name}...")
+                tree_q.put((seq, repo))
+        except Exception as e:
+            result_q.put(_Failure(e))
+        finally:
+            for _ in range(workers):
+                tree_q.put(_DONE)
+
+    def tree_stage() -> None:
+        done = False
+        while not done and (item := tree_q.get()) is not _DONE:
+            try:
+                if prober is not None:
+                    batch, done = gather(tree_q, item, lambda item: 1, lambda: prober.batch_size)
+                    probe_batch(batch)
+                    continue
+                seq, repo = item
+                start = time.perf_counter()
+                result = _scan_tree(clients.get(), repo, state, **tree_options)
+                result.elapsed = time.perf_counter() - start
+                metrics.add_phase("trees", result.elapsed)
+                content_q.put((seq, repo, result))
+            except Exception as e:
+                result_q.put(_Failure(e))
+        content_q.put(_DONE)
 
-        print(f"  Scanning {repo.name}...")
-        features = scan_repo(gh, repo)
-        repos_data.append(features)
+    def gather(q: queue.Queue, first, size: Callable, limit: Callable[[], int]) -> tuple[list, bool]:
+        """Add repos queued on ``q`` to ``first`` until their ``size`` fills a batch.
+
+        Returns the batch and whether the end-of-input sentinel was taken.
+        """
+        batch = [first]
+        total = size(first)
+        while total < limit():
+            try:
+                item = q.get(timeout=_GATHER_WAIT)
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+            total += size(item)
+        return batch, False
+
+    def probe_batch(batch: list) -> None:
+        gh = clients.get()
+        start = time.perf_counter()
+        results = []
+        to_probe = []
+        for seq, repo in batch:
+            reused = _reuse_unchanged(state, repo, _repo_features(repo)) if state is not None else None
+            if reused is not None:
+                results.append((seq, repo, reused))
+            elif isinstance(repo, RepoInfo) and not repo.tree_sha:
+                # Empty: nothing to probe.
+                results.append((seq, repo, _TreeResult(_repo_features(repo))))
+            else:
+                to_probe.append((seq, repo))
+        probes = prober.probe([repo.full_name for _, repo in to_probe])
+        for (seq, repo), probe in zip(to_probe, probes):
+            results.append((seq, repo, _probe_tree(gh, repo, probe, state, **tree_options)))
+        elapsed = time.perf_counter() - start
+        metrics.add_phase("trees", elapsed)
+        for item in results:
+            # One query served the batch: split its time evenly.
+            item[2].elapsed = elapsed / len(results)
+            content_q.put(item)
+
+    def scan_batch(batch: list) -> None:
+        start = time.perf_counter()
+        claimed = [result.claim(cache) for _, _, result in batch]
+        requests = [(repo.full_name, path) for (_, repo, _), paths in zip(batch, claimed) for path in paths]
+        try:
+            contents = iter(fetcher.fetch(requests))
+        except BaseException:
+            for _, _, result in batch:
+                result.abandon(cache)
+            raise
+        fetched = time.perf_counter()
+        metrics.add_phase("content", fetched - start)
+        for (_, _, result), paths in zip(batch, claimed):
+            result.resolve([next(contents) for _ in paths], cache)
+            result.elapsed += (fetched - start) / len(batch)
+        features = [result.apply() for _, _, result in batch]
+        metrics.add_phase("detection", time.perf_counter() - fetched)
+        for (seq, repo, result), repo_features in zip(batch, features):
+            finish(seq, repo, result, repo_features)
+
+    def finish(seq: int, repo, result: _TreeResult, features: RepoFeatures) -> None:
+        if not result.complete:
+            # Counted as scanned, but scanned again next run.
+            metrics.count("incomplete_repos")
+        elif state is not None:
+            state.record(repo.node_id, repo.full_name, result.head_sha, _timestamp(repo.pushed_at), features)
+        metrics.record_repo(repo.full_name, result.elapsed)
+        result_q.put((seq, (repo, features)))
+
+    def content_stage() -> None:
+        done = False
+        while not done and (item := content_q.get()) is not _DONE:
+            try:
+                if fetcher is not None:
+                    batch, done = gather(content_q, item, lambda item: len(item[2].jobs), lambda: fetcher.batch_size)
+                    scan_batch(batch)
+                    continue
+                seq, repo, result = item
+                fetch = partial(fetch_pooled, repo.full_name) if content_pool else None
+                finish(seq, repo, result, _scan_contents(result, fetch, cache, metrics))
+            except Exception as e:
+                result_q.put(_Failure(e))
+        result_q.put(_DONE)
+
+    threads = [threading.Thread(target=enumerate_stage, name="enumerate", daemon=True)]
+    threads += [threading.Thread(target=tree_stage, name=f"tree-{i}", daemon=True) for i in range(workers)]
+    threads += [threading.Thread(target=content_stage, name=f"content-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Results finish out of order; hold them back until their turn.
+    pending: dict[int, tuple[object, RepoFeatures]] = {}
+    next_seq = 0
+    running = workers
+    try:
+        while running:
+            item = result_q.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            if isinstance(item, _Failure):
+                raise item.error
+            seq, scanned = item
+            pending[seq] = scanned
+            while next_seq in pending:
+                window.release()
+                yield pending.pop(next_seq)
+                next_seq += 1
+    finally:
+        stop.set()
+        if content_pool is not None:
+            content_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_repo_features(
+    config: Config,
+    repos: Iterable | None = None,
+    cache: BlobCache | None = None,
+    state: ScanState | None = None,
+    metrics: Metrics | None = None,
+) -> AsyncIterator[RepoFeatures]:
+    """Async counterpart of :func:`iter_repo_features`, taking the same arguments."""
+    iterator = iter_repo_features(config, repos, cache, state, metrics)
+    try:
+        while (features := await asyncio.to_thread(next, iterator, None)) is not None:
+            yield features
+    finally:
+        iterator.close()
+
+
+def _repo_attributes(repo) -> dict[str, str]:
+    """Listing metadata the stats can be grouped by."""
+    return {
+        "org": repo.full_name.split("/", 1)[0],
+        "language": getattr(repo, "language", None) or "",
+        "visibility": getattr(repo, "visibility", None) or "",
+    }
+
+
+def resolve_orgs(config: Config) -> list[str]:
+    """The organizations to scan: ``config.orgs()``, then every org of ``config.enterprise``."""
+    orgs = list(config.orgs())
+    if config.enterprise:
+        enterprise_orgs = fetch_enterprise_orgs(_make_github(config).requester, config.enterprise)
+        orgs += [org for org in enterprise_orgs if org.lower() not in {o.lower() for o in orgs}]
+    return orgs
+
+
+def scan_organization(config: Config, metrics: Metrics | None = None) -> OrgStats:
+    """Scan all repos in an organization for Claude Code features.
+
+    With several orgs configured, returns their rollup; see
+    :func:`scan_organizations`.
+    """
+    return scan_organizations(config, metrics).rollup()
+
+
+def scan_organizations(config: Config, metrics: Metrics | None = None) -> MultiOrgStats:
+    """Scan every configured organization in one pipeline.
+
+    All orgs share the clients, caches, scan state and rate budget. With
+    more than one org, repos are named ``org/repo`` in per-repo details.
+    Scan timings and cache counters are added to ``metrics``.
+    """
+    metrics = metrics if metrics is not None else Metrics()
+    orgs = resolve_orgs(config)
+    config = dataclasses.replace(config, org_names=orgs)
+    shard = f" (shard {config.shard})" if config.shard else ""
+    print(f"Scanning organization{'s' if len(orgs) > 1 else ''}: {', '.join(orgs)}{shard}")
+
+    # Per-repo features are only needed afterwards for the details table.
+    keep_repos = "details" in config.show_sections
+    stats = MultiOrgStats(config.enterprise or ", ".join(orgs), {org: OrgStats(org_name=org) for org in orgs})
+    by_login = {org.lower(): org_stats for org, org_stats in stats.orgs.items()}
+
+    cache = state = None
+    if config.cache_dir:
+        cache = BlobCache(os.path.join(config.cache_dir, "blobs.sqlite3"), config.blob_cache_max_mb * 1024 * 1024)
+        state_path = os.path.join(config.cache_dir, "scan-state.json")
+        if config.full_rescan:
+            state = ScanState(fingerprint=detectors_fingerprint())
+        else:
+            state = ScanState.load(state_path, detectors_fingerprint())
+        print(f"Loaded scan state for {len(state)} repos.")
+    try:
+        for repo, features in iter_scanned_repos(config, cache=cache, state=state, metrics=metrics):
+            with metrics.phase("aggregation"):
+                attributes = _repo_attributes(repo)
+                if len(orgs) > 1:
+                    features.name = repo.full_name
+                by_login[attributes["org"].lower()].add(features, keep=keep_repos, attributes=attributes)
+    finally:
+        if cache is not None:
+            cache.close()
 
-    print(f"Scanned {len(repos_data)} repos.")
-    return OrgStats.aggregate(config.org_name, repos_data)
+    for org, org_stats in stats.orgs.items():
+        print(f"Scanned {org_stats.total_repos} repos" + (f" in {org}." if len(orgs) > 1 else "."))
+    if state is not None:
+        state.save(state_path)
+        print(f"Reused saved results for {state.reused} unchanged repos.")
+        metrics.count("repos_reused", state.reused)
+    if cache is not None:
+        print(f"Blob cache: {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions.")
+        metrics.count("blob_cache_hits", cache.hits)
+        metrics.count("blob_cache_misses", cache.misses)
+        metrics.count("blob_cache_evictions", cache.evictions)
+    return stats
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import glob
+import json
+import zlib
+
+from .files import atomic_write
+from .models import OrgStats
+
+# Bump when the partial file layout changes; partials from other versions
+# are rejected rather than merged into wrong counts.
+PARTIAL_VERSION = 2
+
+
+def parse_shard(spec: str) -> tuple[int, int] | None:
+    """Parse a ``k/n`` shard spec (1-based) into ``(k, n)``; "" means no sharding."""
+    if not spec.strip():
+        return None
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"SHARD must look like k/n, got {spec!r}") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"SHARD {spec!r} is out of range: k must be between 1 and n")
+    return index, count
+
+
+def in_shard(full_name: str, shard: tuple[int, int] | None) -> bool:
+    """Whether repo ``full_name`` belongs to ``shard``.
+
+    The split hashes the lower-cased name, so a repo stays in the same shard
+    from run to run however the rest of the org changes.
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    return zlib.crc32(full_name.lower().encode("utf-8")) % count == index - 1
+
+
+def save_partial(stats: OrgStats, path: str, shard: tuple[int, int] | None = None) -> None:
+    """Atomically write ``stats`` as a partial for :func:`merge_partials`."""
+    data = {"version": PARTIAL_VERSION, "shard": list(shard) if shard else None, "stats": stats.to_dict()}
+    with atomic_write(path) as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def load_partial(path: str) -> OrgStats:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"{path} is not a version {PARTIAL_VERSION} partial")
+    return OrgStats.from_dict(data["stats"])
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """Paths matching ``patterns`` (globs), sorted and without duplicates."""
+    paths: set[str] = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern, recursive=True))
+    return sorted(paths)
+
+
+def merge_partials(org_name: str, paths: list[str]) -> OrgStats:
+    """Load and merge the partials at ``paths``."""
+    return OrgStats.merge(org_name, (load_partial(path) for path in paths))
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+
+from .files import atomic_write
+from .models import RepoFeatures
+
+# Bump when the file layout or the meaning of saved features changes;
+# state files from other versions are ignored.
+STATE_VERSION = 1
+
+
+@dataclass
+class RepoState:
+    full_name: str
+    head_sha: str
+    pushed_at: str
+    features: dict
+
+
+class ScanState:
+    """Per-repo results of the previous scan, keyed by repo node ID.
+
+    Node IDs survive renames and transfers, so a moved repo is still matched
+    with its saved features. Only repos recorded during the current run are
+    written back by :meth:`save`; repos that disappeared are dropped.
+    """
+
+    def __init__(self, repos: dict[str, RepoState] | None = None, fingerprint: str = ""):
+        self.fingerprint = fingerprint
+        self._previous = repos or {}
+        self._current: dict[str, RepoState] = {}
+        self._lock = threading.Lock()
+        self.reused = 0
+
+    @staticmethod
+    def load(path: str, fingerprint: str = "") -> ScanState:
+        """Load a state file; a missing, unreadable or outdated one yields empty state.
+
+        ``fingerprint`` identifies the detectors that produced the saved
+        features. State saved under a different fingerprint is ignored.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return ScanState(fingerprint=fingerprint)
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != STATE_VERSION
+            or data.get("fingerprint") != fingerprint
+        ):
+            return ScanState(fingerprint=fingerprint)
+        repos = {node_id: RepoState(**entry) for node_id, entry in data.get("repos", {}).items()}
+        return ScanState(repos, fingerprint)
+
+    def save(self, path: str) -> None:
+        """Atomically write the repos recorded during this run."""
+        with self._lock:
+            data = {
+                "version": STATE_VERSION,
+                "fingerprint": self.fingerprint,
+                "repos": {node_id: asdict(entry) for node_id, entry in sorted(self._current.items())},
+            }
+        with atomic_write(path) as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def lookup(self, node_id: str) -> RepoState | None:
+        return self._previous.get(node_id)
+
+    def record(self, node_id: str, full_name: str, head_sha: str, pushed_at: str, features: RepoFeatures) -> None:
+        entry = RepoState(full_name, head_sha, pushed_at, features.to_dict())
+        with self._lock:
+            self._current[node_id] = entry
+
+    def note_reused(self) -> None:
+        with self._lock:
+            self.reused += 1
+
+    def __len__(self) -> int:
+        return len(self._previous)
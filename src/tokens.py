@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from github import Auth, Github, GithubIntegration
+
+from .config import Config
+from .ratelimit import RateBudget
+
+
+@dataclass
+class Credential:
+    """One token in the pool, with its own rate budget and usage counts."""
+
+    label: str
+    auth: Auth.Auth
+    budget: RateBudget
+    requests: Counter = field(default_factory=Counter)
+    # Lowercased login of the account an App installation is on; "" for a
+    # user token, which can sign requests for any account.
+    account: str = ""
+
+    def authorization(self) -> str:
+        # App installation tokens refresh themselves here when about to expire.
+        return f"{self.auth.token_type} {self.auth.token}"
+
+
+class TokenPool:
+    """Spread requests over several credentials by remaining budget.
+
+    :meth:`choose` picks the credential with the most requests left for the
+    resource, so an exhausted token simply stops being picked while the others
+    carry on. Only when every credential is out does a request wait, on
+    whichever one it was given. An App installation only sees its own
+    account's repos, so it is only picked for requests for that account.
+    """
+
+    def __init__(self, credentials: list[Credential]):
+        if not credentials:
+            raise ValueError("TokenPool needs at least one credential")
+        self.credentials = credentials
+        self._lock = threading.Lock()
+
+    def _usable(self, owner: str) -> list[Credential]:
+        """The credentials that can sign a request for ``owner``; all of them if none can."""
+        owner = owner.lower()
+        usable = [c for c in self.credentials if not c.account or (owner and c.account == owner)]
+        return usable or self.credentials
+
+    def choose(self, resource: str = "core", owner: str = "") -> Credential:
+        """The credential for a request for ``owner``'s resources ("": no one account's)."""
+        with self._lock:
+            credential = max(
+                self._usable(owner),
+                key=lambda c: (c.budget.available(resource), -sum(c.requests.values())),
+            )
+            credential.requests[resource] += 1
+            return credential
+
+    def release_reserve(self) -> None:
+        for credential in self.credentials:
+            credential.budget.release_reserve()
+
+    def report(self) -> list[str]:
+        """One line of usage per credential, for the end of the run."""
+        lines = []
+        for credential in self.credentials:
+            used = ", ".join(f"{count} {resource}" for resource, count in sorted(credential.requests.items()))
+            remaining = credential.budget.remaining("core")
+            left = f"{remaining} core left" if remaining is not None else "core budget unknown"
+            lines.append(f"{credential.label}: {used or 'no'} requests, {left}")
+        return lines
+
+    @property
+    def slept(self) -> float:
+        return sum(credential.budget.slept for credential in self.credentials)
+
+
+# The account in a REST path, and in the repository and organization lookups of
+# the scanner's GraphQL queries.
+_PATH_OWNER = re.compile(r"/(?:repos|orgs)/([^/]+)")
+_QUERY_OWNER = re.compile(r'(?:repository\(owner|organization\(login): "([^"\\]+)"')
+
+
+def owner_for(url: str, body: str | bytes | None = None) -> str:
+    """The account whose resources a request is for; "" if none, or several."""
+    path = url.split("?", 1)[0]
+    if not path.endswith("/graphql"):
+        match = _PATH_OWNER.search(path)
+        return match.group(1) if match else ""
+    try:
+        payload = json.loads(body or "{}")
+    except ValueError:
+        return ""
+    owners = {owner.lower() for owner in _QUERY_OWNER.findall(payload.get("query", ""))}
+    login = (payload.get("variables") or {}).get("login")
+    if login:
+        owners.add(login.lower())
+    return owners.pop() if len(owners) == 1 else ""
+
+
+def _mask(token: str) -> str:
+    return f"…{token[-4:]}" if len(token) > 8 else "…"
+
+
+def build_pool(config: Config) -> TokenPool:
+    """Build the token pool from GH_TOKEN, GH_TOKENS and GitHub App credentials.
+
+    App installations are looked up from the organizations when
+    ``app_installation_ids`` is empty, and are all used when scanning an
+    enterprise. Installation tokens are minted on first use and refreshed
+    before they expire.
+    """
+    credentials: list[Credential] = []
+
+    def budget() -> RateBudget:
+        return RateBudget(reserve=config.rate_limit_reserve)
+
+    tokens = list(dict.fromkeys(t for t in [config.gh_token, *config.gh_tokens] if t))
+    for i, token in enumerate(tokens, 1):
+        credentials.append(Credential(f"token {i} ({_mask(token)})", Auth.Token(token), budget()))
+
+    if config.app_id and config.app_private_key:
+        app_auth = Auth.AppAuth(config.app_id, config.app_private_key)
+        with GithubIntegration(auth=app_auth, base_url=config.api_url) as integration:
+            installations = _installations(integration, config)
+        requester = Github(auth=app_auth, base_url=config.api_url).requester
+        for installation_id, account in installations.items():
+            auth = Auth.AppInstallationAuth(app_auth, installation_id, requester=requester)
+            label = f"app installation {installation_id} ({account})"
+            credentials.append(Credential(label, auth, budget(), account=account.lower()))
+
+    return TokenPool(credentials)
+
+
+def _installations(integration: GithubIntegration, config: Config) -> dict[int, str]:
+    """The App installations to use, by ID, with the login of the account each is on."""
+    if config.app_installation_ids:
+        return {
+            int(i): integration.get_app_installation(int(i)).account.login
+            for i in config.app_installation_ids
+        }
+    installations = {integration.get_org_installation(org).id: org for org in config.orgs()}
+    if config.enterprise:
+        # The enterprise's orgs are only listed later: take every installation.
+        for installation in integration.get_installations():
+            installations.setdefault(installation.id, installation.account.login)
+    return installations
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+import requests
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+
+from .files import atomic_write
+from .metrics import Metrics, endpoint_for
+from .ratelimit import RateBudget, resource_for
+from .tokens import TokenPool, owner_for
+
+
+class ResponseCache:
+    """On-disk store of GET response bodies with their validators.
+
+    Each entry holds the ETag and Last-Modified headers GitHub sent with a
+    response, the response headers and its zlib-compressed body, in one file
+    per URL under ``directory``. Once the files add up to more than
+    ``max_bytes``, the least recently used are deleted; a file's mtime is
+    when it was last used. A response that would take more than a tenth of
+    ``max_bytes`` on its own is not stored.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # File name -> (last used, size)
+        self._entries: dict[str, tuple[float, int]] = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                self._entries[entry.name] = (stat.st_mtime, stat.st_size)
+        self._size = sum(size for _, size in self._entries.values())
+        self.evictions = 0
+
+    def _name(self, key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def load(self, key: str) -> tuple[dict, str] | None:
+        """Return ``(meta, body)`` for ``key``, or None if not cached."""
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = zlib.decompress(f.read()).decode("utf-8")
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            return None
+        with self._lock:
+            if name in self._entries:
+                self._entries[name] = (time.time(), self._entries[name][1])
+        return meta, body
+
+    def store(self, key: str, meta: dict, body: str) -> None:
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        data = json.dumps(meta).encode() + b"\n" + zlib.compress(body.encode("utf-8"))
+        if len(data) > self.max_bytes // 10:
+            # Too big to be worth the space: drop any older copy instead.
+            with self._lock:
+                self._remove(name)
+            return
+        with atomic_write(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            _, old_size = self._entries.get(name, (0.0, 0))
+            self._entries[name] = (time.time(), len(data))
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, name: str) -> None:
+        if name not in self._entries:
+            return
+        _, size = self._entries.pop(name)
+        self._size -= size
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is 90% full."""
+        target = self.max_bytes * 0.9
+        for name in sorted(self._entries, key=lambda name: self._entries[name][0]):
+            if self._size <= target:
+                break
+            self._remove(name)
+            self.evictions += 1
+
+
+class CachedResponse:
+    """A cached body served in place of a 304, shaped like PyGithub's response."""
+
+    def __init__(self, headers: dict[str, str], body: str):
+        self.status = 200
+        self.headers = headers
+        self._body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self) -> str:
+        return self._body
+
+
+class Transport:
+    """Hooks shared by every GitHub request the action makes.
+
+    Installed with :func:`install`, it sees each request PyGithub sends on
+    any client. With a :class:`ResponseCache`, GETs are sent as conditional
+    requests and a 304 is answered from the cache; GitHub doesn't count 304s
+    against the primary rate limit. With a :class:`RateBudget`, each request
+    waits for its turn and reports the rate-limit headers it gets back.
+    With a :class:`TokenPool`, each token-authenticated request is signed by
+    whichever credential for the repo's owner has the most budget left and
+    uses that budget.
+    With :class:`Metrics`, each request's endpoint, status, latency and size
+    are recorded; latency excludes time spent waiting on the budget.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        budget: RateBudget | None = None,
+        pool: TokenPool | None = None,
+        metrics: Metrics | None = None,
+    ):
+        self.cache = cache
+        self.budget = budget
+        self.pool = pool
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def send(self, cnx, send):
+        """Send the request prepared on ``cnx`` through ``send()``."""
+        with self._lock:
+            self.requests += 1
+        resource = resource_for(cnx.url)
+        budget = self.budget
+        # App JWTs ("Bearer") are left alone: they mint the installation tokens.
+        if self.pool is not None and cnx.headers.get("Authorization", "").startswith("token "):
+            credential = self.pool.choose(resource, owner_for(cnx.url, cnx.input))
+            cnx.headers["Authorization"] = credential.authorization()
+            budget = credential.budget
+        if budget is None:
+            return self._measure(cnx, send)
+
+        budget.acquire(resource)
+        response = None
+        try:
+            response = self._measure(cnx, send)
+            return response
+        finally:
+            budget.update(resource, response.headers if response is not None else None)
+
+    def _measure(self, cnx, send):
+        if self.metrics is None:
+            return self._send(cnx, send)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._send(cnx, send)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            cached = isinstance(response, CachedResponse)
+            self.metrics.record_request(
+                endpoint_for(cnx.verb, cnx.url),
+                response.status if response is not None else 599,
+                elapsed,
+                0 if response is None or cached else _body_size(response, cnx.stream),
+                cached,
+            )
+
+    @property
+    def slept(self) -> float:
+        """Seconds spent waiting on the rate limit."""
+        return (self.budget.slept if self.budget is not None else 0) + (self.pool.slept if self.pool else 0)
+
+    def _send(self, cnx, send):
+        if self.cache is None or cnx.verb != "GET" or cnx.stream:
+            return send()
+
+        key = f"{cnx.protocol}://{cnx.host}:{cnx.port}{cnx.url} {cnx.headers.get('Accept', '')}"
+        cached = self.cache.load(key)
+        if cached is not None:
+            meta, body = cached
+            if meta.get("etag"):
+                cnx.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                cnx.headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = send()
+        if response.status == 304 and cached is not None:
+            with self._lock:
+                self.cache_hits += 1
+            # Fresh rate-limit headers win over the cached ones.
+            headers = {**meta["headers"], **dict(response.headers)}
+            return CachedResponse(headers, body)
+
+        with self._lock:
+            self.cache_misses += 1
+        if response.status == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                meta = {"etag": etag, "last_modified": last_modified, "headers": dict(response.headers)}
+                self.cache.store(key, meta, response.read())
+        return response
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.requests} requests, {self.cache_hits} served from cache (304), "
+            f"{self.cache_misses} cache misses"
+        )
+        if self.budget is not None or self.pool is not None:
+            summary += f", {self.slept:.0f}s spent pacing for the rate limit"
+        return summary
+
+
+def _body_size(response, stream: bool) -> int:
+    """Bytes received for ``response``: compressed when GitHub sent Content-Length."""
+    length = response.headers.get("Content-Length")
+    if length:
+        return int(length)
+    if stream:
+        return 0
+    return len(response.response.content) if hasattr(response, "response") else len(response.read().encode())
+
+
+_active: Transport | None = None
+
+# Sessions shared by every connection to the same server; see _SharedSession.
+_sessions: dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+class _SharedSession:
+    """Reuse one requests session per server across connection objects.
+
+    Once connection classes are injected, PyGithub builds a new connection
+    object for every request. Sharing the session keeps HTTP keep-alive and
+    makes closing one connection harmless to requests in flight on others.
+    """
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        super().__init__(host, port, strict, timeout, retry, pool_size, **kwargs)
+        key = (self.protocol, self.host, self.port, self.pool_size)
+        with _sessions_lock:
+            if key not in _sessions:
+                _sessions[key] = self.session
+            else:
+                self.session.close()
+            self.session = _sessions[key]
+
+    def getresponse(self):
+        if _active is None:
+            return super().getresponse()
+        return _active.send(self, super().getresponse)
+
+    def close(self) -> None:
+        pass
+
+
+class _HTTPConnection(_SharedSession, HTTPRequestsConnectionClass):
+    pass
+
+
+class _HTTPSConnection(_SharedSession, HTTPSRequestsConnectionClass):
+    pass
+
+
+def install(transport: Transport) -> None:
+    """Route every PyGithub request, on any client, through ``transport``."""
+    global _active
+    _active = transport
+    Requester.injectConnectionClasses(_HTTPConnection, _HTTPSConnection)
+
+
+def uninstall() -> None:
+    global _active
+    _active = None
+    Requester.resetConnectionClasses()
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import re
+import urllib.parse
+from collections.abc import Iterator
+
+from github import GithubException
+
+_TREE_START = re.compile(r'"tree"\s*:\s*\[')
+_TREE_SHA = re.compile(r'"sha"\s*:\s*"([0-9a-f]+)"')
+_TRUNCATED = re.compile(r'"truncated"\s*:\s*true')
+_SEPARATORS = " \t\r\n,"
+
+
+class TreeEntries:
+    """A recursive tree's entries, decoded one at a time from the raw JSON body.
+
+    Iterating yields ``(path, sha)`` for every entry without building the
+    whole document or a PyGithub object per entry, so of the decoded entries
+    only those a caller keeps stay in memory. The body itself is held whole.
+    :attr:`sha` is known once iteration has started and :attr:`truncated`
+    once it has finished. A malformed body raises ValueError.
+    """
+
+    def __init__(self, body: str):
+        self._body = body
+        self.sha = ""
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        body = self._body
+        start = _TREE_START.search(body)
+        if start is None:
+            raise ValueError("not a git tree")
+        head = _TREE_SHA.search(body, 0, start.start())
+        self.sha = head.group(1) if head else ""
+        decoder = json.JSONDecoder()
+        pos = start.end()
+        while True:
+            while pos < len(body) and body[pos] in _SEPARATORS:
+                pos += 1
+            if pos == len(body) or body[pos] == "]":
+                break
+            entry, pos = decoder.raw_decode(body, pos)
+            yield entry["path"], entry.get("sha", "")
+        self.truncated = bool(_TRUNCATED.search(body, pos))
+
+
+def fetch_tree(api_repo, ref: str) -> TreeEntries:
+    """Fetch ``api_repo``'s recursive tree at ``ref`` as :class:`TreeEntries`.
+
+    The response is not streamed: the body is read whole, as one string
+    (GitHub caps it at a few MB), and entries are decoded from that string
+    in place. Memory peaks at about the size of the body, rather than at
+    the several times that a parsed document takes.
+    """
+    # requestBlob is meant for uploads, but it is the one Requester call that
+    # returns the body undecoded while keeping our Accept header and going
+    # through the transport (and so the response cache). getStream would
+    # force an octet-stream Accept header.
+    status, headers, body = api_repo.requester.requestBlob(
+        "GET",
+        f"{api_repo.url}/git/trees/{urllib.parse.quote(ref, safe='')}",
+        parameters={"recursive": "1"},
+        headers={"Accept": "application/vnd.github+json"},
+    )
+    if status >= 400:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = body
+        raise GithubException(status, data, headers)
+    return TreeEntries(body)
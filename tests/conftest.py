@@ -0,0 +1,8 @@
+import pytest
+from github.Requester import Requester
+
+
+@pytest.fixture(autouse=True)
+def no_client_pacing(monkeypatch):
+    # PyGithub spaces requests 0.25 s apart; the local fake server needs no pacing.
+    monkeypatch.setattr(Requester, "_Requester__deferRequest", lambda self, verb: None)
@@ -0,0 +1,34 @@
+import copy
+
+from benchmarks.suite import compare, detect, run_suite
+from benchmarks.synthetic import synthetic_org
+
+
+class TestSyntheticOrg:
+    def test_deterministic(self):
+        first = list(synthetic_org(50, seed=3))
+        second = list(synthetic_org(50, seed=3))
+        assert [repo.paths for repo in first] == [repo.paths for repo in second]
+        assert [repo.paths for repo in first] != [repo.paths for repo in synthetic_org(50, seed=4)]
+
+    def test_tree_size_cap(self):
+        assert max(len(repo.paths) for repo in synthetic_org(500, max_tree_paths=100)) <= 100 + 30
+
+    def test_detectors_find_claude_usage(self):
+        features = detect(list(synthetic_org(1000)))
+        adopting = sum(repo.has_claude_dir for repo in features)
+        assert 100 < adopting < 300
+        assert any(repo.mcp_servers for repo in features)
+        assert any(repo.claude_action_refs for repo in features)
+
+
+class TestSuite:
+    def test_run_and_compare(self):
+        data = run_suite([20], max_tree_paths=200, monorepo_paths=1000, repeat=1)
+        stages = [(row["stage"], row["repos"]) for row in data["results"]]
+        assert stages == [("detectors", 20), ("aggregate", 20), ("render", 20), ("detectors (one tree)", 1)]
+        assert compare(data, data, 0.2) == []
+
+        slower = copy.deepcopy(data)
+        slower["results"][0]["seconds"] = data["results"][0]["seconds"] * 2 + 1
+        assert len(compare(data, slower, 0.2)) == 1
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from src.cache import BlobCache, blob_key
+
+
+def _cache(tmp_path, **kwargs) -> BlobCache:
+    return BlobCache(str(tmp_path / "cache" / "blobs.sqlite3"), **kwargs)
+
+
+class TestBlobCache:
+    def test_get_and_put(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.get("k") is None
+        cache.put("k", {"mcp_servers": ["github"]})
+        assert cache.get("k") == {"mcp_servers": ["github"]}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put("k", {"has_hooks": True})
+        cache.close()
+
+        reopened = _cache(tmp_path)
+        assert reopened.get("k") == {"has_hooks": True}
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=80)
+        cache.put("a", "x" * 30)
+        cache.put("b", "x" * 30)
+        cache.get("a")  # b is now the least recently used
+        cache.put("c", "x" * 30)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 30
+        assert cache.get("c") == "x" * 30
+        assert cache.evictions == 1
+
+    def test_claim_single_flights_misses(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.claim("k") == (None, None)  # owner
+
+        value, waiting = cache.claim("k")
+        assert value is None and waiting is not None
+
+        threading.Timer(0.01, cache.resolve, ("k", {"has_hooks": True})).start()
+        assert waiting.result(timeout=1) == {"has_hooks": True}
+        assert cache.claim("k") == ({"has_hooks": True}, None)
+
+    def test_release_wakes_waiters_without_storing(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.claim("k")
+        _, waiting = cache.claim("k")
+        cache.release("k")
+
+        with pytest.raises(LookupError):
+            waiting.result(timeout=1)
+        assert cache.get("k") is None
+        assert cache.claim("k") == (None, None)
+
+    def test_blob_key_includes_version(self):
+        assert blob_key("workflows", 1, "abc") != blob_key("workflows", 2, "abc")
+        assert blob_key("workflows", 1, "abc") != blob_key("mcp_json", 1, "abc")
@@ -0,0 +1,116 @@
+import pytest
+from github import Auth, Github, GithubException, InputGitAuthor
+
+from benchmarks.fake_github import FakeGitHub, synthetic_repos
+from src.committer import Committer, blob_sha
+
+ORG = "acme"
+AUTHOR = InputGitAuthor("bot", "bot@example.com")
+
+
+@pytest.fixture
+def server():
+    with FakeGitHub({ORG: synthetic_repos(ORG, 2, seed=1)}) as fake:
+        yield fake
+
+
+def _committer(server, attempts=5) -> Committer:
+    gh = Github(auth=Auth.Token("fake"), base_url=server.url, retry=None)
+    return Committer(gh.get_repo(f"{ORG}/repo-0"), "main", "Update stats", AUTHOR, attempts)
+
+
+class TestBlobSha:
+    def test_matches_git(self):
+        # `git hash-object` of an empty file and of "hello\n"
+        assert blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+        assert blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+class TestCommitter:
+    def test_files_in_one_commit(self, server):
+        repo = server.repos[f"{ORG}/repo-0"]
+        head = repo.head_sha
+
+        changed = _committer(server).commit({
+            "README.md": lambda current: current + b"stats\n",
+            "docs/a.md": b"a\n",
+            "docs/b.md": b"b\n",
+        })
+
+        assert changed == ["README.md", "docs/a.md", "docs/b.md"]
+        assert repo.written["README.md"].endswith(b"stats\n")
+        assert repo.written["docs/b.md"] == b"b\n"
+        assert repo.objects[repo.head_sha]["parents"] == [head]
+        assert (server.counts["create_blob"], server.counts["create_commit"], server.counts["update_ref"]) == (3, 1, 1)
+
+    def test_only_content_functions_download_files(self, server):
+        _committer(server).commit({"docs/a.md": b"a\n", "docs/b.md": b"b\n"})
+        tree_listings = server.counts["tree"]
+
+        _committer(server).commit({
+            "README.md": lambda current: current + b"stats\n",
+            "docs/a.md": b"a2\n",
+            "docs/b.md": b"b\n",
+        })
+        # One recursive listing for every file's SHA; one blob for the README.
+        assert server.counts["tree"] == tree_listings + 1
+        assert server.counts["blob"] == 1
+        assert server.counts["contents"] == 0
+
+    def test_unchanged_files_are_skipped(self, server):
+        committer = _committer(server)
+        committer.commit({"docs/a.md": b"a\n", "docs/b.md": b"b\n"})
+        head = server.repos[f"{ORG}/repo-0"].head_sha
+
+        assert committer.commit({"docs/a.md": b"a\n", "README.md": lambda current: current}) == []
+        assert server.repos[f"{ORG}/repo-0"].head_sha == head
+
+        assert committer.commit({"docs/a.md": b"a\n", "docs/b.md": b"b2\n"}) == ["docs/b.md"]
+        assert server.counts["create_blob"] == 3
+        assert server.counts["create_commit"] == 2
+
+    def test_deletes_files_that_exist(self, server):
+        repo = server.repos[f"{ORG}/repo-0"]
+        committer = _committer(server)
+        committer.commit({"docs/a.md": b"a\n", "docs/b.md": b"b\n"})
+
+        assert committer.commit({"docs/a.md": None, "docs/gone.md": None}) == ["docs/a.md"]
+        assert repo.content("docs/a.md") is None
+        assert repo.written["docs/b.md"] == b"b\n"
+        # Nothing left to delete: no commit.
+        assert committer.commit({"docs/a.md": None}) == []
+        assert server.counts["create_commit"] == 2
+
+    def test_retries_when_the_branch_moved(self, server):
+        repo = server.repos[f"{ORG}/repo-0"]
+        other = Github(auth=Auth.Token("fake"), base_url=server.url).get_repo(f"{ORG}/repo-0")
+        seen = []
+
+        def append(current):
+            seen.append(current)
+            if len(seen) == 1:
+                # Another run commits between this one's read and its ref update.
+                other.create_file("history.log", "Other run", b"other\n", branch="main")
+            return (current or b"") + b"ours\n"
+
+        assert _committer(server).commit({"history.log": append, "docs/a.md": b"a\n"}) == ["history.log", "docs/a.md"]
+
+        assert seen == [None, b"other\n"]
+        assert repo.written["history.log"] == b"other\nours\n"
+        assert server.counts["update_ref"] == 2
+        # The unchanged blob wasn't uploaded twice.
+        assert server.counts["create_blob"] == 3
+
+    def test_gives_up_after_attempts(self, server):
+        other = Github(auth=Auth.Token("fake"), base_url=server.url).get_repo(f"{ORG}/repo-0")
+        runs = []
+
+        def moving(current):
+            runs.append(current)
+            other.create_file(f"other-{len(runs)}.txt", "Other run", b"x", branch="main")
+            return b"ours\n"
+
+        with pytest.raises(GithubException) as raised:
+            _committer(server, attempts=2).commit({"docs/a.md": moving})
+        assert raised.value.status == 422
+        assert len(runs) == 2
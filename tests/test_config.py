@@ -6,6 +6,15 @@ from src.config import Config
 
 
 class TestConfigFromEnv:
+    def test_api_url_from_runner(self, monkeypatch):
+        monkeypatch.setenv("INPUT_GH_TOKEN", "test-token")
+        monkeypatch.setenv("INPUT_ORG_NAME", "test-org")
+        # Inputs with a default are always set, if only to "".
+        monkeypatch.setenv("INPUT_API_URL", "")
+        monkeypatch.setenv("GITHUB_API_URL", "https://ghe.example.com/api/v3")
+
+        assert Config.from_env().api_url == "https://ghe.example.com/api/v3"
+
     def test_from_env_required_fields(self, monkeypatch):
         monkeypatch.setenv("INPUT_GH_TOKEN", "test-token")
         monkeypatch.setenv("INPUT_ORG_NAME", "test-org")
@@ -15,9 +24,23 @@ class TestConfigFromEnv:
         assert config.gh_token == "test-token"
         assert config.org_name == "test-org"
 
+    def test_from_env_org_list(self, monkeypatch):
+        monkeypatch.setenv("INPUT_GH_TOKEN", "test-token")
+        monkeypatch.setenv("INPUT_ORG_NAME", "org-a, org-b\norg-c")
+
+        config = Config.from_env()
+
+        assert config.org_name == "org-a"
+        assert config.orgs() == ["org-a", "org-b", "org-c"]
+
+    def test_orgs_default_to_org_name(self):
+        assert Config(gh_token="t", org_name="solo").orgs() == ["solo"]
+        assert Config(gh_token="t", org_name="").orgs() == []
+
     def test_from_env_defaults(self, monkeypatch):
         monkeypatch.setenv("INPUT_GH_TOKEN", "test-token")
         monkeypatch.setenv("INPUT_ORG_NAME", "test-org")
+        monkeypatch.delenv("GITHUB_API_URL", raising=False)
 
         config = Config.from_env()
 
@@ -36,6 +59,40 @@ class TestConfigFromEnv:
         assert config.commit_message == "Update Claude Code adoption stats"
         assert config.committer_name == "github-actions[bot]"
         assert config.committer_email == "github-actions[bot]@users.noreply.github.com"
+        assert config.scan_concurrency == 1
+        assert config.content_fetch == "rest"
+        assert config.content_batch_size == 50
+        assert config.cache_dir == ""
+        assert config.blob_cache_max_mb == 64
+        assert config.http_cache_max_mb == 256
+        assert config.full_rescan is False
+        assert config.rate_limit_reserve == 50
+        assert config.gh_tokens == []
+        assert config.app_id == ""
+        assert config.app_private_key == ""
+        assert config.app_installation_ids == []
+        assert config.scan_mode == "tree"
+        assert config.probe_batch_size == 25
+        assert config.tree_ignore == []
+        assert config.tree_walk_max_dirs == 2000
+        assert config.shard == ""
+        assert config.shard_output == "claude-stats-partial.json"
+        assert config.merge_inputs == []
+        assert config.repo_listing == "rest"
+        assert config.history_path == ""
+        assert config.api_url == "https://api.github.com"
+        assert config.metrics_path == ""
+        assert config.metrics_prometheus_path == ""
+        assert config.step_summary is True
+        assert config.profile == []
+        assert config.profile_dir == "claude-stats-profile"
+        assert config.profile_sample_ms == 0
+        assert config.details_path == "claude-stats-details.md"
+        assert config.details_max_kb == 256
+        assert config.details_split == "file"
+        assert config.org_names == ["test-org"]
+        assert config.orgs() == ["test-org"]
+        assert config.enterprise == ""
 
     def test_from_env_custom_values(self, monkeypatch):
         monkeypatch.setenv("INPUT_GH_TOKEN", "custom-token")
@@ -55,6 +112,38 @@ class TestConfigFromEnv:
         monkeypatch.setenv("INPUT_COMMIT_MESSAGE", "Custom commit message")
         monkeypatch.setenv("INPUT_COMMITTER_NAME", "custom-bot")
         monkeypatch.setenv("INPUT_COMMITTER_EMAIL", "custom@example.com")
+        monkeypatch.setenv("INPUT_SCAN_CONCURRENCY", "8")
+        monkeypatch.setenv("INPUT_CONTENT_FETCH", "GraphQL")
+        monkeypatch.setenv("INPUT_CONTENT_BATCH_SIZE", "100")
+        monkeypatch.setenv("INPUT_CACHE_DIR", ".claude-stats-cache")
+        monkeypatch.setenv("INPUT_BLOB_CACHE_MAX_MB", "16")
+        monkeypatch.setenv("INPUT_HTTP_CACHE_MAX_MB", "32")
+        monkeypatch.setenv("INPUT_FULL_RESCAN", "true")
+        monkeypatch.setenv("INPUT_RATE_LIMIT_RESERVE", "200")
+        monkeypatch.setenv("INPUT_GH_TOKENS", "ghp_a, ghp_b\nghp_c\n")
+        monkeypatch.setenv("INPUT_APP_ID", "123")
+        monkeypatch.setenv("INPUT_APP_PRIVATE_KEY", "pem")
+        monkeypatch.setenv("INPUT_APP_INSTALLATION_IDS", "7, 8")
+        monkeypatch.setenv("INPUT_SCAN_MODE", "Probe")
+        monkeypatch.setenv("INPUT_PROBE_BATCH_SIZE", "10")
+        monkeypatch.setenv("INPUT_TREE_IGNORE", "generated, docs/*")
+        monkeypatch.setenv("INPUT_TREE_WALK_MAX_DIRS", "500")
+        monkeypatch.setenv("INPUT_SHARD", " 3/16 ")
+        monkeypatch.setenv("INPUT_SHARD_OUTPUT", "partials/shard-3.json")
+        monkeypatch.setenv("INPUT_MERGE_INPUTS", "partials/*.json\nextra.json")
+        monkeypatch.setenv("INPUT_REPO_LISTING", "GraphQL")
+        monkeypatch.setenv("INPUT_ENTERPRISE", "acme")
+        monkeypatch.setenv("INPUT_HISTORY_PATH", "stats/history.jsonl.gz")
+        monkeypatch.setenv("INPUT_API_URL", "http://127.0.0.1:8000/")
+        monkeypatch.setenv("INPUT_METRICS_PATH", "metrics/run.json")
+        monkeypatch.setenv("INPUT_METRICS_PROMETHEUS_PATH", "metrics/claude_org_stats.prom")
+        monkeypatch.setenv("INPUT_STEP_SUMMARY", "false")
+        monkeypatch.setenv("INPUT_PROFILE", "CPU, memory")
+        monkeypatch.setenv("INPUT_PROFILE_DIR", "profiles")
+        monkeypatch.setenv("INPUT_PROFILE_SAMPLE_MS", "10")
+        monkeypatch.setenv("INPUT_DETAILS_PATH", "stats/details.md")
+        monkeypatch.setenv("INPUT_DETAILS_MAX_KB", "64")
+        monkeypatch.setenv("INPUT_DETAILS_SPLIT", "Initial")
 
         config = Config.from_env()
 
@@ -75,6 +164,38 @@ class TestConfigFromEnv:
         assert config.commit_message == "Custom commit message"
         assert config.committer_name == "custom-bot"
         assert config.committer_email == "custom@example.com"
+        assert config.scan_concurrency == 8
+        assert config.content_fetch == "graphql"
+        assert config.content_batch_size == 100
+        assert config.cache_dir == ".claude-stats-cache"
+        assert config.blob_cache_max_mb == 16
+        assert config.http_cache_max_mb == 32
+        assert config.full_rescan is True
+        assert config.rate_limit_reserve == 200
+        assert config.gh_tokens == ["ghp_a", "ghp_b", "ghp_c"]
+        assert config.app_id == "123"
+        assert config.app_private_key == "pem"
+        assert config.app_installation_ids == ["7", "8"]
+        assert config.scan_mode == "probe"
+        assert config.probe_batch_size == 10
+        assert config.tree_ignore == ["generated", "docs/*"]
+        assert config.tree_walk_max_dirs == 500
+        assert config.shard == "3/16"
+        assert config.shard_output == "partials/shard-3.json"
+        assert config.merge_inputs == ["partials/*.json", "extra.json"]
+        assert config.repo_listing == "graphql"
+        assert config.enterprise == "acme"
+        assert config.history_path == "stats/history.jsonl.gz"
+        assert config.api_url == "http://127.0.0.1:8000"
+        assert config.metrics_path == "metrics/run.json"
+        assert config.metrics_prometheus_path == "metrics/claude_org_stats.prom"
+        assert config.step_summary is False
+        assert config.profile == ["cpu", "memory"]
+        assert config.profile_dir == "profiles"
+        assert config.profile_sample_ms == 10
+        assert config.details_path == "stats/details.md"
+        assert config.details_max_kb == 64
+        assert config.details_split == "initial"
 
     def test_from_env_fallback_to_non_input_prefix(self, monkeypatch):
         """Test that env vars without INPUT_ prefix are used as fallback."""
@@ -161,3 +282,28 @@ class TestConfigFromEnv:
         assert config.max_items == 20
         assert isinstance(config.bar_length, int)
         assert isinstance(config.max_items, int)
+
+    def test_from_env_scan_concurrency_at_least_one(self, monkeypatch):
+        monkeypatch.setenv("INPUT_GH_TOKEN", "token")
+        monkeypatch.setenv("INPUT_ORG_NAME", "org")
+        monkeypatch.setenv("INPUT_SCAN_CONCURRENCY", "0")
+
+        config = Config.from_env()
+
+        assert config.scan_concurrency == 1
+
+    @pytest.mark.parametrize("name", ["SCAN_MODE", "CONTENT_FETCH", "REPO_LISTING", "DETAILS_SPLIT"])
+    def test_from_env_rejects_unknown_choices(self, monkeypatch, name):
+        monkeypatch.setenv("INPUT_GH_TOKEN", "token")
+        monkeypatch.setenv("INPUT_ORG_NAME", "org")
+        monkeypatch.setenv(f"INPUT_{name}", "sideways")
+
+        with pytest.raises(ValueError, match=name):
+            Config.from_env()
+
+    def test_from_env_choices_ignore_case_and_whitespace(self, monkeypatch):
+        monkeypatch.setenv("INPUT_GH_TOKEN", "token")
+        monkeypatch.setenv("INPUT_ORG_NAME", "org")
+        monkeypatch.setenv("INPUT_SCAN_MODE", " Probe ")
+
+        assert Config.from_env().scan_mode == "probe"
@@ -2,11 +2,20 @@ import json
 from pathlib import Path
 
 from src.detectors import (
+    DETECTORS,
+    Detector,
+    DetectorRegistry,
+    PathRule,
+    apply_parsed,
+    classify_paths,
     detect_agents,
     detect_claude_dir,
     detect_claude_md,
     detect_custom_commands,
     detect_memory,
+    is_detector_path,
+    is_pruned_dir,
+    parse_content,
     parse_mcp_json_content,
     parse_settings_json_content,
     parse_workflow_content,
@@ -115,6 +124,94 @@ class TestPathsNeedingContent:
         assert needed == {"mcp_json": [], "settings_json": [], "workflows": []}
 
 
+def _per_detector(tree_paths: set[str]) -> tuple[RepoFeatures, dict[str, list[str]]]:
+    features = RepoFeatures(name="repo")
+    detect_claude_md(tree_paths, features)
+    detect_claude_dir(tree_paths, features)
+    detect_custom_commands(tree_paths, features)
+    detect_memory(tree_paths, features)
+    detect_agents(tree_paths, features)
+    return features, paths_needing_content(tree_paths)
+
+
+def _single_pass(tree_paths: set[str]) -> tuple[RepoFeatures, dict[str, list[str]]]:
+    features = RepoFeatures(name="repo")
+    return features, classify_paths(tree_paths, features)
+
+
+class TestClassifyPaths:
+    TRICKY = frozenset({
+        ".claude",
+        ".claude/commands",
+        ".claude/commands/review.md",
+        ".claude/commands/ops/deploy.md",
+        ".claude/commands/.hidden",
+        ".claude/commands/archive.tar.gz",
+        ".claude/commands/trailing.",
+        ".claude/skills/triage",
+        ".claude/skills/triage/SKILL.md",
+        ".claude/agents/reviewer.md",
+        ".claude/settings.json",
+        ".claudeignore",
+        "docs/.claude/settings.json",
+        "pkg/CLAUDE.md",
+        "CLAUDE.md.bak",
+        "a/b/MEMORY.md",
+        "x/.mcp.json",
+        ".github/workflows/ci.yml",
+        ".github/workflows/nested/deploy.yaml",
+        ".github/workflows/README.md",
+        ".github/dependabot.yml",
+    })
+
+    def test_matches_per_detector_functions(self):
+        assert _single_pass(self.TRICKY) == _per_detector(self.TRICKY)
+
+    def test_matches_on_fixture_tree(self):
+        tree_paths = _tree_paths_from_fixture()
+        assert _single_pass(tree_paths) == _per_detector(tree_paths)
+
+    def test_empty_tree(self):
+        features, needed = _single_pass(set())
+        assert features == RepoFeatures(name="repo")
+        assert needed == {"mcp_json": [], "settings_json": [], "workflows": []}
+
+    def test_classify_entries_keeps_shas_of_content_paths(self):
+        features = RepoFeatures(name="repo")
+        entries = [("src/a.py", "1"), (".mcp.json", "2"), (".claude/commands/x.md", "3"), (".github/workflows/c.yml", "4")]
+        needed, shas = DETECTORS.classify_entries(entries, features)
+        assert needed == {"mcp_json": [".mcp.json"], "settings_json": [], "workflows": [".github/workflows/c.yml"]}
+        assert shas == {".mcp.json": "2", ".github/workflows/c.yml": "4"}
+        assert features.custom_commands == ["x"]
+
+    def test_custom_registry(self):
+        seen = []
+        registry = DetectorRegistry([
+            Detector("docs", (PathRule(prefix="docs/api/", suffixes=(".md",)),), lambda p, f: seen.append(p)),
+            Detector("lockfiles", (PathRule(basename="uv.lock"), PathRule(path="poetry.lock"))),
+        ])
+        needed = registry.classify(["docs/api/x.md", "docs/api/x.txt", "docs/y.md", "a/uv.lock", "poetry.lock"], None)
+        assert seen == ["docs/api/x.md"]
+        assert needed == {"lockfiles": ["a/uv.lock", "poetry.lock"]}
+
+
+class TestTreeWalkFilters:
+    def test_detector_paths(self):
+        assert is_detector_path("services/api/CLAUDE.md")
+        assert is_detector_path(".claude/skills/triage")
+        assert is_detector_path(".github/workflows/ci.yaml")
+        assert not is_detector_path(".github/dependabot.yml")
+        assert not is_detector_path("src/main.py")
+
+    def test_pruned_dirs(self):
+        assert is_pruned_dir("web/node_modules")
+        assert is_pruned_dir("generated/deep", ("generated/*",))
+        assert is_pruned_dir("build", ("build",))
+        assert not is_pruned_dir("services/api", ("build",))
+        assert not is_pruned_dir(".claude/skills", ("*",))
+        assert not is_pruned_dir(".github", ("*",))
+
+
 class TestContentParsers:
     def test_parse_mcp_json(self):
         content = (FIXTURES / "sample_mcp.json").read_text()
@@ -300,3 +397,72 @@ jobs:
         parse_workflow_content(content, features)
         assert features.has_claude_actions is True
         assert "claude-code (ref)" in features.claude_action_names
+
+    def test_parse_workflow_extracts_pinned_refs(self):
+        content = b"""
+jobs:
+  review:
+    steps:
+      - uses: actions/checkout@v4
+      - uses: anthropics/claude-code-action@v1
+      - name: Base
+        uses: "Anthropics/Claude-Code-Base-Action@0123456789abcdef0123456789abcdef01234567"  # pinned
+      - uses: anthropics/claude-code-action/subaction@beta
+"""
+        features = RepoFeatures(name="test")
+        parse_workflow_content(content, features)
+        assert features.claude_action_refs == [
+            "claude-code-action@v1",
+            "claude-code-base-action@0123456789abcdef0123456789abcdef01234567",
+            "claude-code-action@beta",
+        ]
+        assert features.claude_action_names == ["claude-code-action", "claude-code-base-action", "claude-code (ref)"]
+
+    def test_parse_workflow_bytes_and_text_agree(self):
+        content = "name: Claude ✨\n# anthropics/claude-code-action without a ref\nsteps:\n  - uses: anthropics/claude-code-action@v1\n"
+        from_text = RepoFeatures(name="text")
+        from_bytes = RepoFeatures(name="bytes")
+        parse_workflow_content(content, from_text)
+        parse_workflow_content(content.encode(), from_bytes)
+        assert from_text.claude_action_refs == from_bytes.claude_action_refs == ["claude-code-action@v1"]
+        assert from_text.claude_action_names == from_bytes.claude_action_names
+
+    def test_parse_workflow_mention_without_uses_has_no_ref(self):
+        features = RepoFeatures(name="test")
+        parse_workflow_content(b"# see anthropics/claude-code-action@v1 docs", features)
+        assert features.claude_action_names == ["claude-code-action", "claude-code (ref)"]
+        assert features.claude_action_refs == []
+
+    def test_parse_json_accepts_bytes(self):
+        features = RepoFeatures(name="test")
+        parse_mcp_json_content(b'{"mcpServers": {"github": {}}}', features)
+        parse_settings_json_content(b"\xff not utf-8", features)
+        assert features.mcp_servers == ["github"]
+
+
+class TestParsedResults:
+    def test_parse_content_returns_only_found_fields(self):
+        content = (FIXTURES / "sample_settings.json").read_text()
+        parsed = parse_content("settings_json", content)
+        assert parsed == {
+            "has_hooks": True,
+            "mcp_servers": ["postgres"],
+            "hook_types": ["PreToolUse", "PostToolUse"],
+        }
+
+    def test_parse_content_nothing_found(self):
+        assert parse_content("workflows", "on: push") == {}
+
+    def test_apply_parsed_matches_direct_parsing(self):
+        mcp = (FIXTURES / "sample_mcp.json").read_text()
+        settings = (FIXTURES / "sample_settings.json").read_text()
+
+        direct = RepoFeatures(name="test")
+        parse_mcp_json_content(mcp, direct)
+        parse_settings_json_content(settings, direct)
+
+        applied = RepoFeatures(name="test")
+        apply_parsed(parse_content("mcp_json", mcp), applied)
+        apply_parsed(parse_content("settings_json", settings), applied)
+
+        assert applied == direct
@@ -0,0 +1,136 @@
+import pytest
+from github import Auth, Github
+
+from benchmarks import fake_github
+from benchmarks.fake_github import FakeGitHub, Faults, synthetic_repos
+from benchmarks.suite import detect
+from benchmarks.synthetic import SyntheticRepo
+from src import transport
+from src.config import Config
+from src.main import update_readme
+from src.scanner import scan_organization
+from src.transport import ResponseCache, Transport
+
+ORG = "acme"
+
+
+@pytest.fixture(autouse=True)
+def uninstall_transport():
+    yield
+    transport.uninstall()
+
+
+def _serve(faults: Faults | None = None, repos: int = 40) -> FakeGitHub:
+    return FakeGitHub({ORG: synthetic_repos(ORG, repos, seed=1)}, faults)
+
+
+def _config(server: FakeGitHub, **overrides) -> Config:
+    return Config(gh_token="fake", org_name=ORG, api_url=server.url, show_sections=["details"], **overrides)
+
+
+def _features(repos) -> dict[str, dict]:
+    """Each repo's detected features, ignoring list order and the date-dependent flags."""
+    result = {}
+    for features in repos:
+        data = features.to_dict()
+        result[data.pop("name")] = {
+            key: sorted(value) if isinstance(value, list) else value
+            for key, value in data.items()
+            if key not in ("is_stale", "is_new")
+        }
+    return result
+
+
+def _expected(server: FakeGitHub) -> dict[str, dict]:
+    listed = [repo for repo in server.orgs[ORG] if not repo.archived and not repo.fork]
+    return _features(detect([SyntheticRepo(repo.name, repo.paths, repo.contents) for repo in listed]))
+
+
+class TestScanAgainstFakeServer:
+    @pytest.mark.parametrize("options", [
+        {},
+        {"repo_listing": "graphql", "content_fetch": "graphql"},
+        {"scan_mode": "probe"},
+        {"repo_listing": "graphql", "scan_concurrency": 4},
+    ])
+    def test_scan_matches_synthetic_org(self, options):
+        with _serve() as server:
+            stats = scan_organization(_config(server, **options))
+            assert _features(stats.repos) == _expected(server)
+            assert server.counts["unknown"] == 0
+
+    def test_truncated_trees_are_walked(self, monkeypatch):
+        monkeypatch.setattr(fake_github, "TREE_LIMIT", 20)
+        with _serve(repos=8) as server:
+            stats = scan_organization(_config(server))
+            assert _features(stats.repos) == _expected(server)
+
+    def test_injected_faults_are_retried(self):
+        with _serve(Faults(error_rate=0.1, secondary_rate=0.1, retry_after=0, seed=3)) as server:
+            stats = scan_organization(_config(server, repo_listing="graphql"))
+            assert _features(stats.repos) == _expected(server)
+            assert server.counts["error"] and server.counts["secondary"]
+
+    def test_second_run_served_from_etags(self, tmp_path):
+        with _serve() as server:
+            transport.install(Transport(ResponseCache(str(tmp_path / "http"))))
+            first = scan_organization(_config(server))
+            assert server.counts["304"] == 0
+            before = server.counts.copy()
+            second = scan_organization(_config(server))
+            assert _features(second.repos) == _features(first.repos)
+            # Every GET of the second run is answered 304.
+            run = server.counts - before
+            assert run["304"] == run["org_repos"] + run["tree"] + run["contents"] > 0
+
+
+class TestFakeServerRest:
+    def test_rate_limit_headers(self):
+        with _serve() as server:
+            gh = Github(auth=Auth.Token("fake"), base_url=server.url)
+            assert gh.get_repo(f"{ORG}/repo-0").name == "repo-0"
+            core = gh.get_rate_limit().resources.core
+            assert (core.limit, core.remaining) == (5000, 4999)
+
+    def test_readme_update(self):
+        with _serve() as server:
+            config = _config(server, repository=f"{ORG}/repo-0")
+            update_readme(config, "stats go here")
+            written = server.repos[f"{ORG}/repo-0"].written["README.md"].decode()
+            assert "<!--START_SECTION:claude-stats-->\nstats go here\n<!--END_SECTION:claude-stats-->" in written
+
+    def test_readme_update_commits_files_and_history_together(self):
+        def record(run):
+            # The record, with the history it was built on.
+            return lambda current: f"[{run} after {current.decode() or '-'}]".encode()
+
+        with _serve() as server:
+            config = _config(server, repository=f"{ORG}/repo-0", history_path="stats/history.jsonl.gz")
+            update_readme(config, "stats", {"stats/details-a.md": "# A\n"}, record(1))
+            update_readme(config, "stats", {"stats/details-a.md": "# A\n"}, record(2))
+
+            written = server.repos[f"{ORG}/repo-0"].written
+            assert written["stats/details-a.md"] == b"# A\n"
+            assert written["stats/history.jsonl.gz"] == b"[1 after -][2 after [1 after -]]"
+            # Two runs, two commits: the second only appended to the history.
+            assert (server.counts["create_commit"], server.counts["update_ref"]) == (2, 2)
+            assert server.counts["create_blob"] == 4
+            assert server.counts["put_contents"] == server.counts["contents"] == 0
+
+    def test_readme_update_deletes_detail_pages_no_longer_written(self):
+        with _serve() as server:
+            config = _config(server, repository=f"{ORG}/repo-0", details_path="stats/details.md")
+            update_readme(config, "stats", {"stats/details-a.md": "# A\n", "stats/details-b.md": "# B\n"})
+            # Repos starting with "b" are gone.
+            update_readme(config, "stats", {"stats/details-a.md": "# A\n"})
+            repo = server.repos[f"{ORG}/repo-0"]
+            assert repo.content("stats/details-b.md") is None
+            assert repo.content("stats/details-a.md") == b"# A\n"
+
+            # Back to one page: the letter pages go, in the same commit.
+            update_readme(config, "stats", {"stats/details.md": "# All\n"})
+            assert repo.content("stats/details-a.md") is None
+            assert repo.content("stats/details.md") == b"# All\n"
+            assert (server.counts["create_commit"], server.counts["update_ref"]) == (3, 3)
+            # Files outside the details pages are never deleted.
+            assert repo.content("README.md") is not None
@@ -0,0 +1,130 @@
+import json
+import re
+
+from github import GithubException
+
+from src.fetcher import ContentFetcher, build_blob_query
+
+FILES = {
+    "org/repo-a": {".mcp.json": '{"mcpServers": {}}', "logo.png": None},
+    "org/repo-b": {".github/workflows/ci.yml": "on: push"},
+}
+
+_REPO_RE = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{(.*?)\n  \}', re.DOTALL)
+_FILE_RE = re.compile(r'(f\d+): object\(expression: "HEAD:([^"]+)"\)')
+
+
+class FakeRequester:
+    """Answers blob queries from FILES; rejects queries above ``limit`` files."""
+
+    def __init__(self, limit: int = 1000, cost: int = 1, broken: set[str] = frozenset(), files: dict = FILES):
+        self.files = files
+        self.limit = limit
+        self.cost = cost
+        self.broken = broken
+        self.sizes: list[int] = []
+
+    def graphql_query(self, query, variables):
+        files = _FILE_RE.findall(query)
+        self.sizes.append(len(files))
+        if len(files) > self.limit:
+            raise GithubException(502, {"message": "timeout"}, None)
+        data = {"rateLimit": {"cost": self.cost, "remaining": 4000}}
+        for alias, owner, name, body in _REPO_RE.findall(query):
+            full_name = f"{owner}/{name}"
+            if full_name in self.broken:
+                raise GithubException(400, {"errors": [{"type": "FORBIDDEN"}]}, None)
+            repo = self.files.get(full_name, {})
+            data[alias] = {}
+            for file_alias, path in _FILE_RE.findall(body):
+                if path not in repo:
+                    data[alias][file_alias] = None
+                elif repo[path] is None:
+                    data[alias][file_alias] = {"text": None, "isBinary": True, "isTruncated": False}
+                else:
+                    data[alias][file_alias] = {"text": repo[path], "isBinary": False, "isTruncated": False}
+        return {}, {"data": data}
+
+
+def _rest(calls):
+    def fetch(full_name, path):
+        calls.append((full_name, path))
+        return f"rest:{path}"
+    return fetch
+
+
+class TestBuildBlobQuery:
+    def test_groups_paths_by_repo(self):
+        query, aliases = build_blob_query([
+            ("org/repo-a", ".mcp.json"),
+            ("org/repo-b", "ci.yml"),
+            ("org/repo-a", '.github/workflows/"q".yml'),
+        ])
+        assert aliases == [("r0", "f0"), ("r1", "f0"), ("r0", "f1")]
+        assert query.count("repository(") == 2
+        assert json.dumps('HEAD:.github/workflows/"q".yml') in query
+        assert "rateLimit { cost remaining }" in query
+
+
+class TestContentFetcher:
+    def test_fetches_in_request_order(self):
+        calls = []
+        fetcher = ContentFetcher(lambda: FakeRequester(), _rest(calls))
+        result = fetcher.fetch([
+            ("org/repo-b", ".github/workflows/ci.yml"),
+            ("org/repo-a", ".mcp.json"),
+            ("org/repo-a", "missing.json"),
+        ])
+        assert result == ["on: push", '{"mcpServers": {}}', None]
+        assert fetcher.queries == 1
+        assert calls == []
+
+    def test_binary_blob_falls_back_to_rest(self):
+        calls = []
+        fetcher = ContentFetcher(lambda: FakeRequester(), _rest(calls))
+        assert fetcher.fetch([("org/repo-a", "logo.png")]) == ["rest:logo.png"]
+        assert calls == [("org/repo-a", "logo.png")]
+
+    def test_shrinks_batch_on_limit_errors(self):
+        requester = FakeRequester(limit=3)
+        fetcher = ContentFetcher(lambda: requester, _rest([]), batch_size=8)
+        result = fetcher.fetch([("org/repo-a", ".mcp.json")] * 10)
+        assert result == ['{"mcpServers": {}}'] * 10
+        assert fetcher.batch_size <= 3
+        assert max(requester.sizes[-2:]) <= 3
+
+    def test_grows_batch_after_success(self):
+        fetcher = ContentFetcher(lambda: FakeRequester(), _rest([]), batch_size=2, step=2)
+        fetcher.fetch([("org/repo-a", ".mcp.json")] * 6)
+        assert fetcher.batch_size > 2
+
+    def test_shrinks_batch_when_cost_too_high(self):
+        fetcher = ContentFetcher(lambda: FakeRequester(cost=4), _rest([]), batch_size=8)
+        fetcher.fetch([("org/repo-a", ".mcp.json")] * 8)
+        assert fetcher.batch_size == 2
+
+    def test_failing_repo_isolated_and_fetched_over_rest(self):
+        calls = []
+        requester = FakeRequester(broken={"org/gone"})
+        fetcher = ContentFetcher(lambda: requester, _rest(calls), batch_size=4)
+        result = fetcher.fetch([
+            ("org/repo-a", ".mcp.json"),
+            ("org/gone", ".mcp.json"),
+            ("org/repo-b", ".github/workflows/ci.yml"),
+        ])
+        assert result == ['{"mcpServers": {}}', "rest:.mcp.json", "on: push"]
+        assert calls == [("org/gone", ".mcp.json")]
+        # Not a size problem: later batches keep their size.
+        assert fetcher.batch_size >= 4
+
+    def test_batches_never_span_owners(self):
+        requester = FakeRequester()
+        fetcher = ContentFetcher(lambda: requester, _rest([]), batch_size=10)
+        result = fetcher.fetch([
+            ("org/repo-a", ".mcp.json"),
+            ("org/repo-b", ".github/workflows/ci.yml"),
+            ("other/repo", ".mcp.json"),
+            ("org/repo-a", ".mcp.json"),
+        ])
+        assert result == ['{"mcpServers": {}}', "on: push", None, '{"mcpServers": {}}']
+        assert requester.sizes == [2, 1, 1]
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from src.files import atomic_write
+
+
+class TestAtomicWrite:
+    def test_creates_directories_and_replaces(self, tmp_path):
+        path = tmp_path / "nested" / "out.json"
+        with atomic_write(str(path)) as f:
+            f.write("one")
+        with atomic_write(str(path)) as f:
+            f.write("two")
+        assert path.read_text(encoding="utf-8") == "two"
+        assert os.listdir(tmp_path / "nested") == ["out.json"]
+
+    def test_binary_mode(self, tmp_path):
+        path = tmp_path / "out.bin"
+        with atomic_write(str(path), "wb") as f:
+            f.write(b"\x00\xff")
+        assert path.read_bytes() == b"\x00\xff"
+
+    def test_failed_write_keeps_the_old_file(self, tmp_path):
+        path = tmp_path / "state.json"
+        with atomic_write(str(path)) as f:
+            f.write("old")
+        with pytest.raises(RuntimeError):
+            with atomic_write(str(path)) as f:
+                f.write("half")
+                raise RuntimeError("killed")
+        assert path.read_text(encoding="utf-8") == "old"
+        assert os.listdir(tmp_path) == ["state.json"]
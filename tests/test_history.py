@@ -0,0 +1,98 @@
+import datetime
+import gzip
+import json
+
+import pytest
+
+from src.history import HISTORY_FIELDS, HISTORY_VERSION, History
+from src.models import OrgStats, RepoFeatures
+
+DAY = datetime.timedelta(days=1)
+START = datetime.datetime(2026, 1, 5, tzinfo=datetime.timezone.utc)  # a Monday
+
+
+def _stats(*repos: RepoFeatures) -> OrgStats:
+    return OrgStats.aggregate("test-org", list(repos))
+
+
+def _records(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in gzip.decompress(data).splitlines()]
+
+
+class TestHistoryRecord:
+    def test_round_trip(self):
+        history = History()
+        data = history.record(_stats(
+            RepoFeatures(name="a", has_claude_md=True, mcp_servers=["github"]),
+            RepoFeatures(name="b"),
+        ), START)
+        loaded = History.load(data)
+        assert len(loaded.snapshots) == 1
+        snapshot = loaded.snapshots[0]
+        assert snapshot.date == START
+        assert snapshot.counts["repos"] == 2
+        assert snapshot.counts["adopting"] == 1
+        assert snapshot.counts["has_claude_md"] == 1
+        assert snapshot.counters["mcp_servers"] == {"github": 1}
+        bit = 1 << HISTORY_FIELDS.index("has_claude_md") | 1 << HISTORY_FIELDS.index("mcp_servers")
+        assert loaded.repos == {"a": bit, "b": 0} == history.repos
+
+    def test_deltas_hold_only_changed_and_gone_repos(self):
+        history = History()
+        first = history.record(_stats(
+            RepoFeatures(name="a", has_claude_md=True),
+            RepoFeatures(name="b"),
+            RepoFeatures(name="c", has_hooks=True),
+        ), START)
+        second = history.record(_stats(
+            RepoFeatures(name="a", has_claude_md=True),
+            RepoFeatures(name="b", has_agents=True),
+            RepoFeatures(name="d"),
+        ), START + DAY)
+        record = _records(second)[0]
+        assert record["v"] == HISTORY_VERSION
+        assert record["repos"] == {"b": 1 << HISTORY_FIELDS.index("has_agents"), "d": 0}
+        assert record["gone"] == ["c"]
+
+        # Appended members read back as one file.
+        loaded = History.load(first + second)
+        assert [s.date for s in loaded.snapshots] == [START, START + DAY]
+        assert loaded.repos == history.repos
+        assert set(loaded.repos) == {"a", "b", "d"}
+
+    def test_empty_file(self):
+        history = History.load(b"")
+        assert history.snapshots == [] and history.repos == {}
+
+    def test_unknown_version_rejected(self):
+        data = gzip.compress(json.dumps({"v": HISTORY_VERSION + 1}).encode() + b"\n")
+        with pytest.raises(ValueError):
+            History.load(data)
+
+
+class TestHistoryQueries:
+    def _history(self, days: int) -> History:
+        history = History()
+        for day in range(days):
+            history.record(_stats(*(RepoFeatures(name=f"r{i}", has_claude_md=True) for i in range(day + 1))), START + day * DAY)
+        return history
+
+    def test_before(self):
+        history = self._history(10)
+        assert history.before(START - DAY) is None
+        assert history.before(START + 3 * DAY + datetime.timedelta(hours=1)).counts["repos"] == 4
+        assert history.before(START + 30 * DAY).counts["repos"] == 10
+
+    def test_weekly_takes_last_snapshot_per_week(self):
+        history = self._history(21)
+        assert history.weekly("repos") == [7, 14, 21]
+        assert history.weekly("has_claude_md", weeks=2) == [14, 21]
+        assert history.weekly("agent_names") == [0, 0, 0]
+
+    def test_weekly_repeats_weeks_without_snapshots(self):
+        history = History()
+        for day, count in [(0, 1), (7, 2), (28, 5)]:
+            history.record(_stats(*(RepoFeatures(name=f"r{i}") for i in range(count))), START + day * DAY)
+        assert history.weekly("repos") == [1, 2, 2, 2, 5]
+        assert history.weekly("repos", weeks=3) == [2, 2, 5]
+        assert History().weekly("repos") == []
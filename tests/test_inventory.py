@@ -0,0 +1,107 @@
+import datetime
+
+import pytest
+from github import GithubException
+
+from src.inventory import INVENTORY_QUERY, RepoInfo, fetch_enterprise_orgs, fetch_inventory, parse_repo_node
+
+
+def _node(name, **overrides):
+    node = {
+        "id": f"R_{name}",
+        "name": name,
+        "nameWithOwner": f"org/{name}",
+        "isArchived": False,
+        "isFork": False,
+        "pushedAt": "2024-05-01T12:00:00Z",
+        "createdAt": "2020-01-01T00:00:00Z",
+        "visibility": "INTERNAL",
+        "diskUsage": 2048,
+        "primaryLanguage": {"name": "Go"},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "infra"}}, {"topic": {"name": "claude"}}]},
+        "defaultBranchRef": {"name": "trunk", "target": {"oid": "abc", "tree": {"oid": "def"}}},
+    }
+    node.update(overrides)
+    return node
+
+
+class PagedRequester:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def graphql_query(self, query, variables):
+        self.calls.append(variables)
+        index = int(variables["after"] or 0)
+        nodes, has_next = self.pages[index]
+        page = {"hasNextPage": has_next, "endCursor": str(index + 1)}
+        return {}, {"data": {"organization": {"repositories": {"pageInfo": page, "nodes": nodes}}}}
+
+
+class TestParseRepoNode:
+    def test_pygithub_attribute_names(self):
+        repo = parse_repo_node(_node("svc"))
+        assert repo == RepoInfo(
+            name="svc",
+            full_name="org/svc",
+            node_id="R_svc",
+            pushed_at=datetime.datetime(2024, 5, 1, 12, tzinfo=datetime.timezone.utc),
+            created_at=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+            default_branch="trunk",
+            language="Go",
+            visibility="internal",
+            disk_usage=2048,
+            topics=["infra", "claude"],
+            head_sha="abc",
+            tree_sha="def",
+        )
+
+    def test_empty_repo(self):
+        repo = parse_repo_node(_node("empty", defaultBranchRef=None, primaryLanguage=None, pushedAt=None))
+        assert repo.head_sha == repo.tree_sha == repo.default_branch == ""
+        assert repo.language is None
+        assert repo.pushed_at is None
+
+
+class TestFetchInventory:
+    def test_pages_through_cursor(self):
+        requester = PagedRequester([([_node("a"), _node("b")], True), ([None, _node("c")], False)])
+        repos = list(fetch_inventory(requester, "org", page_size=2))
+
+        assert [repo.name for repo in repos] == ["a", "b", "c"]
+        assert requester.calls == [
+            {"login": "org", "first": 2, "after": None},
+            {"login": "org", "first": 2, "after": "1"},
+        ]
+
+    def test_query_reads_listing_fields(self):
+        for field in ("pushedAt", "createdAt", "isArchived", "isFork", "diskUsage", "repositoryTopics", "tree { oid }"):
+            assert field in INVENTORY_QUERY
+
+    def test_missing_organization(self):
+        class Missing:
+            def graphql_query(self, query, variables):
+                return {}, {"data": {"organization": None}}
+
+        with pytest.raises(GithubException):
+            list(fetch_inventory(Missing(), "nope"))
+
+
+class TestFetchEnterpriseOrgs:
+    def test_pages_through_cursor(self):
+        class Requester:
+            def graphql_query(self, query, variables):
+                index = int(variables["after"] or 0)
+                nodes = [[{"login": "a"}, {"login": "b"}], [{"login": "c"}]][index]
+                page = {"hasNextPage": index == 0, "endCursor": str(index + 1)}
+                return {}, {"data": {"enterprise": {"organizations": {"pageInfo": page, "nodes": nodes}}}}
+
+        assert fetch_enterprise_orgs(Requester(), "acme") == ["a", "b", "c"]
+
+    def test_missing_enterprise(self):
+        class Missing:
+            def graphql_query(self, query, variables):
+                return {}, {"data": {"enterprise": None}}
+
+        with pytest.raises(GithubException):
+            fetch_enterprise_orgs(Missing(), "nope")
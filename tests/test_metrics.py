@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from src.metrics import PHASES, Metrics, endpoint_for, quantile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEndpointFor:
+    @pytest.mark.parametrize(
+        ("verb", "url", "endpoint"),
+        [
+            ("GET", "/repos/org/repo", "GET /repos/{owner}/{repo}"),
+            ("GET", "/repos/org/repo/git/trees/abc123?recursive=1", "GET /repos/{owner}/{repo}/git/trees/{sha}"),
+            ("GET", "/repos/org/repo/git/blobs/abc123", "GET /repos/{owner}/{repo}/git/blobs/{sha}"),
+            ("GET", "/repos/org/repo/git/ref/heads/main", "GET /repos/{owner}/{repo}/git/ref/{ref}"),
+            ("PATCH", "/repos/org/repo/git/refs/heads/main", "PATCH /repos/{owner}/{repo}/git/refs/{ref}"),
+            ("POST", "/repos/org/repo/git/commits", "POST /repos/{owner}/{repo}/git/commits"),
+            ("PUT", "/repos/org/repo/contents/docs/README.md", "PUT /repos/{owner}/{repo}/contents/{path}"),
+            ("GET", "/orgs/org/repos?per_page=100&page=2", "GET /orgs/{org}/repos"),
+            ("POST", "/graphql", "POST /graphql"),
+            ("GET", "/api/v3/repos/org/repo", "GET /api/v3/repos/{owner}/{repo}"),
+        ],
+    )
+    def test_templates(self, verb, url, endpoint):
+        assert endpoint_for(verb, url) == endpoint
+
+
+class TestMetrics:
+    def test_quantile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert quantile(values, 0.5) == 50.0
+        assert quantile(values, 0.99) == 99.0
+        assert quantile([], 0.9) == 0.0
+
+    def test_requests_by_endpoint(self):
+        metrics = Metrics()
+        metrics.record_request("GET /graphql", 200, 0.1, 500)
+        metrics.record_request("GET /graphql", 502, 0.3, 20)
+        metrics.record_request("GET /orgs/{org}", 200, 0.2, 0, cached=True)
+
+        api = metrics.to_dict()["api"]
+        assert (api["requests"], api["errors"], api["not_modified"], api["bytes"]) == (3, 1, 1, 520)
+        graphql = api["endpoints"]["GET /graphql"]
+        assert graphql["latency_seconds"]["p50"] == 0.1
+        assert graphql["latency_seconds"]["max"] == 0.3
+
+    def test_phases_and_timed_iterables(self):
+        clock = FakeClock()
+        metrics = Metrics(clock)
+
+        def listing():
+            for page in range(3):
+                clock.now += 2
+                yield page
+
+        for _ in metrics.timed("listing", listing()):
+            clock.now += 10  # the consumer's time is not the listing's
+        with metrics.phase("render"):
+            clock.now += 1
+
+        assert metrics.phases["listing"] == 6
+        assert metrics.phases["render"] == 1
+        assert list(metrics.to_dict()["phase_seconds"]) == list(PHASES)
+
+    def test_slowest_repos(self):
+        metrics = Metrics()
+        for i in range(25):
+            metrics.record_repo(f"org/repo-{i}", float(i))
+
+        slowest = metrics.slowest_repos()
+        assert len(slowest) == 10
+        assert slowest[0] == ("org/repo-24", 24.0)
+        assert metrics.counters["repos"] == 25
+
+    def test_prometheus_groups_samples_under_their_type(self):
+        metrics = Metrics()
+        metrics.record_request('GET /repos/{owner}/{repo}', 200, 0.1, 10)
+        metrics.record_request("POST /graphql", 200, 0.2, 30)
+        metrics.count("blob_cache_hits", 4)
+
+        text = metrics.to_prometheus()
+        lines = text.splitlines()
+        assert 'claude_org_stats_api_requests_total{endpoint="POST /graphql"} 1' in lines
+        assert "claude_org_stats_blob_cache_hits_total 4" in lines
+        assert 'claude_org_stats_api_latency_seconds{endpoint="POST /graphql",quantile="0.99"} 0.2' in lines
+        # Each family's samples follow its TYPE line, with no other family in between.
+        family = None
+        for line in lines:
+            if line.startswith("# TYPE"):
+                family = line.split()[2]
+            else:
+                assert line.startswith(family)
+
+    def test_write(self, tmp_path):
+        metrics = Metrics()
+        metrics.record_request("POST /graphql", 200, 0.2, 30)
+        metrics.record_repo("org/big", 12.0)
+        summary = tmp_path / "summary.md"
+        summary.write_text("earlier step\n")
+
+        metrics.write(str(tmp_path / "out" / "metrics.json"), str(tmp_path / "metrics.prom"), str(summary))
+
+        data = json.loads((tmp_path / "out" / "metrics.json").read_text())
+        assert data["slowest_repos"] == [{"repo": "org/big", "seconds": 12.0}]
+        assert (tmp_path / "metrics.prom").read_text().startswith("# TYPE")
+        report = summary.read_text()
+        assert report.startswith("earlier step\n")
+        assert "| `POST /graphql` | 1 |" in report
+        assert "| org/big | 12.0s |" in report
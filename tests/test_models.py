@@ -1,6 +1,11 @@
 from collections import Counter
 
-from src.models import OrgStats, RepoFeatures
+import json
+import sys
+
+import pytest
+
+from src.models import FeatureStore, MultiOrgStats, NameSet, OrgStats, RepoFeatures
 
 
 class TestRepoFeatures:
@@ -11,6 +16,63 @@ class TestRepoFeatures:
         repo.mcp_servers.append("filesystem")
         assert repo.has_mcp_servers is True
 
+    def test_dict_round_trip(self):
+        repo = RepoFeatures(name="test", has_hooks=True, hook_types=["PreToolUse"], is_stale=True)
+        assert RepoFeatures.from_dict(repo.to_dict()) == repo
+
+    def test_from_dict_ignores_unknown_keys(self):
+        assert RepoFeatures.from_dict({"name": "test", "removed_field": 1}) == RepoFeatures(name="test")
+
+
+    def test_flags_are_independent(self):
+        repo = RepoFeatures(name="test", is_new=True)
+        repo.has_hooks = True
+        repo.is_new = False
+        assert (repo.has_hooks, repo.is_new, repo.has_memory) == (True, False, False)
+        assert repo.to_dict()["has_hooks"] is True
+
+    def test_compact_layout(self):
+        repo = RepoFeatures(name="test")
+        assert not hasattr(repo, "__dict__")
+        # Empty name lists aren't stored until something is added.
+        assert repo.names("hook_types") == ()
+        repo.hook_types.append("Stop")
+        assert repo.names("hook_types") == ["Stop"]
+
+    def test_name_fields_accept_lists(self):
+        repo = RepoFeatures(name="test")
+        repo.agent_names = ["a", "b", "a"]
+        assert repo.agent_names == ["a", "b"]
+        assert isinstance(repo.agent_names, NameSet)
+
+    def test_equality_ignores_unmaterialized_lists(self):
+        read = RepoFeatures(name="test")
+        assert read.mcp_servers == []
+        assert read == RepoFeatures(name="test")
+        assert read != RepoFeatures(name="test", mcp_servers=["x"])
+
+
+class TestNameSet:
+    def test_list_behaviour(self):
+        names = NameSet(["b", "a", "b"])
+        assert names == ["b", "a"]
+        assert list(names) == ["b", "a"]
+        assert len(names) == 2 and names[0] == "b"
+
+    def test_membership_with_index(self):
+        names = NameSet(f"n{i}" for i in range(100))
+        assert "n99" in names and "n100" not in names
+        names.add("n100")
+        assert "n100" in names
+        names.remove("n100")
+        assert "n100" not in names
+        names.add("n5")
+        assert len(names) == 100
+
+    def test_names_are_interned(self):
+        first, second = NameSet(["".join(["git", "hub"])]), NameSet(["".join(["git", "hub"])])
+        assert first[0] is second[0] is sys.intern("github")
+
 
 class TestOrgStatsAggregate:
     def test_aggregate_empty_repos(self):
@@ -196,3 +258,167 @@ class TestOrgStatsAggregate:
         assert len(stats.custom_command_counter) == 1
         assert len(stats.claude_action_counter) == 1
         assert len(stats.hook_type_counter) == 1
+
+
+class TestOrgStatsAdd:
+    def test_add_matches_aggregate(self):
+        repos = [
+            RepoFeatures(name="repo1", has_claude_md=True, mcp_servers=["github"]),
+            RepoFeatures(name="repo2", has_hooks=True, hook_types=["PreToolUse"]),
+            RepoFeatures(name="repo3", is_stale=True),
+        ]
+        stats = OrgStats(org_name="test-org")
+        for repo in repos:
+            stats.add(repo)
+
+        assert stats == OrgStats.aggregate("test-org", repos)
+
+    def test_add_without_keeping_repo(self):
+        stats = OrgStats(org_name="test-org")
+        stats.add(RepoFeatures(name="repo1", has_claude_md=True, custom_commands=["review"]), keep=False)
+
+        assert stats.total_repos == 1
+        assert stats.repos == []
+        assert stats.claude_md_count == 1
+        assert stats.custom_command_counter["review"] == 1
+
+    def test_counts_are_read_only(self):
+        stats = OrgStats.aggregate("test-org", [RepoFeatures(name="repo1", has_claude_md=True)])
+        with pytest.raises(AttributeError):
+            stats.total_repos = 0
+        with pytest.raises(AttributeError):
+            stats.claude_md_count = 0
+        assert (stats.total_repos, stats.claude_md_count) == (1, 1)
+
+
+class TestFeatureStore:
+    def _store(self):
+        store = FeatureStore()
+        store.append(RepoFeatures(name="a", has_claude_md=True, custom_commands=["review", "test"]), {"language": "Go"})
+        store.append(RepoFeatures(name="b", has_hooks=True, custom_commands=["review"]), {"language": "Python"})
+        store.append(RepoFeatures(name="c", has_claude_md=True, mcp_servers=["github"]), {"language": "Go"})
+        store.append(RepoFeatures(name="d"))
+        return store
+
+    def test_counts_and_masks(self):
+        store = self._store()
+        assert len(store) == 4
+        assert store.count("has_claude_md") == 2
+        assert store.mask("has_claude_md") == 0b0101
+        assert store.count("mcp_servers") == 1
+        assert store.everything() == 0b1111
+
+    def test_name_counts(self):
+        store = self._store()
+        assert store.name_counts("custom_commands") == Counter({"review": 2, "test": 1})
+        assert store.top("custom_commands", 1) == [("review", 2)]
+        assert store.name_counts("agent_names") == Counter()
+
+    def test_group_by(self):
+        store = self._store()
+        groups = store.group_by("language")
+        assert groups == {"Go": 0b0101, "Python": 0b0010, "": 0b1000}
+        go = store.where("language", "Go")
+        assert store.count("has_claude_md", go) == 2
+        assert store.name_counts("custom_commands", go) == Counter({"review": 1, "test": 1})
+        assert store.where("language", "Rust") == 0
+
+    def test_attribute_first_seen_late(self):
+        store = self._store()
+        store.append(RepoFeatures(name="e"), {"team": "infra"})
+        assert store.group_by("team") == {"": 0b01111, "infra": 0b10000}
+        assert store.group_by("language")[""] == 0b11000
+
+    def test_groups_refresh_after_append(self):
+        store = self._store()
+        store.group_by("language")
+        store.append(RepoFeatures(name="e", custom_commands=["review"]), {"language": "Go"})
+        go = store.where("language", "Go")
+        assert go == 0b10101
+        assert store.name_counts("custom_commands", go)["review"] == 2
+
+    def test_row_bits(self):
+        store = self._store()
+        assert store.repo_names == ["a", "b", "c", "d"]
+        assert store.row_bits(["has_claude_md", "custom_commands", "has_hooks"]) == [0b011, 0b110, 0b001, 0]
+
+    def test_org_stats_derived_from_store(self):
+        stats = OrgStats(org_name="org")
+        stats.add(RepoFeatures(name="a", has_claude_md=True), attributes={"language": "Go"})
+        assert stats.total_repos == len(stats.store) == 1
+        assert stats.claude_md_count == stats.store.count("has_claude_md") == 1
+
+
+class TestOrgStatsMerge:
+    def _parts(self):
+        repos = [
+            (RepoFeatures(name="a", has_claude_md=True, custom_commands=["review"]), {"language": "Go"}),
+            (RepoFeatures(name="b", mcp_servers=["github", "slack"]), {"language": "Python"}),
+            (RepoFeatures(name="c", has_hooks=True, hook_types=["PreToolUse"]), {"team": "infra"}),
+            (RepoFeatures(name="d", custom_commands=["test", "review"]), {"language": "Go"}),
+            (RepoFeatures(name="e"), {}),
+        ]
+        parts = [OrgStats(org_name="org") for _ in range(3)]
+        for i, (repo, attributes) in enumerate(repos):
+            parts[i % 3].add(repo, attributes=attributes)
+        return repos, parts
+
+    def test_merge_sums_counts(self):
+        _, parts = self._parts()
+        merged = OrgStats.merge("org", parts)
+        assert merged.total_repos == 5
+        assert merged.claude_md_count == 1
+        assert merged.mcp_servers_count == 1
+        assert merged.custom_command_counter == Counter({"review": 2, "test": 1})
+        assert merged.hook_type_counter == Counter({"PreToolUse": 1})
+        assert sorted(r.name for r in merged.repos) == ["a", "b", "c", "d", "e"]
+        go = merged.store.where("language", "Go")
+        assert merged.store.count("has_claude_md", go) == 1
+        assert merged.store.name_counts("custom_commands", go) == Counter({"review": 2, "test": 1})
+        assert merged.store.where("team", "infra").bit_count() == 1
+
+    def test_merge_is_associative(self):
+        _, (a, b, c) = self._parts()
+        left = OrgStats.merge("org", [OrgStats.merge("org", [a, b]), c])
+        right = OrgStats.merge("org", [a, OrgStats.merge("org", [b, c])])
+        assert left.store == right.store == OrgStats.merge("org", [a, b, c]).store
+        assert left.repos == right.repos
+
+    def test_merge_leaves_parts_untouched(self):
+        _, parts = self._parts()
+        before = [part.to_dict() for part in parts]
+        OrgStats.merge("org", parts)
+        assert [part.to_dict() for part in parts] == before
+
+    def test_dict_round_trip(self):
+        _, parts = self._parts()
+        stats = OrgStats.merge("org", parts)
+        restored = OrgStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+        assert restored.org_name == "org"
+        assert restored.repos == stats.repos
+        assert restored.store == stats.store
+        assert restored.custom_command_counter == stats.custom_command_counter
+
+
+class TestMultiOrgStats:
+    def _org(self, org, *repos):
+        stats = OrgStats(org_name=org)
+        for repo in repos:
+            stats.add(repo, attributes={"org": org})
+        return stats
+
+    def test_rollup_combines_orgs(self):
+        a = self._org("a", RepoFeatures(name="a/x", has_claude_md=True), RepoFeatures(name="a/y"))
+        b = self._org("b", RepoFeatures(name="b/x", mcp_servers=["github"]))
+        stats = MultiOrgStats("acme", {"a": a, "b": b})
+
+        rollup = stats.rollup()
+        assert rollup.org_name == "acme"
+        assert rollup.total_repos == 3
+        assert rollup.claude_md_count == 1
+        assert rollup.store.group_by("org") == {"a": 0b011, "b": 0b100}
+        assert rollup.adopting() == 0b101
+
+    def test_single_org_rollup_is_the_org(self):
+        a = self._org("a", RepoFeatures(name="x"))
+        assert MultiOrgStats("a", {"a": a}).rollup() is a
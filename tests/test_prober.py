@@ -0,0 +1,161 @@
+import hashlib
+import json
+import re
+
+from github import GithubException
+
+from src.prober import PathProber, build_probe_query, parse_probe
+from tests.test_fetcher import FakeRequester
+
+FILES = {
+    "org/repo-a": {
+        "CLAUDE.md": "",
+        "docs/CLAUDE.md": "",
+        ".mcp.json": '{"mcpServers": {"github": {}}}',
+        ".claude/settings.json": '{"hooks": {}}',
+        ".claude/commands/review.md": "",
+        ".claude/commands/ops/deploy.md": "",
+        ".github/workflows/claude.yml": "uses: anthropics/claude-code-action@v1",
+        ".github/workflows/logo.png": None,
+    },
+    "org/repo-b": {"src/main.py": ""},
+}
+
+_PROBE_RE = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{ \.\.\.Probe \}')
+
+
+def _sha(content) -> str:
+    return hashlib.sha1((content or "").encode()).hexdigest()
+
+
+def _blob(content) -> dict:
+    if content is None:
+        return {"oid": _sha(content), "text": None, "isBinary": True, "isTruncated": False}
+    return {"oid": _sha(content), "text": content, "isBinary": False, "isTruncated": False}
+
+
+def _entries(files: dict, prefix: str, depth: int, text: bool) -> list[dict] | None:
+    entries: dict[str, dict] = {}
+    for path in files:
+        if not path.startswith(prefix + "/"):
+            continue
+        name, sep, _ = path[len(prefix) + 1:].partition("/")
+        if sep:
+            subtree = {"entries": _entries(files, f"{prefix}/{name}", depth - 1, text)} if depth > 1 else {}
+            entries[name] = {"name": name, "type": "tree", "oid": "", "object": subtree}
+        else:
+            entries[name] = {"name": name, "type": "blob", "oid": _sha(files[path])}
+            if text:
+                entries[name]["object"] = _blob(files[path])
+    return list(entries.values()) or None
+
+
+def probe_response(files: dict, head: str) -> dict:
+    """What GitHub returns for one repo's ``...Probe`` fragment."""
+    claude = _entries(files, ".claude", 3, text=False)
+    workflows = _entries(files, ".github/workflows", 1, text=True)
+    return {
+        "defaultBranchRef": {"target": {"oid": head}} if files else None,
+        "claudeDir": {"entries": claude} if claude else None,
+        "claudeMd": {"oid": _sha(files["CLAUDE.md"])} if "CLAUDE.md" in files else None,
+        "memoryMd": {"oid": _sha(files["MEMORY.md"])} if "MEMORY.md" in files else None,
+        "mcpJson": _blob(files[".mcp.json"]) if ".mcp.json" in files else None,
+        "settingsJson": _blob(files[".claude/settings.json"]) if ".claude/settings.json" in files else None,
+        "workflows": {"entries": workflows} if workflows else None,
+    }
+
+
+class FakeProbeRequester(FakeRequester):
+    """Answers probe queries from ``files`` and blob queries like FakeRequester."""
+
+    def __init__(self, heads: dict | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.heads = heads if heads is not None else {}
+        self.probed: list[list[str]] = []
+
+    def graphql_query(self, query, variables):
+        if "fragment Probe" not in query:
+            return super().graphql_query(query, variables)
+        repos = _PROBE_RE.findall(query)
+        self.probed.append([f"{owner}/{name}" for _, owner, name in repos])
+        if len(repos) > self.limit:
+            raise GithubException(502, {"message": "timeout"}, None)
+        data = {"rateLimit": {"cost": self.cost, "remaining": 4000}}
+        for alias, owner, name in repos:
+            full_name = f"{owner}/{name}"
+            if full_name in self.broken:
+                raise GithubException(400, {"errors": [{"type": "FORBIDDEN"}]}, None)
+            head = self.heads.get(full_name, _sha(full_name))
+            data[alias] = probe_response(self.files.get(full_name, {}), head)
+        return {}, {"data": data}
+
+
+class TestBuildProbeQuery:
+    def test_aliases_each_repo(self):
+        query = build_probe_query(["org/repo-a", 'org/"odd"'])
+        assert 'r0: repository(owner: "org", name: "repo-a") { ...Probe }' in query
+        assert json.dumps('"odd"') in query
+        assert "fragment Probe on Repository" in query
+        assert 'object(expression: "HEAD:.github/workflows")' in query
+
+
+class TestParseProbe:
+    def test_paths_and_contents(self):
+        probe = parse_probe(probe_response(FILES["org/repo-a"], "abc"))
+        assert probe.head_sha == "abc"
+        assert set(probe.paths) == {
+            "CLAUDE.md",
+            ".mcp.json",
+            ".claude",
+            ".claude/settings.json",
+            ".claude/commands",
+            ".claude/commands/review.md",
+            ".claude/commands/ops",
+            ".claude/commands/ops/deploy.md",
+            ".github/workflows/claude.yml",
+            ".github/workflows/logo.png",
+        }
+        assert probe.paths[".mcp.json"] == _sha(FILES["org/repo-a"][".mcp.json"])
+        assert probe.contents == {
+            ".mcp.json": '{"mcpServers": {"github": {}}}',
+            ".claude/settings.json": '{"hooks": {}}',
+            ".github/workflows/claude.yml": "uses: anthropics/claude-code-action@v1",
+        }
+
+    def test_nested_claude_md_is_not_probed(self):
+        probe = parse_probe(probe_response(FILES["org/repo-a"], "abc"))
+        assert "docs/CLAUDE.md" not in probe.paths
+
+    def test_missing_repo(self):
+        assert parse_probe(None) is None
+
+
+class TestPathProber:
+    def test_probes_many_repos_per_query(self):
+        requester = FakeProbeRequester(files=FILES)
+        prober = PathProber(lambda: requester, batch_size=10)
+        probes = prober.probe(["org/repo-a", "org/repo-b"])
+        assert prober.queries == 1
+        assert ".claude" in probes[0].paths
+        assert probes[1].paths == {}
+
+    def test_batches_never_span_owners(self):
+        requester = FakeProbeRequester(files=FILES)
+        prober = PathProber(lambda: requester, batch_size=10)
+        prober.probe(["org/repo-a", "other/repo", "org/repo-b"])
+        assert requester.probed == [["org/repo-a"], ["other/repo"], ["org/repo-b"]]
+
+    def test_failing_repo_isolated(self):
+        requester = FakeProbeRequester(files=FILES, broken={"org/gone"})
+        prober = PathProber(lambda: requester, batch_size=4)
+        probes = prober.probe(["org/repo-a", "org/gone", "org/repo-b"])
+        assert probes[1] is None
+        assert probes[0] is not None and probes[2] is not None
+        assert prober.batch_size == 4
+
+    def test_halves_batch_on_limit_errors(self):
+        requester = FakeProbeRequester(files=FILES, limit=2)
+        prober = PathProber(lambda: requester, batch_size=8)
+        probes = prober.probe(["org/repo-a"] * 8)
+        assert all(p is not None for p in probes)
+        assert prober.batch_size == 2
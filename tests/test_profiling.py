@@ -0,0 +1,94 @@
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from src.profiling import Profiler, StackSampler
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _worker():
+    _spin(0.05)
+
+
+def _run_workers():
+    threads = [threading.Thread(target=_worker, name=f"tree-{i}") for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestProfiler:
+    def test_disabled_writes_nothing(self, tmp_path):
+        profiler = Profiler([], str(tmp_path / "profile"))
+        with profiler.phase("scan"):
+            _run_workers()
+        assert profiler.written == []
+        assert not (tmp_path / "profile").exists()
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="unknown PROFILE mode wall"):
+            Profiler(["cpu", "wall"], str(tmp_path))
+
+    def test_cpu_traces_worker_threads(self, tmp_path):
+        profiler = Profiler(["cpu"], str(tmp_path))
+        with profiler.phase("scan"):
+            _run_workers()
+
+        stats = pstats.Stats(str(tmp_path / "scan-cpu.pstats"))
+        calls = {name: stat[1] for (_, _, name), stat in stats.stats.items()}
+        assert calls["_worker"] == 2
+        assert threading.getprofile() is None
+
+    def test_cpu_sampling_writes_collapsed_stacks(self, tmp_path):
+        profiler = Profiler(["cpu"], str(tmp_path), sample_ms=2)
+        with profiler.phase("render"):
+            _run_workers()
+
+        lines = (tmp_path / "render-cpu.collapsed").read_text().splitlines()
+        worker = [line for line in lines if "_worker (test_profiling.py" in line]
+        assert worker
+        # Threads of one stage share a root frame.
+        assert all(line.startswith("tree;") for line in worker)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_memory_snapshot(self, tmp_path):
+        profiler = Profiler(["memory"], str(tmp_path))
+        with profiler.phase("aggregate"):
+            kept = [bytearray(1024) for _ in range(1000)]
+
+        snapshot = tracemalloc.Snapshot.load(str(tmp_path / "aggregate-memory.tracemalloc"))
+        assert sum(stat.size for stat in snapshot.statistics("filename")) >= 1024 * 1000
+        collapsed = (tmp_path / "aggregate-memory.collapsed").read_text()
+        assert collapsed.splitlines()[0].rsplit(" ", 1)[0].split(";")[-1].startswith("test_profiling.py:")
+        assert not tracemalloc.is_tracing()
+        assert len(kept) == 1000
+
+    def test_phases_write_separate_files(self, tmp_path):
+        profiler = Profiler(["cpu", "memory"], str(tmp_path), sample_ms=5)
+        for phase in ("scan", "aggregate", "render"):
+            with profiler.phase(phase):
+                _spin(0.01)
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            f"{phase}-{kind}" for phase in ("scan", "aggregate", "render")
+            for kind in ("cpu.collapsed", "memory.tracemalloc", "memory.collapsed")
+        )
+
+
+class TestStackSampler:
+    def test_stops(self):
+        sampler = StackSampler(0.001)
+        sampler.start()
+        _spin(0.02)
+        sampler.stop()
+        assert sampler.counts
+        assert not sampler._thread.is_alive()
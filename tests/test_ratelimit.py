@@ -0,0 +1,108 @@
+import pytest
+
+from src.ratelimit import RateBudget, resource_for
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _budget(clock, **kwargs) -> RateBudget:
+    return RateBudget(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _headers(remaining, reset, limit=5000, resource="core"):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+class TestResourceFor:
+    def test_resources(self):
+        assert resource_for("/graphql") == "graphql"
+        assert resource_for("/api/v3/graphql") == "graphql"
+        assert resource_for("/search/code?q=x") == "search"
+        assert resource_for("/repos/org/repo/git/trees/main?recursive=1") == "core"
+
+
+class TestRateBudget:
+    def test_unknown_budget_does_not_wait(self):
+        clock = FakeClock()
+        assert _budget(clock).acquire("core") == 0
+        assert clock.sleeps == []
+
+    def test_plenty_left_does_not_wait(self):
+        clock = FakeClock()
+        budget = _budget(clock)
+        budget.acquire("core")
+        budget.update("core", _headers(4000, clock.now + 3600))
+
+        for _ in range(10):
+            budget.acquire("core")
+            budget.update("core", _headers(4000, clock.now + 3600))
+        assert clock.sleeps == []
+
+    def test_paces_evenly_once_below_threshold(self):
+        clock = FakeClock()
+        budget = _budget(clock, reserve=0)
+        budget.acquire("core")
+        budget.update("core", _headers(100, clock.now + 100))
+
+        budget.acquire("core")
+        budget.acquire("core")
+        budget.acquire("core")
+
+        # 100 left over 100 seconds: one request per second.
+        assert clock.sleeps == pytest.approx([1.0, 1.0], rel=0.05)
+
+    def test_waits_for_reset_when_only_reserve_left(self):
+        clock = FakeClock()
+        budget = _budget(clock, reserve=50)
+        reset = clock.now + 600
+        budget.acquire("core")
+        budget.update("core", _headers(50, reset))
+
+        budget.acquire("core")
+        assert clock.sleeps == [601]
+        assert budget.slept == 601
+
+    def test_release_reserve(self):
+        clock = FakeClock()
+        budget = _budget(clock, reserve=50, pace_below=0)
+        budget.acquire("core")
+        budget.update("core", _headers(50, clock.now + 600))
+
+        budget.release_reserve()
+        assert budget.acquire("core") == 0
+
+    def test_in_flight_requests_count_against_budget(self):
+        clock = FakeClock()
+        budget = _budget(clock, reserve=0, pace_below=0)
+        budget.acquire("core")
+        budget.update("core", _headers(2, clock.now + 60))
+
+        assert budget.acquire("core") == 0
+        assert budget.acquire("core") == 0
+        assert budget.acquire("core") == 61  # two still in flight
+
+    def test_resources_tracked_separately(self):
+        clock = FakeClock()
+        budget = _budget(clock, reserve=0)
+        budget.acquire("graphql")
+        budget.update("graphql", _headers(0, clock.now + 60, resource="graphql"))
+
+        assert budget.remaining("graphql") == 0
+        assert budget.remaining("core") is None
+        assert budget.acquire("core") == 0
@@ -1,8 +1,10 @@
-from collections import Counter
+
+import datetime
 
 from src.config import Config
+from src.history import History
 from src.models import OrgStats, RepoFeatures
-from src.renderer import render_stats
+from src.renderer import detail_pages, render_stats
 from src.main import _replace_section
 
 
@@ -114,6 +116,34 @@ class TestRenderStats:
         assert "%" not in mcp_lines[0]
 
 
+class TestRenderTrends:
+    def _history(self) -> History:
+        history = History()
+        start = datetime.datetime(2026, 1, 5, tzinfo=datetime.timezone.utc)
+        for week in range(4):
+            repos = [RepoFeatures(name=f"r{i}", has_claude_md=i < week) for i in range(4)]
+            history.record(OrgStats.aggregate("test-org", repos), start + datetime.timedelta(weeks=week))
+        return history
+
+    def test_trends_section(self):
+        config = _make_config(show_sections=["trends"], bar_sections=["trends"])
+        result = render_stats(_make_stats(), config, self._history())
+        assert "Trends" in result
+        assert "Has CLAUDE.md           3 repos     +1  ▁▃▆█" in result
+        assert "Repos scanned           4 repos     +0  ▁▁▁▁" in result
+        # Rows that were zero throughout are left out.
+        assert "Has Hooks" not in result
+
+    def test_trends_without_bars(self):
+        config = _make_config(show_sections=["trends"], bar_sections=[])
+        result = render_stats(_make_stats(), config, self._history())
+        assert "▁" not in result
+
+    def test_trends_need_history(self):
+        config = _make_config(show_sections=["trends"])
+        assert "Trends" not in render_stats(_make_stats(), config)
+
+
 class TestReplaceSection:
     def test_basic_replacement(self):
         readme = """# My Repo
@@ -295,6 +325,38 @@ class TestRenderStatsDetailedOutput:
         assert "100.00 %" in filesystem_line
         assert "50.00 %" in github_line
 
+    def test_versions_section(self):
+        sha = "0123456789abcdef0123456789abcdef01234567"
+        repos = [
+            RepoFeatures(name="repo1", claude_action_refs=["claude-code-action@v1"]),
+            RepoFeatures(name="repo2", claude_action_refs=["claude-code-action@v1", f"claude-code-action@{sha}"]),
+            RepoFeatures(name="repo3"),
+        ]
+        stats = OrgStats.aggregate("test-org", repos)
+        result = render_stats(stats, _make_config(show_sections=["versions"], bar_sections=["versions"]))
+
+        assert "Claude Action Versions (of 2 repos)" in result
+        lines = result.split("\n")
+        assert "100.00 %" in [l for l in lines if "@v1" in l][0]
+        assert "claude-code-action@0123456 " in result
+        assert sha not in result
+
+    def test_orgs_section(self):
+        stats = OrgStats(org_name="acme")
+        stats.add(RepoFeatures(name="a/x", has_claude_md=True), attributes={"org": "a"})
+        stats.add(RepoFeatures(name="a/y"), attributes={"org": "a"})
+        stats.add(RepoFeatures(name="b/x", has_hooks=True), attributes={"org": "b"})
+        result = render_stats(stats, _make_config(show_sections=["orgs"], bar_sections=["orgs"]))
+
+        lines = result.split("\n")
+        assert "Adoption by Organization (2 of 3 repos)" in result
+        assert lines[3].startswith("b ") and "100.00 %" in lines[3]
+        assert lines[4].startswith("a ") and "50.00 %" in lines[4]
+
+    def test_orgs_section_hidden_for_one_org(self):
+        result = render_stats(_make_stats(), _make_config(show_sections=["orgs"]))
+        assert result == ""
+
     def test_skills_section_uses_correct_denominator(self):
         """Skills/commands percentages should be relative to repos with commands."""
         repos = [
@@ -365,3 +427,73 @@ class TestRenderStatsDetailedOutput:
         result = _format_row("Test Label", 0, 0, config, show_bar=True)
         assert "0.00 %" in result
         assert "0 repos" in result
+
+
+class TestRenderDetailsPages:
+    def _stats(self, names):
+        return OrgStats.aggregate("test-org", [RepoFeatures(name=name, has_claude_md=True) for name in names])
+
+    def test_small_table_stays_inline(self):
+        stats = self._stats(["repo-a", "repo-b"])
+        config = _make_config(show_sections=["adoption", "details"])
+        files = {}
+        assert render_stats(stats, config, files=files) == render_stats(stats, config)
+        assert files == {}
+
+    def test_large_table_moves_to_a_page(self):
+        names = [f"repo-{i:04d}" for i in range(200)]
+        config = _make_config(show_sections=["adoption", "details"], details_max_kb=1)
+        files = {}
+        result = render_stats(self._stats(names), config, files=files)
+
+        assert list(files) == ["claude-stats-details.md"]
+        page = files["claude-stats-details.md"]
+        assert all(f"| {name} |" in page for name in names)
+        assert "| Repo | CLAUDE.md |" in page
+        assert "repo-0000" not in result
+        assert result.endswith(
+            "\n**Per-repo breakdown** of 200 repos (too large for this page): "
+            "[claude-stats-details.md](claude-stats-details.md)"
+        )
+        assert result.startswith("```\n📊 Claude Code Adoption (200 repos scanned)")
+
+    def test_without_files_the_table_is_never_split(self):
+        names = [f"repo-{i:04d}" for i in range(200)]
+        config = _make_config(show_sections=["details"], details_max_kb=1)
+        assert "repo-0199" in render_stats(self._stats(names), config)
+
+    def test_pages_per_initial(self):
+        names = ["alpha", "Beta", "bravo", "2fa", ".dotfiles", "_tools"]
+        names += [f"alpha-{i}" for i in range(40)]
+        config = _make_config(
+            show_sections=["details"],
+            details_max_kb=1,
+            details_split="initial",
+            details_path="stats/details.md",
+            target_path="docs/README.md",
+        )
+        files = {}
+        result = render_stats(self._stats(names), config, files=files)
+
+        assert sorted(files) == [
+            "stats/details-0-9.md", "stats/details-a.md", "stats/details-b.md", "stats/details-other.md",
+        ]
+        assert "| Beta |" in files["stats/details-b.md"] and "| bravo |" in files["stats/details-b.md"]
+        other = files["stats/details-other.md"]
+        assert other.startswith("# Per-repo breakdown: other\n")
+        assert "| .dotfiles |" in other and "| _tools |" in other
+        assert result.endswith(
+            ": [0-9](../stats/details-0-9.md) · [A](../stats/details-a.md) · "
+            "[B](../stats/details-b.md) · [other](../stats/details-other.md)"
+        )
+
+    def test_detail_pages_covers_every_page_written(self):
+        names = ["alpha", "Beta", "2fa", ".dotfiles", "zulu"] + [f"repo-{i:04d}" for i in range(200)]
+        pages = set()
+        for split in ("file", "initial"):
+            config = _make_config(show_sections=["details"], details_max_kb=1, details_split=split)
+            files = {}
+            render_stats(self._stats(names), config, files=files)
+            pages.update(files)
+        assert pages <= set(detail_pages(config))
+        assert len(detail_pages(config)) == 29
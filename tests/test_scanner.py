@@ -0,0 +1,535 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from src import scanner
+from src.config import Config
+from src.metrics import Metrics
+from src.models import OrgStats
+from src.renderer import render_stats
+from tests.test_prober import FakeProbeRequester
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+FILES = {
+    "repo-a": {
+        "CLAUDE.md": "",
+        ".mcp.json": '{"mcpServers": {"github": {}, "slack": {}}}',
+        ".github/workflows/claude.yml": "uses: anthropics/claude-code-action@v1",
+    },
+    "repo-b": {
+        ".claude/settings.json": '{"hooks": {"PreToolUse": [{}]}, "mcpServers": {"postgres": {}}}',
+        ".claude/commands/review.md": "",
+        ".claude/agents/reviewer.md": "",
+    },
+    "repo-c": {"src/main.py": ""},
+    "repo-d": {
+        ".mcp.json": '{"mcpServers": {"slack": {}}}',
+        ".github/workflows/ci.yml": "uses: actions/checkout@v4",
+        ".github/workflows/review.yml": "uses: anthropics/claude-code-base-action@v1",
+    },
+}
+
+
+FETCHED: list[tuple[str, str]] = []
+TREES: list[str] = []
+WALKED: list[str] = []
+TRUNCATED: set[str] = set()
+HEADS: dict[str, str] = {}
+PUSHED_AT: dict[str, datetime.datetime] = {}
+# Requests a GraphQL-listed repo shouldn't need: ref lookups.
+LOOKUPS: list[str] = []
+# (repo, path) fetches that fail with a server error; path None for the tree.
+FAILING: set[tuple[str, str | None]] = set()
+
+
+def _sha(content: str) -> str:
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+class FakeApiRepo:
+    def __init__(self, full_name: str, jitter: bool):
+        self.full_name = full_name
+        self.name = full_name.split("/")[1]
+        self.jitter = jitter
+
+    def _sleep(self):
+        if self.jitter:
+            time.sleep(random.uniform(0, 0.01))
+
+    @property
+    def url(self):
+        return f"https://api.github.test/repos/{self.full_name}"
+
+    @property
+    def requester(self):
+        return self
+
+    def requestBlob(self, verb, url, parameters=None, headers=None):
+        """The raw recursive tree, as fetched by src.trees.fetch_tree."""
+        assert url.startswith(self.url + "/git/trees/") and parameters == {"recursive": "1"}
+        self._sleep()
+        TREES.append(self.name)
+        if (self.name, None) in FAILING:
+            return 502, {}, json.dumps({"message": "Server Error"})
+        if self.name not in FILES:
+            return 409, {}, json.dumps({"message": "Git Repository is empty."})
+        files = FILES[self.name]
+        entries = [{"path": p, "mode": "100644", "type": "blob", "sha": _sha(files[p])} for p in files]
+        truncated = self.name in TRUNCATED
+        body = {"sha": "feed", "url": "", "tree": entries[:1] if truncated else entries, "truncated": truncated}
+        return 200, {}, json.dumps(body)
+
+    def get_git_tree(self, ref, recursive=False):
+        assert not recursive, "recursive trees are fetched raw"
+        self._sleep()
+        files = FILES[self.name]
+        return self._subtree(ref.removeprefix("tree:") if ref.startswith("tree:") else "", files)
+
+    def _subtree(self, directory, files):
+        """One level of a tree, as read without ``recursive``."""
+        WALKED.append(directory)
+        prefix = directory + "/" if directory else ""
+        entries = {}
+        for path in files:
+            if not path.startswith(prefix):
+                continue
+            name, sep, _ = path[len(prefix):].partition("/")
+            if sep:
+                entries[name] = SimpleNamespace(path=name, type="tree", sha=f"tree:{prefix}{name}")
+            else:
+                entries[name] = SimpleNamespace(path=name, type="blob", sha=_sha(files[path]))
+        return SimpleNamespace(sha=f"tree:{directory}", tree=list(entries.values()))
+
+    def get_git_ref(self, ref):
+        self._sleep()
+        LOOKUPS.append(f"ref:{self.name}")
+        if self.name not in FILES:
+            raise GithubException(409, {"message": "Git Repository is empty."}, None)
+        return SimpleNamespace(object=SimpleNamespace(sha=HEADS.get(self.name, _sha(self.name))))
+
+    def get_contents(self, path):
+        self._sleep()
+        FETCHED.append((self.full_name, path))
+        if (self.name, path) in FAILING:
+            raise GithubException(502, {"message": "Server Error"}, None)
+        return SimpleNamespace(decoded_content=FILES[self.name][path].encode())
+
+
+def _listing(login: str) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            name=name,
+            node_id=f"R_{name}",
+            full_name=f"{login}/{name}",
+            archived=name == "archived",
+            fork=False,
+            pushed_at=PUSHED_AT.get(name, NOW),
+            created_at=NOW - datetime.timedelta(days=30),
+            default_branch="main",
+            language="Python" if name in ("repo-a", "repo-b") else None,
+            visibility="private",
+        )
+        for name in sorted([*FILES, "archived", "empty"])
+    ]
+
+
+class FakeScanRequester(FakeProbeRequester):
+    """Also answers the GraphQL inventory, two repos per page."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.inventory_pages = 0
+
+    def graphql_query(self, query, variables):
+        if "enterprise(slug: $slug)" in query:
+            nodes = [{"login": "test-org"}, {"login": "other-org"}]
+            page = {"hasNextPage": False, "endCursor": None}
+            return {}, {"data": {"enterprise": {"organizations": {"pageInfo": page, "nodes": nodes}}}}
+        if "organization(login: $login)" not in query:
+            return super().graphql_query(query, variables)
+        self.inventory_pages += 1
+        repos = _listing(variables["login"])
+        start = int(variables["after"] or 0)
+        nodes = [
+            {
+                "id": repo.node_id,
+                "name": repo.name,
+                "nameWithOwner": repo.full_name,
+                "isArchived": repo.archived,
+                "isFork": repo.fork,
+                "pushedAt": repo.pushed_at.isoformat(),
+                "createdAt": repo.created_at.isoformat(),
+                "visibility": "PRIVATE",
+                "diskUsage": 10,
+                "primaryLanguage": {"name": repo.language} if repo.language else None,
+                "repositoryTopics": {"nodes": []},
+                "defaultBranchRef": None if repo.name not in FILES else {
+                    "name": "main",
+                    "target": {"oid": HEADS.get(repo.name, _sha(repo.name)), "tree": {"oid": f"tree-{repo.name}"}},
+                },
+            }
+            for repo in repos[start:start + 2]
+        ]
+        page = {"hasNextPage": start + 2 < len(repos), "endCursor": str(start + 2)}
+        return {}, {"data": {"organization": {"repositories": {"pageInfo": page, "nodes": nodes}}}}
+
+
+class FakeGithub:
+    jitter = False
+    requester = FakeScanRequester(files={f"test-org/{name}": files for name, files in FILES.items()})
+
+    def get_repo(self, full_name):
+        # Clients are lazy: binding a repo sends no request.
+        return FakeApiRepo(full_name, self.jitter)
+
+    def get_organization(self, login):
+        repos = _listing(login)
+        return SimpleNamespace(get_repos=lambda **kwargs: iter(repos))
+
+
+def _make_config(**overrides) -> Config:
+    defaults = dict(gh_token="fake", org_name="test-org", show_sections=["adoption", "skills", "mcp", "actions", "details"])
+    defaults.update(overrides)
+    return Config(**defaults)
+
+
+@pytest.fixture
+def fake_github(monkeypatch):
+    monkeypatch.setattr(scanner, "_make_github", lambda config: FakeGithub())
+    FETCHED.clear()
+    TREES.clear()
+    WALKED.clear()
+    TRUNCATED.clear()
+    HEADS.clear()
+    PUSHED_AT.clear()
+    LOOKUPS.clear()
+    FAILING.clear()
+    yield FakeGithub
+    FakeGithub.jitter = False
+    FakeGithub.requester.broken = frozenset()
+
+
+class TestScanOrganization:
+    def test_serial_scan(self, fake_github):
+        stats = scanner.scan_organization(_make_config())
+
+        assert [r.name for r in stats.repos] == ["empty", "repo-a", "repo-b", "repo-c", "repo-d"]
+        assert stats.claude_md_count == 1
+        assert stats.mcp_server_counter == {"slack": 2, "github": 1, "postgres": 1}
+        assert stats.hooks_count == 1
+        assert stats.claude_actions_count == 2
+
+    def test_concurrent_scan_matches_serial(self, fake_github):
+        serial_config = _make_config()
+        serial = scanner.scan_organization(serial_config)
+
+        fake_github.jitter = True
+        concurrent_config = _make_config(scan_concurrency=4)
+        concurrent = scanner.scan_organization(concurrent_config)
+
+        assert concurrent.repos == serial.repos
+        assert render_stats(concurrent, concurrent_config) == render_stats(serial, serial_config)
+
+    def test_concurrent_scan_uses_client_per_thread(self, monkeypatch):
+        owners: dict[FakeGithub, int] = {}
+
+        class TrackingGithub(FakeGithub):
+            def get_repo(self, full_name):
+                owners.setdefault(self, threading.get_ident())
+                assert owners[self] == threading.get_ident()
+                return super().get_repo(full_name)
+
+        monkeypatch.setattr(scanner, "_make_github", lambda config: TrackingGithub())
+        stats = scanner.scan_organization(_make_config(scan_concurrency=3))
+        assert stats.total_repos == 5
+
+    def test_graphql_content_fetch_matches_rest(self, fake_github):
+        rest_config = _make_config()
+        graphql_config = _make_config(content_fetch="graphql", content_batch_size=2, scan_concurrency=2)
+
+        rest = scanner.scan_organization(rest_config)
+        fake_github.requester.sizes.clear()
+        graphql = scanner.scan_organization(graphql_config)
+
+        assert fake_github.requester.sizes
+
+        assert graphql.repos == rest.repos
+        assert render_stats(graphql, graphql_config) == render_stats(rest, rest_config)
+
+    def test_probe_mode_matches_tree_mode(self, fake_github):
+        tree_config = _make_config()
+        probe_config = _make_config(scan_mode="probe", probe_batch_size=2, scan_concurrency=2)
+
+        tree = scanner.scan_organization(tree_config)
+        TREES.clear()
+        FETCHED.clear()
+        probe = scanner.scan_organization(probe_config)
+
+        assert TREES == []
+        assert FETCHED == []
+        assert probe.repos == tree.repos
+        assert render_stats(probe, probe_config) == render_stats(tree, tree_config)
+
+    def test_probe_failure_falls_back_to_tree(self, fake_github):
+        fake_github.requester.broken = {"test-org/repo-b"}
+        stats = scanner.scan_organization(_make_config(scan_mode="probe"))
+
+        assert TREES == ["repo-b"]
+        assert stats.hooks_count == 1
+
+    def test_truncated_tree_is_walked(self, fake_github, monkeypatch):
+        monkeypatch.setitem(FILES, "monorepo", {
+            "README.md": "",
+            "services/api/CLAUDE.md": "",
+            "services/api/.mcp.json": '{"mcpServers": {"sentry": {}}}',
+            "services/web/node_modules/pkg/CLAUDE.md": "",
+            "generated/deep/MEMORY.md": "",
+            ".claude/skills/triage/SKILL.md": "",
+        })
+        TRUNCATED.add("monorepo")
+        config = _make_config(tree_ignore=["generated"])
+
+        features = {f.name: f for f in scanner.iter_repo_features(config)}["monorepo"]
+
+        assert features.has_claude_md is True
+        assert features.mcp_servers == ["sentry"]
+        assert features.custom_commands == ["triage"]
+        assert features.has_memory is False
+        assert not any("node_modules" in d or d.startswith("generated") for d in WALKED)
+
+    def test_tree_walk_is_capped(self, fake_github, monkeypatch):
+        monkeypatch.setitem(FILES, "monorepo", {f"pkg{i}/CLAUDE.md": "" for i in range(10)})
+        TRUNCATED.add("monorepo")
+
+        list(scanner.iter_repo_features(_make_config(tree_walk_max_dirs=4), [
+            repo for repo in FakeGithub().get_organization("test-org").get_repos() if repo.name == "monorepo"
+        ]))
+        assert len(WALKED) == 4
+
+    def test_blob_cache_skips_fetching_known_blobs(self, fake_github, tmp_path):
+        config = _make_config(cache_dir=str(tmp_path))
+        first = scanner.scan_organization(config)
+        assert FETCHED
+
+        FETCHED.clear()
+        second = scanner.scan_organization(config)
+        assert FETCHED == []
+        assert second.repos == first.repos
+
+    def test_blob_cache_parser_version_salt(self, fake_github, tmp_path, monkeypatch):
+        config = _make_config(cache_dir=str(tmp_path))
+        scanner.scan_organization(config)
+
+        parse, version = scanner.CONTENT_PARSERS["workflows"]
+        monkeypatch.setitem(scanner.CONTENT_PARSERS, "workflows", (parse, version + 1))
+        FETCHED.clear()
+        scanner.scan_organization(config)
+        assert sorted(path for _, path in FETCHED) == [
+            ".github/workflows/ci.yml",
+            ".github/workflows/claude.yml",
+            ".github/workflows/review.yml",
+        ]
+
+    @pytest.mark.parametrize("options", [{}, {"content_fetch": "graphql", "scan_concurrency": 2, "scan_mode": "probe"}])
+    def test_metrics_cover_every_repo_and_phase(self, fake_github, tmp_path, options):
+        metrics = Metrics()
+        scanner.scan_organization(_make_config(cache_dir=str(tmp_path), **options), metrics)
+
+        assert metrics.counters["repos"] == 5
+        assert metrics.counters["blob_cache_misses"] > 0
+        repos = {f"test-org/{name}" for name in ("empty", "repo-a", "repo-b", "repo-c", "repo-d")}
+        assert {name for name, _ in metrics.slowest_repos()} == repos
+        for phase in ("listing", "trees", "content", "detection", "aggregation"):
+            assert metrics.phases[phase] > 0, phase
+
+    def test_stats_grouped_by_listing_attributes(self, fake_github):
+        stats = scanner.scan_organization(_make_config())
+
+        python = stats.store.where("language", "Python")
+        assert python.bit_count() == 2
+        assert stats.store.name_counts("mcp_servers", python) == {"github": 1, "slack": 1, "postgres": 1}
+
+    def test_repos_not_retained_without_details_section(self, fake_github):
+        stats = scanner.scan_organization(_make_config(show_sections=["adoption"]))
+
+        assert stats.total_repos == 5
+        assert stats.repos == []
+        assert stats.claude_md_count == 1
+
+    def test_sharded_scans_merge_to_full_scan(self, fake_github):
+        config = _make_config()
+        full = scanner.scan_organization(config)
+
+        shards = [scanner.scan_organization(_make_config(shard=f"{k}/3")) for k in (1, 2, 3)]
+        assert sum(shard.total_repos for shard in shards) == full.total_repos
+        merged = OrgStats.merge("test-org", shards)
+        assert sorted(r.name for r in merged.repos) == sorted(r.name for r in full.repos)
+        assert render_stats(merged, config) == render_stats(full, config)
+
+    def test_graphql_listing_matches_rest(self, fake_github):
+        config = _make_config()
+        rest = scanner.scan_organization(config)
+
+        LOOKUPS.clear()
+        listed = _make_config(repo_listing="graphql")
+        graphql = scanner.scan_organization(listed)
+
+        assert fake_github.requester.inventory_pages == 3
+        assert graphql.repos == rest.repos
+        assert render_stats(graphql, listed) == render_stats(rest, config)
+        assert graphql.store.group_by("language") == rest.store.group_by("language")
+        # Listing metadata, head and root tree all came with the inventory.
+        assert LOOKUPS == []
+
+    def test_graphql_listing_skips_unchanged_heads(self, fake_github, tmp_path):
+        config = _make_config(repo_listing="graphql", cache_dir=str(tmp_path))
+        scanner.scan_organization(config)
+
+        PUSHED_AT["repo-a"] = PUSHED_AT["repo-b"] = NOW + datetime.timedelta(hours=1)
+        HEADS["repo-b"] = "new-head"
+        TREES.clear()
+        scanner.scan_organization(config)
+        assert TREES == ["repo-b"]
+        assert LOOKUPS == []
+
+
+class TestMultiOrgScan:
+    def test_orgs_scanned_together(self, fake_github):
+        config = _make_config(org_names=["test-org", "Other-Org"], show_sections=["adoption", "orgs", "details"])
+        stats = scanner.scan_organizations(config)
+
+        assert list(stats.orgs) == ["test-org", "Other-Org"]
+        assert [org.total_repos for org in stats.orgs.values()] == [5, 5]
+        assert stats.orgs["Other-Org"].repos[1].name == "Other-Org/repo-a"
+        rollup = stats.rollup()
+        assert rollup.total_repos == 10
+        assert rollup.claude_md_count == 2
+        assert rollup.mcp_server_counter["slack"] == 4
+        rendered = render_stats(rollup, config)
+        assert "Adoption by Organization (6 of 10 repos)" in rendered
+        assert "| test-org/repo-b |" in rendered
+
+    def test_enterprise_orgs(self, fake_github):
+        stats = scanner.scan_organizations(_make_config(org_name="", enterprise="acme"))
+        assert stats.name == "acme"
+        assert list(stats.orgs) == ["test-org", "other-org"]
+
+    def test_single_org_unchanged(self, fake_github):
+        stats = scanner.scan_organizations(_make_config())
+        assert list(stats.orgs) == ["test-org"]
+        assert stats.rollup().repos[1].name == "repo-a"
+
+
+class TestIncrementalScan:
+    def _rescan(self, config):
+        TREES.clear()
+        return scanner.scan_organization(config)
+
+    def test_unchanged_repos_are_not_fetched(self, fake_github, tmp_path):
+        config = _make_config(cache_dir=str(tmp_path))
+        first = scanner.scan_organization(config)
+
+        second = self._rescan(config)
+        assert TREES == []
+        assert second.repos == first.repos
+        assert render_stats(second, config) == render_stats(first, config)
+
+    def test_push_without_head_change_is_reused(self, fake_github, tmp_path):
+        config = _make_config(cache_dir=str(tmp_path))
+        scanner.scan_organization(config)
+
+        PUSHED_AT["repo-a"] = NOW + datetime.timedelta(hours=1)
+        self._rescan(config)
+        assert TREES == []
+
+    def test_moved_head_is_rescanned(self, fake_github, tmp_path):
+        config = _make_config(cache_dir=str(tmp_path))
+        scanner.scan_organization(config)
+
+        PUSHED_AT["repo-a"] = NOW + datetime.timedelta(hours=1)
+        HEADS["repo-a"] = "new-head"
+        self._rescan(config)
+        assert TREES == ["repo-a"]
+
+    def test_renamed_repo_matched_by_node_id(self, fake_github, tmp_path):
+        config = _make_config(cache_dir=str(tmp_path))
+        scanner.scan_organization(config)
+
+        renamed = [
+            SimpleNamespace(**{**vars(repo), "name": "repo-a-renamed"}) if repo.name == "repo-a" else repo
+            for repo in FakeGithub().get_organization("test-org").get_repos()
+            if repo.name != "archived"
+        ]
+        state = scanner.ScanState.load(str(tmp_path / "scan-state.json"), scanner.detectors_fingerprint())
+        TREES.clear()
+        features = list(scanner.iter_repo_features(config, renamed, state=state))
+
+        assert TREES == []
+        assert features[1].name == "repo-a-renamed"
+        assert features[1].has_claude_md is True
+
+    @pytest.mark.parametrize("failing", [("repo-a", ".mcp.json"), ("repo-a", None)])
+    def test_failed_fetch_is_not_saved(self, fake_github, tmp_path, failing):
+        config = _make_config(cache_dir=str(tmp_path))
+        FAILING.add(failing)
+        metrics = Metrics()
+        first = scanner.scan_organizations(config, metrics).rollup()
+        assert first.mcp_server_counter["github"] == 0
+        assert metrics.counters["incomplete_repos"] == 1
+
+        FAILING.clear()
+        second = self._rescan(config)
+        assert TREES == ["repo-a"]
+        assert second.mcp_server_counter == {"github": 1, "slack": 2, "postgres": 1}
+
+    def test_full_rescan(self, fake_github, tmp_path):
+        scanner.scan_organization(_make_config(cache_dir=str(tmp_path)))
+
+        self._rescan(_make_config(cache_dir=str(tmp_path), full_rescan=True))
+        assert sorted(TREES) == ["empty", "repo-a", "repo-b", "repo-c", "repo-d"]
+
+
+class TestIterRepoFeatures:
+    def test_yields_in_listing_order(self, fake_github):
+        fake_github.jitter = True
+        names = [f.name for f in scanner.iter_repo_features(_make_config(scan_concurrency=4))]
+        assert names == ["empty", "repo-a", "repo-b", "repo-c", "repo-d"]
+
+    def test_explicit_repo_iterable(self, fake_github):
+        repos = list(FakeGithub().get_organization("test-org").get_repos())[:2]
+        names = [f.name for f in scanner.iter_repo_features(_make_config(), repos)]
+        assert names == ["archived", "empty"]
+
+    def test_worker_error_propagates(self, fake_github, monkeypatch):
+        def boom(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(scanner, "_scan_contents", boom)
+        with pytest.raises(RuntimeError, match="boom"):
+            list(scanner.iter_repo_features(_make_config(scan_concurrency=2)))
+
+    def test_async_iterator(self, fake_github):
+        async def collect():
+            return [f.name async for f in scanner.aiter_repo_features(_make_config(scan_concurrency=2))]
+
+        assert asyncio.run(collect()) == ["empty", "repo-a", "repo-b", "repo-c", "repo-d"]
+
+    def test_async_iterator_takes_state_and_metrics(self, fake_github, tmp_path):
+        state, metrics = scanner.ScanState(), Metrics()
+
+        async def collect():
+            return [f.name async for f in scanner.aiter_repo_features(_make_config(), state=state, metrics=metrics)]
+
+        assert len(asyncio.run(collect())) == 5
+        assert metrics.phases["trees"] > 0
+        state.save(str(tmp_path / "scan-state.json"))
+        assert len(scanner.ScanState.load(str(tmp_path / "scan-state.json"))) == 5
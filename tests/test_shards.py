@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from src.models import OrgStats, RepoFeatures
+from src.shards import (
+    PARTIAL_VERSION,
+    expand_inputs,
+    in_shard,
+    load_partial,
+    merge_partials,
+    parse_shard,
+    save_partial,
+)
+
+
+class TestParseShard:
+    def test_parse(self):
+        assert parse_shard("3/16") == (3, 16)
+        assert parse_shard("1/1") == (1, 1)
+        assert parse_shard("") is None
+
+    @pytest.mark.parametrize("spec", ["0/4", "5/4", "3", "a/b", "1/2/3"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+class TestInShard:
+    def test_every_repo_in_exactly_one_shard(self):
+        names = [f"org/repo-{i}" for i in range(500)]
+        for count in (1, 3, 16):
+            owners = [[k for k in range(1, count + 1) if in_shard(name, (k, count))] for name in names]
+            assert all(len(owner) == 1 for owner in owners)
+        sizes = [sum(in_shard(name, (k, 4)) for name in names) for k in range(1, 5)]
+        assert min(sizes) > 75
+
+    def test_stable_and_case_insensitive(self):
+        assert in_shard("Org/Repo", (2, 7)) == in_shard("org/repo", (2, 7))
+        assert in_shard("anything", None)
+
+
+class TestPartials:
+    def _stats(self, *names):
+        stats = OrgStats(org_name="org")
+        for name in names:
+            stats.add(RepoFeatures(name=name, has_claude_md=True, custom_commands=[name]), attributes={"language": "Go"})
+        return stats
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "out" / "shard.json")
+        stats = self._stats("a", "b")
+        save_partial(stats, path, (1, 2))
+        loaded = load_partial(path)
+        assert loaded.store == stats.store
+        assert loaded.repos == stats.repos
+
+    def test_rejects_other_versions(self, tmp_path):
+        path = tmp_path / "shard.json"
+        path.write_text(json.dumps({"version": PARTIAL_VERSION + 1, "stats": {}}))
+        with pytest.raises(ValueError):
+            load_partial(str(path))
+
+    def test_merge_partials(self, tmp_path):
+        save_partial(self._stats("a", "b"), str(tmp_path / "shard-1.json"))
+        save_partial(self._stats("c"), str(tmp_path / "shard-2.json"))
+        paths = expand_inputs([str(tmp_path / "shard-*.json"), str(tmp_path / "shard-1.json")])
+        assert [p.rsplit("/", 1)[1] for p in paths] == ["shard-1.json", "shard-2.json"]
+
+        merged = merge_partials("org", paths)
+        assert merged.total_repos == 3
+        assert merged.claude_md_count == 3
+        assert merged.custom_command_counter == {"a": 1, "b": 1, "c": 1}
@@ -0,0 +1,50 @@
+import json
+
+from src.models import RepoFeatures
+from src.state import STATE_VERSION, ScanState
+
+
+class TestScanState:
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "state" / "scan-state.json")
+        state = ScanState(fingerprint="fp")
+        features = RepoFeatures(name="repo-a", has_claude_md=True, mcp_servers=["github"])
+        state.record("R_1", "org/repo-a", "abc123", "2026-01-01T00:00:00+00:00", features)
+        state.save(path)
+
+        loaded = ScanState.load(path, "fp")
+        saved = loaded.lookup("R_1")
+        assert len(loaded) == 1
+        assert saved.full_name == "org/repo-a"
+        assert saved.head_sha == "abc123"
+        assert RepoFeatures.from_dict(saved.features) == features
+
+    def test_only_recorded_repos_are_saved(self, tmp_path):
+        path = str(tmp_path / "scan-state.json")
+        first = ScanState()
+        first.record("R_1", "org/a", "", "", RepoFeatures(name="a"))
+        first.record("R_2", "org/b", "", "", RepoFeatures(name="b"))
+        first.save(path)
+
+        second = ScanState.load(path)
+        second.record("R_2", "org/b", "", "", RepoFeatures(name="b"))
+        second.save(path)
+
+        assert ScanState.load(path).lookup("R_1") is None
+        assert ScanState.load(path).lookup("R_2") is not None
+
+    def test_missing_or_corrupt_file_is_empty(self, tmp_path):
+        assert len(ScanState.load(str(tmp_path / "missing.json"))) == 0
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json")
+        assert len(ScanState.load(str(corrupt))) == 0
+
+    def test_other_version_or_fingerprint_is_ignored(self, tmp_path):
+        path = tmp_path / "scan-state.json"
+        entry = {"full_name": "org/a", "head_sha": "", "pushed_at": "", "features": {"name": "a"}}
+        path.write_text(json.dumps({"version": STATE_VERSION + 1, "fingerprint": "fp", "repos": {"R_1": entry}}))
+        assert len(ScanState.load(str(path), "fp")) == 0
+
+        path.write_text(json.dumps({"version": STATE_VERSION, "fingerprint": "old", "repos": {"R_1": entry}}))
+        assert len(ScanState.load(str(path), "fp")) == 0
+        assert len(ScanState.load(str(path), "old")) == 1
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+from github import Auth, Github
+
+from src import transport
+from src.metrics import Metrics
+from src.ratelimit import RateBudget
+from src.tokens import Credential, TokenPool
+from src.transport import ResponseCache, Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    etag = '"v1"'
+    body: ClassVar[dict] = {"name": "repo", "full_name": "org/repo", "default_branch": "main"}
+    statuses: ClassVar[list[int]] = []
+    authorizations: ClassVar[list[str]] = []
+
+    def do_GET(self):
+        self.authorizations.append(self.headers.get("Authorization", ""))
+        if self.headers.get("If-None-Match") == self.etag:
+            self._reply(304, b"")
+            return
+        self._reply(200, json.dumps(self.body).encode())
+
+    def _reply(self, status, payload):
+        self.statuses.append(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", self.etag)
+        self.send_header("X-RateLimit-Remaining", str(4999 - len(self.statuses)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.statuses = []
+    _Handler.authorizations = []
+    _Handler.etag = '"v1"'
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    transport.uninstall()
+
+
+def _get_repo(base_url):
+    gh = Github(auth=Auth.Token("fake"), base_url=base_url, retry=None, seconds_between_requests=None)
+    return gh.get_repo("org/repo")
+
+
+class TestConditionalRequests:
+    def test_second_request_served_from_cache(self, server, tmp_path):
+        active = Transport(ResponseCache(str(tmp_path / "http")))
+        transport.install(active)
+
+        first = _get_repo(server)
+        second = _get_repo(server)
+
+        assert _Handler.statuses == [200, 304]
+        assert second.full_name == first.full_name == "org/repo"
+        assert (active.cache_hits, active.cache_misses, active.requests) == (1, 1, 2)
+
+    def test_changed_resource_refreshes_cache(self, server, tmp_path):
+        transport.install(Transport(ResponseCache(str(tmp_path / "http"))))
+        _get_repo(server)
+
+        _Handler.etag = '"v2"'
+        _get_repo(server)
+        _get_repo(server)
+
+        assert _Handler.statuses == [200, 200, 304]
+
+    def test_cache_persists_across_runs(self, server, tmp_path):
+        transport.install(Transport(ResponseCache(str(tmp_path / "http"))))
+        _get_repo(server)
+        transport.uninstall()
+
+        rerun = Transport(ResponseCache(str(tmp_path / "http")))
+        transport.install(rerun)
+        _get_repo(server)
+
+        assert _Handler.statuses == [200, 304]
+        assert rerun.cache_hits == 1
+
+    def test_without_cache_requests_are_unconditional(self, server):
+        active = Transport()
+        transport.install(active)
+        _get_repo(server)
+        _get_repo(server)
+
+        assert _Handler.statuses == [200, 200]
+        assert active.requests == 2
+
+
+    def test_budget_fed_from_response_headers(self, server):
+        budget = RateBudget()
+        transport.install(Transport(budget=budget))
+        _get_repo(server)
+        _get_repo(server)
+
+        assert budget.remaining("core") == 4997
+
+    def test_pool_signs_requests_with_freshest_token(self, server):
+        low, high = RateBudget(), RateBudget()
+        low.update("core", {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(2**40)})
+        high.update("core", {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": str(2**40)})
+        pool = TokenPool([Credential("low", Auth.Token("low"), low), Credential("high", Auth.Token("high"), high)])
+        transport.install(Transport(pool=pool))
+        _get_repo(server)
+
+        assert _Handler.authorizations == ["token high"]
+        assert high.remaining("core") == 4998
+        assert low.remaining("core") == 100
+
+    def test_pool_signs_with_the_owners_installation(self, server):
+        def credential(label, remaining, account=""):
+            budget = RateBudget()
+            budget.update("core", {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(2**40)})
+            return Credential(label, Auth.Token(label), budget, account=account)
+
+        pool = TokenPool([credential("other", 4000, "other-org"), credential("org", 100, "org")])
+        transport.install(Transport(pool=pool))
+        _get_repo(server)
+
+        assert _Handler.authorizations == ["token org"]
+
+    def test_metrics_record_each_request(self, server, tmp_path):
+        metrics = Metrics()
+        transport.install(Transport(ResponseCache(str(tmp_path / "http")), metrics=metrics))
+        _get_repo(server)
+        _get_repo(server)
+
+        stats = metrics.endpoints["GET /repos/{owner}/{repo}"]
+        assert (stats.requests, stats.not_modified, stats.errors) == (2, 1, 0)
+        # The 304 carried no body.
+        assert stats.bytes == len(json.dumps(_Handler.body))
+        assert len(stats.latencies) == 2
+
+
+class TestResponseCache:
+    def test_store_and_load(self, tmp_path):
+        cache = ResponseCache(str(tmp_path))
+        cache.store("key", {"etag": '"x"'}, "body ✓")
+        assert cache.load("key") == ({"etag": '"x"'}, "body ✓")
+        assert cache.load("other") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        body = os.urandom(5000).hex()  # about 5.5 KB on disk
+        cache = ResponseCache(str(tmp_path), max_bytes=64 * 1024)
+        for i in range(8):
+            cache.store(f"key-{i}", {}, body)
+            time.sleep(0.01)
+        cache.load("key-0")
+        for i in range(8, 12):
+            cache.store(f"key-{i}", {}, body)
+            time.sleep(0.01)
+
+        assert cache.evictions > 0
+        assert cache.load("key-0") is not None
+        assert cache.load("key-1") is None
+        assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 64 * 1024
+
+        # Recency and size survive a restart.
+        reopened = ResponseCache(str(tmp_path), max_bytes=16 * 1024)
+        reopened.store("key-new", {}, "small")
+        assert reopened.load("key-11") is not None
+        assert reopened.load("key-3") is None
+        assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 16 * 1024
+
+    def test_skips_responses_too_big_to_keep(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_bytes=64 * 1024)
+        cache.store("tree", {}, "small")
+        cache.store("tree", {}, os.urandom(8000).hex())
+        assert cache.load("tree") is None
+        assert os.listdir(tmp_path) == []
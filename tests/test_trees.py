@@ -0,0 +1,80 @@
+import json
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from src.trees import TreeEntries, fetch_tree
+
+
+def _tree_json(count, truncated=False, indent=None):
+    entries = [
+        {"path": f'dir/{i}/"quoted" ]', "mode": "100644", "type": "blob", "sha": f"{i:040x}", "size": i}
+        for i in range(count)
+    ]
+    return json.dumps({"sha": "abc123", "url": "https://x", "tree": entries, "truncated": truncated}, indent=indent)
+
+
+class TestTreeEntries:
+    def test_entries(self):
+        stream = TreeEntries(_tree_json(20, indent=1))
+        entries = list(stream)
+        assert len(entries) == 20
+        assert entries[3] == ('dir/3/"quoted" ]', f"{3:040x}")
+        assert stream.sha == "abc123"
+
+    def test_truncated_flag(self):
+        stream = TreeEntries(_tree_json(2, truncated=True))
+        list(stream)
+        assert stream.truncated is True
+
+        stream = TreeEntries(_tree_json(2))
+        list(stream)
+        assert stream.truncated is False
+
+    def test_empty_tree(self):
+        assert list(TreeEntries('{"sha": "e", "tree": [], "truncated": false}')) == []
+
+    def test_malformed_body_raises(self):
+        with pytest.raises(ValueError):
+            list(TreeEntries(_tree_json(3)[:-40]))
+        with pytest.raises(ValueError):
+            list(TreeEntries("<html>"))
+
+    def test_decoding_adds_little_memory(self):
+        text = _tree_json(20_000)
+        tracemalloc.start()
+        try:
+            for _ in TreeEntries(text):
+                pass
+            decoded = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            json.loads(text)
+            loaded = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert decoded < loaded / 10
+
+
+class TestFetchTree:
+    def _repo(self, status, body):
+        calls = []
+
+        def request_blob(verb, url, parameters=None, headers=None):
+            calls.append((verb, url, parameters))
+            return status, {}, body
+
+        repo = SimpleNamespace(url="https://api/repos/org/r", requester=SimpleNamespace(requestBlob=request_blob))
+        return repo, calls
+
+    def test_fetches_recursive_tree(self):
+        repo, calls = self._repo(200, _tree_json(3))
+        assert [path for path, _ in fetch_tree(repo, "feature/x")] == [f'dir/{i}/"quoted" ]' for i in range(3)]
+        assert calls == [("GET", "https://api/repos/org/r/git/trees/feature%2Fx", {"recursive": "1"})]
+
+    def test_error_status_raises(self):
+        repo, _ = self._repo(409, '{"message": "Git Repository is empty."}')
+        with pytest.raises(GithubException) as info:
+            fetch_tree(repo, "main")
+        assert info.value.status == 409